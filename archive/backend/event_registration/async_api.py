@@ -0,0 +1,77 @@
+"""
+Helpers shared by the async (ASGI) views of the public API.
+
+The async views serve the hot public actions directly and hand any other
+method, or a request they do not fast-path, to the regular DRF view, so
+responses stay identical to the sync API.
+"""
+
+from asgiref.sync import sync_to_async
+from django.http import HttpResponse
+from rest_framework.exceptions import Throttled
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+
+def wants_json(request):
+    """Return True unless the client asked for the browsable API."""
+    return 'text/html' not in request.headers.get('Accept', '')
+
+
+def render_json(data):
+    """Render data with the first configured DRF renderer."""
+    return api_settings.DEFAULT_RENDERER_CLASSES[0]().render(data)
+
+
+def json_response(data, status=200):
+    """Return data as a JSON HttpResponse."""
+    return HttpResponse(render_json(data), status=status, content_type='application/json')
+
+
+async def delegate(view, request, *args, **kwargs):
+    """Serve the request with the regular (sync) DRF view."""
+    return await sync_to_async(view)(request, *args, **kwargs)
+
+
+def check_throttles(request, view_class):
+    """
+    Apply the view's throttles like ``APIView.check_throttles``.
+    
+    Returns:
+        Throttled exception to report, or None if the request is allowed.
+    """
+    drf_request = Request(
+        request,
+        authenticators=[auth() for auth in view_class.authentication_classes]
+    )
+    view = view_class()
+    denied = False
+    durations = []
+    
+    for throttle_class in view_class.throttle_classes:
+        throttle = throttle_class()
+        if not throttle.allow_request(drf_request, view):
+            denied = True
+            durations.append(throttle.wait())
+    
+    if not denied:
+        return None
+    durations = [duration for duration in durations if duration is not None]
+    return Throttled(wait=max(durations, default=None))
+
+
+async def throttled_response(request, view_class):
+    """
+    Return a 429 response if the request exceeds the view's throttles.
+    
+    Authentication and the throttle history sit behind sync APIs, so the
+    check runs through ``sync_to_async``.
+    """
+    exc = await sync_to_async(check_throttles)(request, view_class)
+    if exc is None:
+        return None
+    
+    response = json_response({'detail': exc.detail}, status=exc.status_code)
+    if exc.wait is not None:
+        response['Retry-After'] = str(exc.wait)
+    return response
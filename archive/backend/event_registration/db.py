@@ -0,0 +1,24 @@
+"""
+Connection-time database configuration for the event registration API.
+"""
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Apply SQLITE_PRAGMAS to every new SQLite connection.
+    
+    WAL lets readers proceed while a write is in progress, and busy_timeout
+    makes a writer wait for the lock instead of failing with "database is
+    locked".
+    """
+    if connection.vendor != 'sqlite':
+        return
+    
+    with connection.cursor() as cursor:
+        for pragma, value in settings.SQLITE_PRAGMAS.items():
+            cursor.execute(f'PRAGMA {pragma} = {value}')
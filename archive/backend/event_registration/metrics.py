@@ -0,0 +1,81 @@
+"""
+In-process metrics registry for the event registration API.
+"""
+
+import threading
+from collections import defaultdict
+from contextvars import ContextVar
+
+
+# Per-request measurements collected while a request is being handled
+# (set by PerformanceMiddleware, None outside a request)
+request_metrics = ContextVar('request_metrics', default=None)
+
+
+def add_request_metric(name, value):
+    """Add to a measurement for the current request, if one is tracked."""
+    metrics = request_metrics.get()
+    if metrics is not None:
+        metrics[name] = metrics.get(name, 0) + value
+
+
+class MetricsRegistry:
+    """
+    Thread-safe store of counters and summaries keyed by name and labels.
+    
+    Values are kept per process; each worker reports its own numbers.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._values = defaultdict(float)
+        self._collectors = []
+    
+    def inc(self, name, value=1, **labels):
+        """Increment a counter."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] += value
+    
+    def set(self, name, value, **labels):
+        """Set a gauge."""
+        key = (name, tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[key] = value
+    
+    def add_collector(self, collector):
+        """Register a callable that refreshes gauges before each render."""
+        self._collectors.append(collector)
+    
+    def observe(self, name, value, **labels):
+        """Record one observation of a summary (as _count and _sum series)."""
+        count_key = (f'{name}_count', tuple(sorted(labels.items())))
+        sum_key = (f'{name}_sum', tuple(sorted(labels.items())))
+        with self._lock:
+            self._values[count_key] += 1
+            self._values[sum_key] += value
+    
+    def snapshot(self):
+        """Return a copy of all series as {(name, labels): value}."""
+        with self._lock:
+            return dict(self._values)
+    
+    def render_prometheus(self):
+        """Render all series in the Prometheus text exposition format."""
+        for collector in self._collectors:
+            collector()
+        
+        lines = []
+        for (name, labels), value in sorted(self.snapshot().items()):
+            if labels:
+                label_text = ','.join(
+                    '%s="%s"' % (key, str(val).replace('\\', '\\\\').replace('"', '\\"'))
+                    for key, val in labels
+                )
+                lines.append(f'{name}{{{label_text}}} {value}')
+            else:
+                lines.append(f'{name} {value}')
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
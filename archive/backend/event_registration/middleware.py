@@ -0,0 +1,185 @@
+"""
+Request-level performance instrumentation.
+"""
+
+import cProfile
+import hmac
+import io
+import logging
+import pstats
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.http import HttpResponse
+from .metrics import registry, request_metrics
+
+
+logger = logging.getLogger(__name__)
+
+
+def is_internal_request(request):
+    """Return True for requests allowed to see internals (metrics, profiles)."""
+    if settings.METRICS_TOKEN:
+        scheme, _, token = request.META.get('HTTP_AUTHORIZATION', '').partition(' ')
+        if scheme.lower() == 'bearer' and hmac.compare_digest(token.encode(), settings.METRICS_TOKEN.encode()):
+            return True
+    return request.META.get('REMOTE_ADDR') in settings.METRICS_ALLOWED_IPS
+
+
+class QueryTracker:
+    """Database execute wrapper counting and timing every query."""
+    
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements = Counter()
+    
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - started
+            self.count += 1
+            self.statements[sql] += 1
+
+
+class PerformanceMiddleware:
+    """
+    Record wall time, query count/time, render time and cache outcome per view.
+    
+    Views are labelled ``<ViewSet>.<action>`` for DRF viewsets. Requests
+    that repeat one SQL statement N_PLUS_ONE_THRESHOLD or more times are
+    flagged as likely N+1 patterns. With PROFILING_ENABLED, internal
+    requests (see ``is_internal_request``) carrying an ``X-Profile`` header
+    return a profile report instead of the normal response (WSGI only).
+    
+    Query metrics and N+1 detection are WSGI only as well: under ASGI the
+    ORM runs in sync_to_async worker threads, whose connections the
+    wrapper installed here never sees, so db_queries and db_query_seconds
+    are not recorded for ASGI requests rather than reported as zero.
+    """
+    
+    sync_capable = True
+    async_capable = True
+    
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+    
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        
+        if (
+            settings.PROFILING_ENABLED
+            and 'HTTP_X_PROFILE' in request.META
+            and is_internal_request(request)
+        ):
+            return self.profile(request)
+        
+        started = time.perf_counter()
+        with self.measure() as (tracker, metrics):
+            response = self.get_response(request)
+        
+        self.record(request, response, time.perf_counter() - started, tracker, metrics)
+        return response
+    
+    async def __acall__(self, request):
+        """Measure an ASGI request; profiling and query metrics are WSGI only."""
+        started = time.perf_counter()
+        with self.measure(track_queries=False) as (tracker, metrics):
+            response = await self.get_response(request)
+        
+        self.record(request, response, time.perf_counter() - started, tracker, metrics)
+        return response
+    
+    @contextmanager
+    def measure(self, track_queries=True):
+        """
+        Track queries and collect per-request metrics inside the block.
+        
+        Yields a (tracker, metrics) pair; tracker is None when queries are
+        not tracked.
+        """
+        tracker = QueryTracker() if track_queries else None
+        metrics = {}
+        token = request_metrics.set(metrics)
+        
+        try:
+            with ExitStack() as stack:
+                if tracker is not None:
+                    for connection in connections.all():
+                        stack.enter_context(connection.execute_wrapper(tracker))
+                yield tracker, metrics
+        finally:
+            request_metrics.reset(token)
+    
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Label the request with the view (and viewset action) handling it."""
+        view_class = getattr(view_func, 'cls', None)
+        actions = getattr(view_func, 'actions', None)
+        
+        if view_class is not None and actions:
+            action = actions.get(request.method.lower(), request.method.lower())
+            request.perf_view_name = f'{view_class.__name__}.{action}'
+        elif view_class is not None:
+            request.perf_view_name = view_class.__name__
+        else:
+            request.perf_view_name = getattr(view_func, '__name__', 'unknown')
+        
+        return None
+    
+    def record(self, request, response, seconds, tracker, metrics):
+        """Record the measurements for one request."""
+        view = getattr(request, 'perf_view_name', 'unresolved')
+        
+        registry.observe(
+            'http_request_seconds', seconds,
+            view=view, method=request.method, status=response.status_code
+        )
+        if tracker is not None:
+            registry.observe('db_queries', tracker.count, view=view)
+            registry.observe('db_query_seconds', tracker.seconds, view=view)
+        if 'render_seconds' in metrics:
+            registry.observe('render_seconds', metrics['render_seconds'], view=view)
+        
+        cache_outcome = response.get('X-Cache')
+        if cache_outcome:
+            registry.inc('response_cache_total', view=view, outcome=cache_outcome.lower())
+        
+        if tracker is not None and tracker.statements:
+            sql, repeats = tracker.statements.most_common(1)[0]
+            if repeats >= settings.N_PLUS_ONE_THRESHOLD:
+                registry.inc('n_plus_one_total', view=view)
+                logger.warning(
+                    "Possible N+1 in %s: statement ran %d times: %s",
+                    view, repeats, sql[:200]
+                )
+    
+    def profile(self, request):
+        """Run the request under a profiler and return the report."""
+        if request.META['HTTP_X_PROFILE'] == 'pyinstrument':
+            try:
+                from pyinstrument import Profiler
+            except ImportError:
+                return HttpResponse('pyinstrument is not installed', status=501)
+            
+            profiler = Profiler()
+            profiler.start()
+            self.get_response(request)
+            profiler.stop()
+            return HttpResponse(profiler.output_html())
+        
+        profiler = cProfile.Profile()
+        profiler.runcall(self.get_response, request)
+        
+        output = io.StringIO()
+        stats = pstats.Stats(profiler, stream=output)
+        stats.sort_stats('cumulative').print_stats(50)
+        return HttpResponse(output.getvalue(), content_type='text/plain')
@@ -0,0 +1,184 @@
+"""
+Pagination classes for the event registration API.
+"""
+
+import json
+from functools import reduce
+from operator import or_
+
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, _reverse_ordering
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset (seek) cursor pagination with constant per-page cost.
+    
+    Orderings always end in ``id``, so every row has a unique position:
+    the values of all ordering fields. A cursor stores the position of the
+    last row seen and the next page is found with a row comparison on
+    those fields, e.g. ``event_date < d OR (event_date = d AND id < i)``,
+    plus a range bound on the leading field so the composite index is
+    scanned from the cursor. Ties never fall back to OFFSET and no
+    COUNT(*) is issued; each viewset's ``ordering`` must match a composite
+    index.
+    """
+    
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    
+    def get_ordering(self, request, queryset, view):
+        """Return the ordering, by relevance for search, ending in ``id``."""
+        if 'search_rank' in queryset.query.annotations:
+            return ('search_rank', '-id')
+        
+        ordering = super().get_ordering(request, queryset, view)
+        if ordering[-1].lstrip('-') not in ('id', 'pk'):
+            # Break ties in the direction of the leading field
+            ordering += ('-id' if ordering[0].startswith('-') else 'id',)
+        return ordering
+    
+    def paginate_queryset(self, queryset, request, view=None):
+        """
+        Return one page of queryset after the cursor position.
+        
+        Follows ``CursorPagination.paginate_queryset``, with the filter on
+        the leading ordering field replaced by a row comparison on all of
+        them; positions are unique, so cursors never carry an offset.
+        """
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            (offset, reverse, current_position) = (0, False, None)
+        else:
+            (offset, reverse, current_position) = self.cursor
+        
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if current_position is not None:
+            queryset = queryset.filter(self.get_position_filter(queryset, ordering, current_position))
+        
+        results = list(queryset[offset:offset + self.page_size + 1])
+        self.page = list(results[:self.page_size])
+        
+        if len(results) > len(self.page):
+            has_following_position = True
+            following_position = self._get_position_from_instance(results[-1], self.ordering)
+        else:
+            has_following_position = False
+            following_position = None
+        
+        if reverse:
+            self.page = list(reversed(self.page))
+            self.has_next = (current_position is not None) or (offset > 0)
+            self.has_previous = has_following_position
+            if self.has_next:
+                self.next_position = current_position
+            if self.has_previous:
+                self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = (current_position is not None) or (offset > 0)
+            if self.has_next:
+                self.next_position = following_position
+            if self.has_previous:
+                self.previous_position = current_position
+        
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        
+        return self.page
+    
+    def get_position_filter(self, queryset, ordering, position):
+        """
+        Return a Q selecting the rows after position in ordering.
+        
+        Args:
+            queryset: Queryset being paginated (for field types)
+            ordering: Ordering the page is read in
+            position: Encoded position from the cursor
+        """
+        values = self.decode_position(queryset, position)
+        
+        clauses = []
+        for index, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            equal = {ordering[i].lstrip('-'): values[i] for i in range(index)}
+            clauses.append(Q(**equal, **{f'{name}__{lookup}': values[index]}))
+        
+        # The inclusive bound on the leading field gives the index a range to scan
+        leading = ordering[0]
+        bound = Q(**{
+            f"{leading.lstrip('-')}__{'lte' if leading.startswith('-') else 'gte'}": values[0]
+        })
+        return bound & reduce(or_, clauses)
+    
+    def decode_position(self, queryset, position):
+        """Decode a cursor position into typed values of the ordering fields."""
+        try:
+            raw_values = json.loads(position)
+            if not isinstance(raw_values, list) or len(raw_values) != len(self.ordering):
+                raise ValueError
+            return [
+                self.get_ordering_field(queryset, field.lstrip('-')).to_python(value)
+                for field, value in zip(self.ordering, raw_values)
+            ]
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
+    
+    def get_ordering_field(self, queryset, name):
+        """Return the model or annotation field an ordering name refers to."""
+        annotation = queryset.query.annotations.get(name)
+        if annotation is not None:
+            return annotation.output_field
+        if name == 'pk':
+            return queryset.model._meta.pk
+        return queryset.model._meta.get_field(name)
+    
+    def _get_position_from_instance(self, instance, ordering):
+        """Encode the values of every ordering field of a row or instance."""
+        values = []
+        for field in ordering:
+            name = field.lstrip('-')
+            value = instance[name] if isinstance(instance, dict) else getattr(instance, name)
+            values.append(str(value))
+        return json.dumps(values, separators=(',', ':'))
+    
+    def paginate_rows(self, request, rows):
+        """
+        Paginate the first page from already fetched rows.
+        
+        For async views, which fetch ``page_size + 1`` rows in ``ordering``
+        with the async ORM; sets the state ``get_paginated_response`` needs.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.cursor = None
+        self.page = list(rows[:self.page_size])
+        self.has_previous = False
+        self.has_next = len(rows) > len(self.page)
+        if self.has_next:
+            self.next_position = self._get_position_from_instance(rows[-1], self.ordering)
+        return self.page
+
+
+class RegistrationCursorPagination(KeysetCursorPagination):
+    """Cursor pagination keyed on (created_at, id)."""
+    
+    ordering = ('-created_at', '-id')
+
+
+class EventCursorPagination(KeysetCursorPagination):
+    """Cursor pagination keyed on (event_date, id)."""
+    
+    ordering = ('-event_date', '-id')
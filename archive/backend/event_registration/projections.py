@@ -0,0 +1,69 @@
+"""
+Dict-based read serializers for hot list endpoints.
+
+A projection serializer reads ``.values()`` rows and builds the response
+dicts directly, avoiding per-field ``Field.to_representation`` dispatch and
+attribute traversal across relations. Output matches the equivalent
+ModelSerializer.
+"""
+
+from django.utils import timezone
+
+
+def format_date(value):
+    """Format a date the way DRF's DateField does."""
+    return value.isoformat() if value else None
+
+
+def format_datetime(value):
+    """Format a datetime the way DRF's DateTimeField does."""
+    if not value:
+        return None
+    
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    value = value.isoformat()
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+    return value
+
+
+class ProjectionSerializer:
+    """
+    Minimal read-only serializer over ``.values()`` rows.
+    
+    Subclasses list the ``values_fields`` to project and implement
+    ``to_representation`` for a single row dict. The constructor and
+    ``data`` property mirror DRF serializers so views can use it through
+    ``get_serializer``.
+    """
+    
+    values_fields = ()
+    
+    def __init__(self, instance=None, many=False, context=None, **kwargs):
+        self.instance = instance
+        self.many = many
+        self.context = context or {}
+    
+    @classmethod
+    def project(cls, queryset, ordering=()):
+        """
+        Restrict a queryset to the columns this serializer reads.
+        
+        Columns named in ``ordering`` are projected too, since cursor
+        pagination reads the position from the ordering fields of each row.
+        """
+        fields = list(cls.values_fields)
+        for field in ordering:
+            name = field.lstrip('-')
+            if name not in fields:
+                fields.append(name)
+        return queryset.values(*fields)
+    
+    @property
+    def data(self):
+        """Serialized row, or list of rows when ``many=True``."""
+        if self.many:
+            to_representation = self.to_representation
+            return [to_representation(row) for row in self.instance]
+        return self.to_representation(self.instance)
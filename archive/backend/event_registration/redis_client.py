@@ -0,0 +1,35 @@
+"""
+Shared Redis clients for features that need more than the cache API.
+"""
+
+import asyncio
+import weakref
+from functools import lru_cache
+
+import redis
+import redis.asyncio
+from django.conf import settings
+
+
+_async_clients = weakref.WeakKeyDictionary()
+
+
+@lru_cache(maxsize=None)
+def get_redis_client():
+    """Return a process-wide Redis client bound to ``settings.REDIS_URL``."""
+    return redis.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+
+
+def get_async_redis_client():
+    """
+    Return an asyncio Redis client for the running event loop.
+    
+    Async connections belong to the loop that opened them, so one client
+    is kept per loop.
+    """
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None:
+        client = redis.asyncio.Redis.from_url(settings.REDIS_URL, decode_responses=True)
+        _async_clients[loop] = client
+    return client
@@ -0,0 +1,84 @@
+"""
+orjson-backed renderer and parser for the REST API.
+
+Both fall back to DRF's stdlib ``json`` implementations when orjson is not
+installed. Types orjson does not handle natively (Decimal, lazy strings,
+querysets, ...) are encoded by DRF's own encoder, and datetimes keep their
+full microsecond precision with a ``Z`` suffix for UTC, as DRF's encoder
+does. Compact output therefore matches ``JSONRenderer`` for the payloads the
+API serializers produce. Indented output and integers beyond 64 bits are
+rendered by ``JSONRenderer`` itself. Two differences remain: floats that
+need an exponent are written ``1e16`` rather than ``1e+16``, and NaN or
+infinity renders as ``null`` where ``JSONRenderer`` raises.
+"""
+
+import time
+
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+from .metrics import add_request_metric, registry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class ORJSONRenderer(JSONRenderer):
+    """JSONRenderer using orjson, with native UUID, date and datetime encoding."""
+    
+    _fallback_encoder = JSONEncoder()
+    
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Render data into JSON bytes and record size and encode time."""
+        if data is None:
+            return b''
+        
+        started = time.perf_counter()
+        
+        ret = None
+        # orjson only indents by two spaces, so indented output (the
+        # browsable API, ``; indent=4``) stays with JSONRenderer
+        if orjson is not None and not self.get_indent(accepted_media_type, renderer_context or {}):
+            try:
+                ret = orjson.dumps(
+                    data,
+                    default=self._fallback_encoder.default,
+                    option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS,
+                )
+            except orjson.JSONEncodeError:
+                # e.g. integers beyond 64 bits, which the stdlib encodes
+                ret = None
+        
+        if ret is None:
+            ret = super().render(data, accepted_media_type, renderer_context)
+        elif b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            # Match JSONRenderer, which escapes these for JavaScript embedding
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        
+        elapsed = time.perf_counter() - started
+        registry.observe('api_render_seconds', elapsed)
+        registry.observe('api_response_bytes', len(ret))
+        add_request_metric('render_seconds', elapsed)
+        
+        response = (renderer_context or {}).get('response')
+        if response is not None:
+            response['Server-Timing'] = f'render;dur={elapsed * 1000:.3f}'
+        
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    """JSONParser using orjson."""
+    
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Parse the incoming bytestream as JSON and return the result."""
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,123 @@
+"""
+Database routing for the event registration API.
+
+Reads are sent to the replica database (``REPLICA_DATABASE_ALIAS``) only
+inside ``replica_reads()``, which ``ReplicaReadMixin`` enables for the safe
+viewset actions listed in ``replica_actions``. Everything else (writes, and
+reads that must see them) stays on ``default``.
+
+After a successful write, the client is pinned to the primary for
+``REPLICA_STICKY_SECONDS`` with a cookie, so it reads its own writes
+despite replication lag.
+"""
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, router
+from rest_framework.permissions import SAFE_METHODS
+
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def replica_enabled():
+    """Return True when a read replica is configured."""
+    return settings.REPLICA_DATABASE_ALIAS in settings.DATABASES
+
+
+@contextmanager
+def replica_reads(enabled=True):
+    """Route reads inside the block to the replica, when one is configured."""
+    token = _use_replica.set(enabled and replica_enabled())
+    try:
+        yield
+    finally:
+        _use_replica.reset(token)
+
+
+def is_pinned_to_primary(request):
+    """Return True if the client wrote recently and must read from the primary."""
+    try:
+        pinned_until = float(request.COOKIES.get(settings.REPLICA_STICKY_COOKIE, 0))
+    except ValueError:
+        return False
+    return pinned_until > time.time()
+
+
+def pin_to_primary(response):
+    """Keep the client's reads on the primary for REPLICA_STICKY_SECONDS."""
+    response.set_cookie(
+        settings.REPLICA_STICKY_COOKIE,
+        str(time.time() + settings.REPLICA_STICKY_SECONDS),
+        max_age=settings.REPLICA_STICKY_SECONDS,
+        httponly=True,
+        samesite='Lax'
+    )
+
+
+class ReadReplicaRouter:
+    """Send reads to the replica inside ``replica_reads()``; writes to default."""
+    
+    def db_for_read(self, model, **hints):
+        if _use_replica.get():
+            return settings.REPLICA_DATABASE_ALIAS
+        return None
+    
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+    
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both aliases hold the same data
+        return True
+    
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replica receives its schema through replication
+        return db == DEFAULT_DB_ALIAS
+
+
+class ReplicaReadMixin:
+    """
+    Viewset mixin serving the actions in ``replica_actions`` from the replica.
+    
+    ``replica_actions = '__all__'`` routes every safe action. Only safe
+    methods are routed, and never for a client pinned to the primary by a
+    recent write.
+    """
+    
+    replica_actions = ()
+    
+    def use_replica(self, request):
+        """Return True if this request's reads may go to the replica."""
+        if request.method not in SAFE_METHODS or not replica_enabled():
+            return False
+        
+        action = self.action_map.get(request.method.lower())
+        if self.replica_actions != '__all__' and action not in self.replica_actions:
+            return False
+        
+        return not is_pinned_to_primary(request)
+    
+    def get_read_database(self):
+        """
+        Return the alias this request reads from.
+        
+        Querysets evaluated after the view returns (streamed responses) run
+        outside the routing context and must be pinned with ``using()``.
+        """
+        return router.db_for_read(self.queryset.model)
+    
+    def dispatch(self, request, *args, **kwargs):
+        with replica_reads(self.use_replica(request)):
+            response = super().dispatch(request, *args, **kwargs)
+        
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and replica_enabled()
+        ):
+            pin_to_primary(response)
+        
+        return response
@@ -0,0 +1,211 @@
+"""
+Full-text search backends for the event registration API.
+
+``FullTextSearchFilter`` replaces DRF's ``SearchFilter`` ``icontains``
+OR-chains with an indexed, ranked prefix search when the index for the
+model has been built (see the ``build_search_index`` command):
+
+* SQLite: an external-content FTS5 virtual table kept in sync by triggers.
+* PostgreSQL: a GIN expression index over ``SearchVector``.
+
+Without an index, or with ``SEARCH_BACKEND = 'basic'``, the stock
+``SearchFilter`` behaviour is used.
+"""
+
+import re
+
+from django.conf import settings
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework.filters import SearchFilter
+
+
+# Indexed columns per model label; must match the view search_fields
+SEARCH_INDEX_FIELDS = {
+    'events.event': ['name', 'description'],
+    'registrations.registration': ['full_name', 'email', 'college_name', 'department'],
+}
+
+_index_cache = {}
+
+
+def fts_table_name(model):
+    """Return the FTS5 table name for a model."""
+    return f'{model._meta.db_table}_fts'
+
+
+def gin_index_name(model):
+    """Return the GIN index name for a model (at most 30 characters)."""
+    return f'{model._meta.db_table[:22]}_fts_gin'
+
+
+def get_index_fields(model):
+    """Return the indexed fields for a model, or None if it is not indexed."""
+    return SEARCH_INDEX_FIELDS.get(model._meta.label_lower)
+
+
+class SQLiteFTSBackend:
+    """Ranked prefix search through an FTS5 external-content table."""
+
+    vendor = 'sqlite'
+
+    def index_exists(self, connection, model):
+        """Return True if the FTS5 table exists."""
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = %s",
+                [fts_table_name(model)]
+            )
+            return cursor.fetchone() is not None
+
+    def build_index(self, connection, model, rebuild=False):
+        """Create the FTS5 table and sync triggers, then (re)index all rows."""
+        table = model._meta.db_table
+        fts = fts_table_name(model)
+        columns = [model._meta.get_field(name).column for name in get_index_fields(model)]
+        column_list = ', '.join(columns)
+        new_values = ', '.join(f'new.{column}' for column in columns)
+        old_values = ', '.join(f'old.{column}' for column in columns)
+
+        statements = [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{column_list}, content='{table}', content_rowid='rowid', "
+            f"tokenize='unicode61 remove_diacritics 2')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+            f"VALUES ('delete', old.rowid, {old_values}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE ON {table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {column_list}) "
+            f"VALUES ('delete', old.rowid, {old_values}); "
+            f"INSERT INTO {fts}(rowid, {column_list}) VALUES (new.rowid, {new_values}); END",
+        ]
+        if rebuild or not self.index_exists(connection, model):
+            statements.append(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+
+        with connection.cursor() as cursor:
+            for statement in statements:
+                cursor.execute(statement)
+
+    def build_query(self, terms):
+        """Quote each term as an FTS5 prefix query; terms are ANDed."""
+        return ' '.join('"%s"*' % term.replace('"', '""') for term in terms)
+
+    def search(self, queryset, model, terms):
+        """Filter to FTS5 matches and annotate their bm25 rank."""
+        table = model._meta.db_table
+        fts = fts_table_name(model)
+        query = self.build_query(terms)
+        pk_column = model._meta.pk.column
+
+        matches = RawSQL(
+            f"SELECT {pk_column} FROM {table} WHERE rowid IN "
+            f"(SELECT rowid FROM {fts} WHERE {fts} MATCH %s)",
+            [query]
+        )
+        # bm25() is lower for better matches; typed so cursor positions
+        # compare as numbers rather than text
+        rank = RawSQL(
+            f"SELECT bm25({fts}) FROM {fts} WHERE {fts}.rowid = {table}.rowid AND {fts} MATCH %s",
+            [query],
+            output_field=FloatField()
+        )
+        return queryset.filter(pk__in=matches).annotate(search_rank=rank)
+
+
+class PostgresFTSBackend:
+    """Ranked prefix search over a GIN-indexed SearchVector."""
+
+    vendor = 'postgresql'
+
+    def _vector(self, model):
+        """Return the search expression shared by the index and queries."""
+        from django.contrib.postgres.search import SearchVector
+        return SearchVector(*get_index_fields(model), config='simple')
+
+    def index_exists(self, connection, model):
+        """Return True if the GIN index exists."""
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+        return gin_index_name(model) in constraints
+
+    def build_index(self, connection, model, rebuild=False):
+        """Create the GIN expression index matching the search expression."""
+        from django.contrib.postgres.indexes import GinIndex
+
+        index = GinIndex(self._vector(model), name=gin_index_name(model))
+        exists = self.index_exists(connection, model)
+
+        with connection.schema_editor() as schema_editor:
+            if exists and rebuild:
+                schema_editor.remove_index(model, index)
+                exists = False
+            if not exists:
+                schema_editor.add_index(model, index)
+
+    def build_query(self, terms):
+        """Build a raw tsquery of quoted prefix terms joined with AND."""
+        cleaned = [re.sub(r"['\\:&|!()<>*]", ' ', term).strip() for term in terms]
+        return ' & '.join("'%s':*" % term for term in cleaned if term)
+
+    def search(self, queryset, model, terms):
+        """Filter to tsquery matches and annotate their (negated) rank."""
+        from django.contrib.postgres.search import SearchQuery, SearchRank
+
+        query_string = self.build_query(terms)
+        if not query_string:
+            return queryset
+
+        vector = self._vector(model)
+        query = SearchQuery(query_string, search_type='raw', config='simple')
+        # Negate the rank so ascending order puts the best match first
+        return queryset.annotate(search_vector=vector).filter(
+            search_vector=query
+        ).annotate(search_rank=SearchRank(vector, query) * -1)
+
+
+BACKENDS = {
+    backend.vendor: backend
+    for backend in (SQLiteFTSBackend(), PostgresFTSBackend())
+}
+
+
+def get_search_backend(connection):
+    """Return the full-text backend for a connection, or None."""
+    return BACKENDS.get(connection.vendor)
+
+
+def has_search_index(alias, model):
+    """Return True when the full-text index for a model exists (cached)."""
+    key = (alias, model._meta.label_lower)
+    if key not in _index_cache:
+        connection = connections[alias]
+        backend = get_search_backend(connection)
+        _index_cache[key] = bool(
+            backend and get_index_fields(model) and backend.index_exists(connection, model)
+        )
+    return _index_cache[key]
+
+
+class FullTextSearchFilter(SearchFilter):
+    """
+    SearchFilter that uses the full-text index when it is available.
+
+    Matches are prefix matches on every term and are annotated with
+    ``search_rank`` (ascending is best), which the cursor pagination
+    orders by when present.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        search_terms = self.get_search_terms(request)
+        if not search_terms or settings.SEARCH_BACKEND == 'basic':
+            return super().filter_queryset(request, queryset, view)
+
+        model = queryset.model
+        if not has_search_index(queryset.db, model):
+            return super().filter_queryset(request, queryset, view)
+
+        backend = get_search_backend(connections[queryset.db])
+        return backend.search(queryset, model, search_terms)
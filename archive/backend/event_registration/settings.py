@@ -6,6 +6,7 @@ import os
 from pathlib import Path
 from datetime import timedelta
 from decouple import config
+from django.core.exceptions import ImproperlyConfigured
 
 # Build paths inside the project
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'event_registration.middleware.PerformanceMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -54,6 +56,17 @@ MIDDLEWARE = [
 
 ROOT_URLCONF = 'event_registration.urls'
 
+# Performance instrumentation: /metrics/ and request profiles are served
+# to requests carrying ``Authorization: Bearer <METRICS_TOKEN>`` or coming
+# from METRICS_ALLOWED_IPS (both empty by default, i.e. closed; behind a
+# reverse proxy every client shares the proxy's address, so prefer the
+# token), the repeat count at which a SQL statement is flagged as a
+# likely N+1, and whether X-Profile requests are honoured
+METRICS_TOKEN = config('METRICS_TOKEN', default='')
+METRICS_ALLOWED_IPS = [ip for ip in config('METRICS_ALLOWED_IPS', default='').split(',') if ip]
+N_PLUS_ONE_THRESHOLD = config('N_PLUS_ONE_THRESHOLD', default=5, cast=int)
+PROFILING_ENABLED = config('PROFILING_ENABLED', default=False, cast=bool)
+
 TEMPLATES = [
     {
         'BACKEND': 'django.template.backends.django.DjangoTemplates',
@@ -71,13 +84,101 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'event_registration.wsgi.application'
+ASGI_APPLICATION = 'event_registration.asgi.application'
+
+# Serve the public event list, open_registrations and registration create
+# through async views (deploy with an ASGI server, e.g. uvicorn). Under
+# ASGI, prefer CONN_MAX_AGE = 0 with a pooler (DB_POOL_MODE) over
+# persistent connections, which Django manages per worker thread.
+ASYNC_PUBLIC_API = config('ASYNC_PUBLIC_API', default=False, cast=bool)
+
+if ASYNC_PUBLIC_API:
+    # WhiteNoise's middleware is sync-only and would push every async view
+    # back onto a thread; let the web server or CDN serve static files
+    MIDDLEWARE.remove('whitenoise.middleware.WhiteNoiseMiddleware')
 
 # Database
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
+# 'sqlite' for development and small deployments, 'postgres' for production
+DB_ENGINE = config('DB_ENGINE', default='sqlite')
+
+if DB_ENGINE == 'postgres':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': config('DB_NAME', default='event_registration'),
+            'USER': config('DB_USER', default='postgres'),
+            'PASSWORD': config('DB_PASSWORD', default=''),
+            'HOST': config('DB_HOST', default='localhost'),
+            'PORT': config('DB_PORT', default='5432'),
+            # Keep connections open between requests and check them before reuse
+            'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', default=60, cast=int),
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {
+                'connect_timeout': config('DB_CONNECT_TIMEOUT', default=5, cast=int),
+            },
+        }
+    }
+    
+    # 'pgbouncer' for a transaction-pooling PgBouncer in front of Postgres
+    DB_POOL_MODE = config('DB_POOL_MODE', default='none')
+    if DB_POOL_MODE == 'pgbouncer':
+        # Server-side cursors do not survive transaction pooling, and the
+        # pooler owns the connections
+        DATABASES['default']['DISABLE_SERVER_SIDE_CURSORS'] = True
+        DATABASES['default']['CONN_MAX_AGE'] = 0
+    elif DB_POOL_MODE != 'none':
+        raise ImproperlyConfigured(f"Unsupported DB_POOL_MODE {DB_POOL_MODE!r}; use 'none' or 'pgbouncer'.")
+    
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': config('DB_NAME', default=str(BASE_DIR / 'db.sqlite3')),
+            'OPTIONS': {
+                # Seconds the sqlite3 module waits for a lock before failing
+                'timeout': config('SQLITE_TIMEOUT', default=20, cast=int),
+            },
+        }
+    }
+
+# Optional read replica for safe event reads, stats and exports: a
+# streaming Postgres replica (DB_REPLICA_HOST), or a second SQLite file
+# (DB_REPLICA_NAME) for local testing of the routing
+REPLICA_DATABASE_ALIAS = config('REPLICA_DATABASE_ALIAS', default='replica')
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+DB_REPLICA_NAME = config('DB_REPLICA_NAME', default='')
+if DB_REPLICA_HOST or DB_REPLICA_NAME:
+    DATABASES[REPLICA_DATABASE_ALIAS] = {
+        **DATABASES['default'],
+        'OPTIONS': dict(DATABASES['default']['OPTIONS']),
+        # Tests run against the primary only
+        'TEST': {'MIRROR': 'default'},
     }
+    if DB_REPLICA_HOST:
+        DATABASES[REPLICA_DATABASE_ALIAS]['HOST'] = DB_REPLICA_HOST
+        DATABASES[REPLICA_DATABASE_ALIAS]['PORT'] = config(
+            'DB_REPLICA_PORT', default=DATABASES['default'].get('PORT', '')
+        )
+    if DB_REPLICA_NAME:
+        DATABASES[REPLICA_DATABASE_ALIAS]['NAME'] = DB_REPLICA_NAME
+
+DATABASE_ROUTERS = ['event_registration.routers.ReadReplicaRouter']
+
+# After a successful write, a client's reads stay on the primary for this
+# many seconds (tracked with a cookie) so it sees its own writes
+REPLICA_STICKY_SECONDS = config('REPLICA_STICKY_SECONDS', default=10, cast=int)
+REPLICA_STICKY_COOKIE = 'db_primary_until'
+
+# Pragmas applied to every new SQLite connection (see event_registration/db.py)
+SQLITE_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': config('SQLITE_BUSY_TIMEOUT_MS', default=20000, cast=int),
+    'foreign_keys': 'ON',
+    'temp_store': 'MEMORY',
+    # Negative cache_size is in KiB
+    'cache_size': -config('SQLITE_CACHE_SIZE_KB', default=20000, cast=int),
+    'mmap_size': config('SQLITE_MMAP_SIZE', default=134217728, cast=int),
 }
 
 # Password validation
@@ -124,9 +225,18 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_FILTER_BACKENDS': (
         'django_filters.rest_framework.DjangoFilterBackend',
-        'rest_framework.filters.SearchFilter',
+        'event_registration.search.FullTextSearchFilter',
         'rest_framework.filters.OrderingFilter',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'event_registration.renderers.ORJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    'DEFAULT_PARSER_CLASSES': (
+        'event_registration.renderers.ORJSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
     'PAGE_SIZE': 50,
     'DEFAULT_THROTTLE_CLASSES': [
@@ -139,6 +249,18 @@ REST_FRAMEWORK = {
     }
 }
 
+# Fall back to DRF's stdlib json renderer and parser when disabled
+if not config('USE_ORJSON', default=True, cast=bool):
+    REST_FRAMEWORK['DEFAULT_RENDERER_CLASSES'] = (
+        'rest_framework.renderers.JSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    )
+    REST_FRAMEWORK['DEFAULT_PARSER_CLASSES'] = (
+        'rest_framework.parsers.JSONParser',
+        'rest_framework.parsers.FormParser',
+        'rest_framework.parsers.MultiPartParser',
+    )
+
 # JWT Settings
 SIMPLE_JWT = {
     'ACCESS_TOKEN_LIFETIME': timedelta(hours=1),
@@ -165,12 +287,41 @@ CORS_ALLOW_CREDENTIALS = True
 EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
-EMAIL_USE_TLS = True
+EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 EMAIL_HOST_USER = config('EMAIL_HOST_USER', default='')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default=EMAIL_HOST_USER)
 ADMIN_EMAIL = config('ADMIN_EMAIL', default='admin@example.com')
 
+# 'immediate' queues one email task per signup, 'batched' lets a periodic
+# task send pending confirmations in batches over one SMTP connection.
+REGISTRATION_EMAIL_MODE = config('REGISTRATION_EMAIL_MODE', default='immediate')
+REGISTRATION_EMAIL_BATCH_SIZE = config('REGISTRATION_EMAIL_BATCH_SIZE', default=200, cast=int)
+REGISTRATION_EMAIL_BATCH_SECONDS = config('REGISTRATION_EMAIL_BATCH_SECONDS', default=10, cast=float)
+
+# Registration emails are claimed by one sender at a time; a crashed
+# sender's claim expires after this many seconds. Registrations still
+# unsent after the maximum attempts are skipped (dead-lettered).
+REGISTRATION_EMAIL_CLAIM_SECONDS = config('REGISTRATION_EMAIL_CLAIM_SECONDS', default=300, cast=int)
+REGISTRATION_EMAIL_MAX_ATTEMPTS = config('REGISTRATION_EMAIL_MAX_ATTEMPTS', default=5, cast=int)
+
+# Bulk notification fan-out: recipients per subtask and per-provider
+# token bucket (sustained messages per second and burst size)
+BULK_NOTIFICATION_CHUNK_SIZE = config('BULK_NOTIFICATION_CHUNK_SIZE', default=500, cast=int)
+EMAIL_RATE_LIMIT_PER_SECOND = config('EMAIL_RATE_LIMIT_PER_SECOND', default=10, cast=float)
+EMAIL_RATE_LIMIT_BURST = config('EMAIL_RATE_LIMIT_BURST', default=20, cast=int)
+
+# 'immediate' notifies the admin per registration, 'digest' sends one
+# summary email per event with a CSV attachment on a schedule.
+ADMIN_NOTIFICATION_MODE = config('ADMIN_NOTIFICATION_MODE', default='immediate')
+ADMIN_DIGEST_INTERVAL_MINUTES = config('ADMIN_DIGEST_INTERVAL_MINUTES', default=60, cast=int)
+# An event's digest waits until it has this many new registrations...
+ADMIN_DIGEST_MIN_REGISTRATIONS = config('ADMIN_DIGEST_MIN_REGISTRATIONS', default=1, cast=int)
+# ...unless its oldest unreported registration is older than this
+ADMIN_DIGEST_MAX_WAIT_MINUTES = config('ADMIN_DIGEST_MAX_WAIT_MINUTES', default=1440, cast=int)
+# Registrations per digest email; larger backlogs are split across emails
+ADMIN_DIGEST_MAX_ROWS = config('ADMIN_DIGEST_MAX_ROWS', default=10000, cast=int)
+
 # Celery settings (for async tasks)
 CELERY_BROKER_URL = config('CELERY_BROKER_URL', default='redis://localhost:6379/0')
 CELERY_RESULT_BACKEND = config('CELERY_RESULT_BACKEND', default='redis://localhost:6379/0')
@@ -178,15 +329,112 @@ CELERY_ACCEPT_CONTENT = ['json']
 CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = TIME_ZONE
+CELERY_BEAT_SCHEDULE = {}
 
 # Cache settings
+REDIS_URL = config('REDIS_URL', default='redis://127.0.0.1:6379/1')
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': config('REDIS_URL', default='redis://127.0.0.1:6379/1'),
+        'LOCATION': REDIS_URL,
     }
 }
 
+# Public event endpoint caching: cached response lifetime, how long the
+# table fingerprint used for ETags may lag registration counts, and the
+# Cache-Control values sent to browsers and CDNs (all in seconds)
+EVENT_CACHE_TIMEOUT = config('EVENT_CACHE_TIMEOUT', default=300, cast=int)
+EVENT_CACHE_FINGERPRINT_TTL = config('EVENT_CACHE_FINGERPRINT_TTL', default=5, cast=int)
+EVENT_CACHE_MAX_AGE = config('EVENT_CACHE_MAX_AGE', default=30, cast=int)
+EVENT_CACHE_STALE_WHILE_REVALIDATE = config('EVENT_CACHE_STALE_WHILE_REVALIDATE', default=60, cast=int)
+# Event metadata read by registration validation: shared cache lifetime,
+# and size and lifetime of the per-process tier (edits made through another
+# process are seen once the local entry expires)
+EVENT_METADATA_CACHE_TIMEOUT = config('EVENT_METADATA_CACHE_TIMEOUT', default=300, cast=int)
+EVENT_METADATA_LOCAL_SIZE = config('EVENT_METADATA_LOCAL_SIZE', default=1024, cast=int)
+EVENT_METADATA_LOCAL_TTL = config('EVENT_METADATA_LOCAL_TTL', default=5, cast=float)
+# Upper bound on how long the open-registrations set is cached when no
+# registration window boundary is coming up
+OPEN_EVENTS_MAX_TTL = config('OPEN_EVENTS_MAX_TTL', default=3600, cast=int)
+
+# Serve hot list actions with dict-based projection serializers over
+# .values() rows instead of ModelSerializers
+USE_PROJECTION_SERIALIZERS = config('USE_PROJECTION_SERIALIZERS', default=True, cast=bool)
+
+# Search: 'auto' uses the full-text index when it has been built with the
+# build_search_index command, 'basic' always uses DRF's icontains search
+SEARCH_BACKEND = config('SEARCH_BACKEND', default='auto')
+
+# Registration statistics: cache lifetime and whether to serve counts from
+# the incrementally maintained daily rollup table (run the
+# rebuild_registration_rollups command before enabling)
+REGISTRATION_STATS_CACHE_TIMEOUT = config('REGISTRATION_STATS_CACHE_TIMEOUT', default=300, cast=int)
+REGISTRATION_STATS_USE_ROLLUP = config('REGISTRATION_STATS_USE_ROLLUP', default=False, cast=bool)
+
+# Duplicate-registration prefilter: per-event Redis Bloom filter (bits and
+# hash functions per email; 2**20 bits and 7 hashes keep false positives
+# near 1% up to ~100k registrations per event) and its lifetime before it
+# is rebuilt from the database
+REGISTRATION_MEMBERSHIP_ENABLED = config('REGISTRATION_MEMBERSHIP_ENABLED', default=True, cast=bool)
+REGISTRATION_MEMBERSHIP_BLOOM_BITS = config('REGISTRATION_MEMBERSHIP_BLOOM_BITS', default=2 ** 20, cast=int)
+REGISTRATION_MEMBERSHIP_BLOOM_HASHES = config('REGISTRATION_MEMBERSHIP_BLOOM_HASHES', default=7, cast=int)
+REGISTRATION_MEMBERSHIP_TTL = config('REGISTRATION_MEMBERSHIP_TTL', default=86400, cast=int)
+
+# Registration intake settings
+# 'direct' saves each signup in the request, 'queued' appends it to a Redis
+# stream that is flushed to the database in batches.
+REGISTRATION_INTAKE_MODE = config('REGISTRATION_INTAKE_MODE', default='direct')
+REGISTRATION_INTAKE_BATCH_SIZE = config('REGISTRATION_INTAKE_BATCH_SIZE', default=500, cast=int)
+REGISTRATION_INTAKE_FLUSH_SECONDS = config('REGISTRATION_INTAKE_FLUSH_SECONDS', default=2, cast=float)
+REGISTRATION_INTAKE_STATUS_TTL = config('REGISTRATION_INTAKE_STATUS_TTL', default=86400, cast=int)
+
+# Transactional outbox relay: how often committed rows are published to
+# Celery, rows claimed per batch, how long a claim lasts before a crashed
+# relay's rows are retried (seconds), claims after which an unpublished row
+# is given up (dead-lettered), and how long published rows are kept
+OUTBOX_RELAY_SECONDS = config('OUTBOX_RELAY_SECONDS', default=1, cast=float)
+OUTBOX_RELAY_BATCH_SIZE = config('OUTBOX_RELAY_BATCH_SIZE', default=1000, cast=int)
+OUTBOX_CLAIM_SECONDS = config('OUTBOX_CLAIM_SECONDS', default=60, cast=int)
+OUTBOX_MAX_ATTEMPTS = config('OUTBOX_MAX_ATTEMPTS', default=10, cast=int)
+OUTBOX_RETENTION_SECONDS = config('OUTBOX_RETENTION_SECONDS', default=7 * 86400, cast=int)
+# Window of recently published rows over which /metrics/ reports relay lag
+OUTBOX_LAG_WINDOW_SECONDS = config('OUTBOX_LAG_WINDOW_SECONDS', default=60, cast=int)
+
+CELERY_BEAT_SCHEDULE['relay-registration-outbox'] = {
+    'task': 'registrations.tasks.relay_registration_outbox',
+    'schedule': OUTBOX_RELAY_SECONDS,
+}
+
+# Live registration counts (server-sent events, ASGI only): updates sent
+# to each client per second at most (must be positive), idle keep-alive
+# interval and stream lifetime (seconds), and the client reconnect delay
+# (milliseconds)
+LIVE_UPDATES_PER_SECOND = config('LIVE_UPDATES_PER_SECOND', default=1, cast=float)
+LIVE_KEEPALIVE_SECONDS = config('LIVE_KEEPALIVE_SECONDS', default=15, cast=int)
+LIVE_MAX_STREAM_SECONDS = config('LIVE_MAX_STREAM_SECONDS', default=600, cast=int)
+LIVE_RETRY_MS = config('LIVE_RETRY_MS', default=3000, cast=int)
+if LIVE_UPDATES_PER_SECOND <= 0:
+    raise ImproperlyConfigured('LIVE_UPDATES_PER_SECOND must be greater than zero.')
+
+if REGISTRATION_EMAIL_MODE == 'batched':
+    CELERY_BEAT_SCHEDULE['dispatch-pending-registration-emails'] = {
+        'task': 'registrations.tasks.dispatch_pending_registration_emails',
+        'schedule': REGISTRATION_EMAIL_BATCH_SECONDS,
+    }
+
+if ADMIN_NOTIFICATION_MODE == 'digest':
+    CELERY_BEAT_SCHEDULE['send-admin-digest'] = {
+        'task': 'registrations.tasks.send_admin_digest',
+        'schedule': timedelta(minutes=ADMIN_DIGEST_INTERVAL_MINUTES),
+    }
+
+if REGISTRATION_INTAKE_MODE == 'queued':
+    CELERY_BEAT_SCHEDULE['flush-registration-intake'] = {
+        'task': 'registrations.tasks.flush_registration_intake',
+        'schedule': REGISTRATION_INTAKE_FLUSH_SECONDS,
+    }
+
 # Security settings for production
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -2,11 +2,14 @@
 URL configuration for event_registration project.
 """
 
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
+from events.async_views import category_live, event_live
+from .views import metrics
 
 # Swagger/OpenAPI schema
 schema_view = get_schema_view(
@@ -30,8 +33,26 @@ urlpatterns = [
     path('api/docs/', schema_view.with_ui('swagger', cache_timeout=0), name='schema-swagger-ui'),
     path('api/redoc/', schema_view.with_ui('redoc', cache_timeout=0), name='schema-redoc'),
     
+    # Performance metrics (Prometheus format, internal addresses only)
+    path('metrics/', metrics, name='metrics'),
+    
+    # Live registration counts (server-sent events), ahead of the event routes
+    path('api/events/live/', category_live, name='event-category-live'),
+    path('api/events/<uuid:pk>/live/', event_live, name='event-live'),
+    
     # API endpoints
     path('api/auth/', include('accounts.urls')),
     path('api/events/', include('events.urls')),
     path('api/registrations/', include('registrations.urls')),
 ]
+
+# Under ASGI, async views serve the public hot paths ahead of the routers
+if settings.ASYNC_PUBLIC_API:
+    from events.async_views import event_list, open_registrations
+    from registrations.async_views import registration_list
+    
+    urlpatterns = [
+        path('api/events/', event_list),
+        path('api/events/open_registrations/', open_registrations),
+        path('api/registrations/', registration_list),
+    ] + urlpatterns
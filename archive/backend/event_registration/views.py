@@ -0,0 +1,18 @@
+"""
+Project-level views for the event registration API.
+"""
+
+from django.http import HttpResponse, HttpResponseForbidden
+from .metrics import registry
+from .middleware import is_internal_request
+
+
+def metrics(request):
+    """Expose in-process metrics in the Prometheus text format."""
+    if not is_internal_request(request):
+        return HttpResponseForbidden()
+    
+    return HttpResponse(
+        registry.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
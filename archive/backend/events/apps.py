@@ -0,0 +1,17 @@
+"""
+App configuration for the events app.
+"""
+
+from django.apps import AppConfig
+
+
+class EventsConfig(AppConfig):
+    """Configuration for the events app."""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'events'
+    
+    def ready(self):
+        """Connect signal handlers."""
+        from . import signals  # noqa: F401
+        from event_registration import db  # noqa: F401
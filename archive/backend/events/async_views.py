@@ -0,0 +1,127 @@
+"""
+Async (ASGI) views for the public, high-volume event endpoints.
+
+Enabled with ``ASYNC_PUBLIC_API``. Unfiltered JSON reads are served with
+the async ORM and the async Redis client; any other request is handed to
+``EventViewSet`` so behaviour and output match the sync API. The live
+count streams (server-sent events) are only served under ASGI.
+"""
+
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
+from django.views.decorators.csrf import csrf_exempt
+from event_registration.async_api import delegate, json_response, throttled_response, wants_json
+from event_registration.pagination import EventCursorPagination
+from .caching import aget_open_event_ids, async_cache_response
+from .live import stream_states
+from .serializers import EventListProjection, EventListSerializer, EventSerializer
+from .models import Event
+from .views import EventViewSet
+
+
+event_list_view = EventViewSet.as_view({'get': 'list', 'post': 'create'})
+open_registrations_view = EventViewSet.as_view({'get': 'open_registrations'})
+
+
+def is_fast_path(request):
+    """Return True for plain JSON GETs without filters, search or cursor."""
+    return request.method == 'GET' and not request.GET and wants_json(request)
+
+
+@async_cache_response('EVENT_CACHE_TIMEOUT')
+async def _first_event_page(request):
+    """Build the first page of the event list, as EventViewSet.list does."""
+    paginator = EventCursorPagination()
+    queryset = Event.objects.filter(is_active=True).order_by(*paginator.ordering)
+    
+    if settings.USE_PROJECTION_SERIALIZERS:
+        rows = [
+            row async for row in
+            EventListProjection.project(queryset, paginator.ordering)[:paginator.page_size + 1]
+        ]
+        serializer_class = EventListProjection
+    else:
+        rows = [event async for event in queryset[:paginator.page_size + 1]]
+        serializer_class = EventListSerializer
+    
+    page = paginator.paginate_rows(request, rows)
+    return paginator.get_paginated_response(serializer_class(page, many=True).data).data
+
+
+# DRF enforces CSRF itself for session-authenticated writes
+@csrf_exempt
+async def event_list(request):
+    """List events (first page) or hand the request to EventViewSet."""
+    if not is_fast_path(request):
+        return await delegate(event_list_view, request)
+    
+    throttled = await throttled_response(request, EventViewSet)
+    if throttled is not None:
+        return throttled
+    return await _first_event_page(request)
+
+
+@async_cache_response('EVENT_CACHE_FINGERPRINT_TTL')
+async def _open_registrations(request):
+    """Build the open_registrations response, as EventViewSet does."""
+    open_ids = await aget_open_event_ids()
+    queryset = Event.objects.filter(is_active=True, pk__in=open_ids).with_registration_flags()
+    events = [event async for event in queryset]
+    return EventSerializer(events, many=True).data
+
+
+async def open_registrations(request):
+    """List events with open registration, or hand the request to EventViewSet."""
+    if not is_fast_path(request):
+        return await delegate(open_registrations_view, request)
+    
+    throttled = await throttled_response(request, EventViewSet)
+    if throttled is not None:
+        return throttled
+    return await _open_registrations(request)
+
+
+def live_response(request, queryset, keys):
+    """Stream live counts for a queryset; SSE needs the ASGI deployment."""
+    if not isinstance(request, ASGIRequest):
+        return json_response(
+            {'detail': 'Live updates are only available under ASGI (ASYNC_PUBLIC_API).'},
+            status=501
+        )
+    
+    response = StreamingHttpResponse(stream_states(queryset, keys), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Stop nginx from buffering the stream
+    response['X-Accel-Buffering'] = 'no'
+    return response
+
+
+async def event_live(request, pk):
+    """Stream live registration counts for one event."""
+    throttled = await throttled_response(request, EventViewSet)
+    if throttled is not None:
+        return throttled
+    
+    queryset = Event.objects.filter(pk=pk, is_active=True)
+    if not await queryset.aexists():
+        return json_response({'detail': 'Not found.'}, status=404)
+    
+    return live_response(request, queryset, [('event', str(pk))])
+
+
+async def category_live(request):
+    """Stream live registration counts for every active event in a category."""
+    category = request.GET.get('category')
+    if category not in Event.CATEGORY_LABELS:
+        return json_response(
+            {'error': f'Invalid category. Choose from: {", ".join(Event.CATEGORY_LABELS)}'},
+            status=400
+        )
+    
+    throttled = await throttled_response(request, EventViewSet)
+    if throttled is not None:
+        return throttled
+    
+    queryset = Event.objects.filter(category=category, is_active=True)
+    return live_response(request, queryset, [('category', category)])
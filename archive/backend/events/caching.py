@@ -0,0 +1,336 @@
+"""
+Response caching for the public, read-mostly event endpoints.
+
+Responses are cached under keys derived from a cheap fingerprint of the
+events table (version, last update, row and registration counts), which
+also serves as the ETag so unchanged resources are answered with
+304 Not Modified. Event save/delete signals bump the version.
+
+The set of events with open registration is cached separately until the
+next registration window boundary. Async views cache rendered bodies in
+Redis under the same version (``async_cache_response``).
+
+When Redis is unavailable the version cannot be read, so responses are
+computed from the database and not cached until it is back.
+"""
+
+import hashlib
+import logging
+import math
+from datetime import timedelta
+from functools import wraps
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models import Count, Max, Min, Q, Sum
+from django.http import HttpResponse
+from django.utils import timezone
+from django.utils.cache import patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from event_registration.async_api import render_json
+from event_registration.redis_client import get_async_redis_client, get_redis_client
+
+
+CACHE_VERSION_KEY = 'events:cache:version'
+FINGERPRINT_KEY = 'events:cache:fingerprint:{}'
+RESPONSE_KEY = 'events:cache:response:{}'
+CACHE_STATS_KEY = 'events:cache:stats'
+OPEN_EVENTS_KEY = 'events:cache:open:{}'
+ASYNC_RESPONSE_KEY = 'events:cache:async:{}:{}'
+
+logger = logging.getLogger(__name__)
+
+
+def get_cache_version():
+    """Return the current event cache version, or None if Redis is unavailable."""
+    try:
+        return int(get_redis_client().get(CACHE_VERSION_KEY) or 0)
+    except redis.RedisError:
+        logger.warning("Event cache unavailable; serving uncached responses", exc_info=True)
+        return None
+
+
+async def aget_cache_version():
+    """Async variant of ``get_cache_version``."""
+    try:
+        return int(await get_async_redis_client().get(CACHE_VERSION_KEY) or 0)
+    except redis.RedisError:
+        logger.warning("Event cache unavailable; serving uncached responses", exc_info=True)
+        return None
+
+
+def invalidate_event_cache():
+    """Bump the cache version so every cached event response is bypassed."""
+    try:
+        get_redis_client().incr(CACHE_VERSION_KEY)
+    except redis.RedisError:
+        # Entries cached under the old version expire with their timeouts
+        logger.warning("Could not bump the event cache version", exc_info=True)
+
+
+def get_fingerprint():
+    """
+    Return a fingerprint of the events table.
+
+    Computed with one aggregate query and cached briefly, so registration
+    counts (which change without touching Event.updated_at) are reflected
+    within EVENT_CACHE_FINGERPRINT_TTL seconds. It is read from the primary:
+    a lagging replica would cache a pre-write fingerprint under the version
+    the write just bumped.
+    """
+    from .models import Event
+
+    version = get_cache_version()
+    key = FINGERPRINT_KEY.format(version)
+    fingerprint = cache.get(key) if version is not None else None
+
+    if fingerprint is None:
+        now = timezone.now()
+        fingerprint = Event.objects.using(DEFAULT_DB_ALIAS).order_by().aggregate(
+            last_modified=Max('updated_at'),
+            events=Count('id'),
+            registrations=Sum('registration_count'),
+            open_events=Count('id', filter=Q(
+                is_active=True,
+                registration_start_date__lte=now,
+                registration_end_date__gte=now
+            )),
+        )
+        fingerprint['version'] = version
+        if version is not None:
+            cache.set(key, fingerprint, settings.EVENT_CACHE_FINGERPRINT_TTL)
+
+    return fingerprint
+
+
+def _open_events_queries(now):
+    """Return the open-event IDs queryset and the next-boundary aggregates."""
+    from .models import Event
+
+    # Always the primary: the result is cached until the next boundary, so a
+    # lagging replica would keep an edited event out of (or in) the set
+    active = Event.objects.using(DEFAULT_DB_ALIAS).filter(is_active=True).order_by()
+    ids = active.filter(
+        registration_start_date__lte=now,
+        registration_end_date__gte=now
+    ).values_list('pk', flat=True)
+    boundaries = {
+        'next_start': Min('registration_start_date', filter=Q(registration_start_date__gt=now)),
+        'next_end': Min('registration_end_date', filter=Q(registration_end_date__gte=now)),
+    }
+    return active, ids, boundaries
+
+
+def _open_events_entry(now, ids, boundaries):
+    """Return the cache entry for the open-event IDs and its timeout."""
+    # Windows include their end instant, so the set changes just after it
+    candidates = [now + timedelta(seconds=settings.OPEN_EVENTS_MAX_TTL)]
+    if boundaries['next_start']:
+        candidates.append(boundaries['next_start'])
+    if boundaries['next_end']:
+        candidates.append(boundaries['next_end'] + timedelta(seconds=1))
+    valid_until = min(candidates)
+
+    timeout = max(1, math.ceil((valid_until - now).total_seconds()))
+    return {'ids': ids, 'valid_until': valid_until}, timeout
+
+
+def get_open_event_ids():
+    """
+    Return the IDs of active events whose registration window is open.
+
+    The set only changes when a window starts or ends (or an event is
+    edited, which bumps the cache version), so it is cached until the next
+    registration_start_date or registration_end_date boundary.
+    """
+    version = get_cache_version()
+    now = timezone.now()
+    if version is None:
+        return list(_open_events_queries(now)[1])
+
+    key = OPEN_EVENTS_KEY.format(version)
+    cached = cache.get(key)
+    if cached is not None and cached['valid_until'] > now:
+        return cached['ids']
+
+    active, ids, boundaries = _open_events_queries(now)
+    entry, timeout = _open_events_entry(now, list(ids), active.aggregate(**boundaries))
+    cache.set(key, entry, timeout)
+    return entry['ids']
+
+
+async def aget_open_event_ids():
+    """Async variant of ``get_open_event_ids``."""
+    version = await aget_cache_version()
+    now = timezone.now()
+    if version is None:
+        return [pk async for pk in _open_events_queries(now)[1]]
+
+    key = OPEN_EVENTS_KEY.format(version)
+    cached = await cache.aget(key)
+    if cached is not None and cached['valid_until'] > now:
+        return cached['ids']
+
+    active, ids, boundaries = _open_events_queries(now)
+    entry, timeout = _open_events_entry(
+        now,
+        [pk async for pk in ids],
+        await active.aaggregate(**boundaries)
+    )
+    await cache.aset(key, entry, timeout)
+    return entry['ids']
+
+
+def compute_etag(request, fingerprint):
+    """Build a strong ETag for a request against the current fingerprint."""
+    payload = '|'.join([
+        str(fingerprint['version']),
+        str(fingerprint['last_modified']),
+        str(fingerprint['events']),
+        str(fingerprint['registrations']),
+        str(fingerprint['open_events']),
+        request.get_full_path(),
+        request.META.get('HTTP_ACCEPT', ''),
+    ])
+    return '"%s"' % hashlib.md5(payload.encode('utf-8')).hexdigest()
+
+
+def record_cache_outcome(outcome):
+    """Count a cache hit, miss or 304 response."""
+    try:
+        get_redis_client().hincrby(CACHE_STATS_KEY, outcome, 1)
+    except redis.RedisError:
+        logger.warning("Could not record the event cache outcome", exc_info=True)
+
+
+def get_cache_stats():
+    """Return cache hit/miss/not-modified counters (zero if Redis is unavailable)."""
+    try:
+        stats = get_redis_client().hgetall(CACHE_STATS_KEY)
+    except redis.RedisError:
+        logger.warning("Event cache stats unavailable", exc_info=True)
+        stats = {}
+    return {
+        outcome: int(stats.get(outcome, 0))
+        for outcome in ('hit', 'miss', 'not_modified')
+    }
+
+
+def cache_response(view_method):
+    """
+    Cache a read-only viewset method and answer conditional requests.
+
+    Successful response data is cached by ETag; requests whose
+    If-None-Match matches the current ETag get 304 Not Modified.
+    """
+    @wraps(view_method)
+    def wrapper(self, request, *args, **kwargs):
+        fingerprint = get_fingerprint()
+        etag = compute_etag(request, fingerprint)
+
+        if etag in parse_etags(request.headers.get('If-None-Match', '')):
+            outcome = 'not_modified'
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            key = RESPONSE_KEY.format(etag)
+            cacheable = fingerprint['version'] is not None
+            data = cache.get(key) if cacheable else None
+
+            if data is None:
+                outcome = 'miss'
+                response = view_method(self, request, *args, **kwargs)
+                if response.status_code != status.HTTP_200_OK:
+                    return response
+                if cacheable:
+                    cache.set(key, response.data, settings.EVENT_CACHE_TIMEOUT)
+            else:
+                outcome = 'hit'
+                response = Response(data)
+
+        record_cache_outcome(outcome)
+
+        response['ETag'] = etag
+        response['X-Cache'] = outcome.upper()
+        if fingerprint['last_modified']:
+            response['Last-Modified'] = http_date(fingerprint['last_modified'].timestamp())
+        patch_cache_control(
+            response,
+            public=True,
+            max_age=settings.EVENT_CACHE_MAX_AGE,
+            stale_while_revalidate=settings.EVENT_CACHE_STALE_WHILE_REVALIDATE
+        )
+        patch_vary_headers(response, ['Accept'])
+        return response
+
+    return wrapper
+
+
+def async_cache_response(timeout_setting):
+    """
+    Cache the rendered body of an async view that returns response data.
+
+    Bodies are stored in Redis under the cache version and the request URL
+    for ``settings.<timeout_setting>`` seconds; the ETag is a hash of the
+    body, so If-None-Match is answered with 304 Not Modified. A view may
+    return an HttpResponse instead of data, which is passed through.
+    """
+    def decorator(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            client = get_async_redis_client()
+            version = await aget_cache_version()
+            key = None
+            body = None
+            if version is not None:
+                url = request.build_absolute_uri()
+                key = ASYNC_RESPONSE_KEY.format(version, hashlib.md5(url.encode('utf-8')).hexdigest())
+                try:
+                    body = await client.get(key)
+                except redis.RedisError:
+                    logger.warning("Event cache unavailable; serving uncached responses", exc_info=True)
+                    key = None
+
+            if body is None:
+                outcome = 'miss'
+                data = await view(request, *args, **kwargs)
+                if isinstance(data, HttpResponse):
+                    return data
+                body = render_json(data).decode('utf-8')
+                if key is not None:
+                    try:
+                        await client.set(key, body, ex=getattr(settings, timeout_setting))
+                    except redis.RedisError:
+                        logger.warning("Could not cache the event response", exc_info=True)
+            else:
+                outcome = 'hit'
+
+            etag = '"%s"' % hashlib.md5(body.encode('utf-8')).hexdigest()
+            if etag in parse_etags(request.headers.get('If-None-Match', '')):
+                outcome = 'not_modified'
+                response = HttpResponse(status=status.HTTP_304_NOT_MODIFIED)
+            else:
+                response = HttpResponse(body, content_type='application/json')
+
+            try:
+                await client.hincrby(CACHE_STATS_KEY, outcome, 1)
+            except redis.RedisError:
+                logger.warning("Could not record the event cache outcome", exc_info=True)
+
+            response['ETag'] = etag
+            response['X-Cache'] = outcome.upper()
+            patch_cache_control(
+                response,
+                public=True,
+                max_age=settings.EVENT_CACHE_MAX_AGE,
+                stale_while_revalidate=settings.EVENT_CACHE_STALE_WHILE_REVALIDATE
+            )
+            patch_vary_headers(response, ['Accept'])
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,196 @@
+"""
+Live registration counts pushed to browsers over server-sent events.
+
+Registration creates and deletes publish the new count of each affected
+event to ``events:live:<event id>`` over Redis pub/sub once their
+transaction commits. Each ASGI process runs one ``LiveHub`` holding a
+single pattern subscription, and fans messages out to its open streams.
+Every stream coalesces what it receives and sends at most
+LIVE_UPDATES_PER_SECOND updates, so an open tab costs one idle coroutine
+rather than repeated polls of the event endpoints.
+"""
+
+import asyncio
+import json
+import logging
+import weakref
+from collections import defaultdict
+
+import redis
+from django.conf import settings
+from django.db import transaction
+from event_registration.redis_client import get_async_redis_client, get_redis_client
+from .models import Event
+
+
+logger = logging.getLogger(__name__)
+
+CHANNEL = 'events:live:{}'
+CHANNEL_PATTERN = 'events:live:*'
+
+SNAPSHOT_FIELDS = ('id', 'category', 'registration_count', 'max_participants')
+
+
+def build_state(row, delta=0):
+    """Return the client-facing state of one event from a values() row."""
+    max_participants = row['max_participants']
+    return {
+        'event': str(row['id']),
+        'category': row['category'],
+        'registration_count': row['registration_count'],
+        'max_participants': max_participants,
+        'seats_remaining': (
+            None if max_participants is None
+            else max(max_participants - row['registration_count'], 0)
+        ),
+        'delta': delta,
+    }
+
+
+def publish_registration_deltas(deltas):
+    """
+    Publish the new counts of events whose registrations changed.
+    
+    Args:
+        deltas: Mapping of event ID to the signed change in registrations
+    
+    Publishing waits for the surrounding transaction to commit, so rolled
+    back signups are never announced.
+    """
+    deltas = {event_id: delta for event_id, delta in deltas.items() if delta}
+    if deltas:
+        transaction.on_commit(lambda: _publish(deltas))
+
+
+def _publish(deltas):
+    """Read the committed counts and publish one message per event."""
+    try:
+        rows = Event.objects.filter(pk__in=deltas.keys()).values(*SNAPSHOT_FIELDS)
+        pipe = get_redis_client().pipeline(transaction=False)
+        for row in rows:
+            state = build_state(row, deltas[row['id']])
+            pipe.publish(CHANNEL.format(row['id']), json.dumps(state))
+        pipe.execute()
+    except redis.RedisError:
+        # Live counts are best effort; the next change republishes the count
+        logger.warning("Could not publish live registration counts", exc_info=True)
+
+
+class LiveStream:
+    """Coalescing buffer for one open SSE stream."""
+    
+    def __init__(self, keys):
+        self.keys = keys
+        self.pending = {}
+        self.ready = asyncio.Event()
+    
+    def push(self, state):
+        """Keep the latest state per event, summing deltas since the last send."""
+        previous = self.pending.get(state['event'])
+        if previous is not None:
+            state = {**state, 'delta': previous['delta'] + state['delta']}
+        self.pending[state['event']] = state
+        self.ready.set()
+    
+    def drain(self):
+        """Return and clear the coalesced updates."""
+        updates = list(self.pending.values())
+        self.pending = {}
+        self.ready.clear()
+        return updates
+
+
+class LiveHub:
+    """Per-process pub/sub subscriber dispatching to open streams."""
+    
+    def __init__(self):
+        self.streams = defaultdict(set)
+        self.task = None
+    
+    def add(self, stream):
+        for key in stream.keys:
+            self.streams[key].add(stream)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self.run())
+    
+    def remove(self, stream):
+        for key in stream.keys:
+            self.streams[key].discard(stream)
+            if not self.streams[key]:
+                del self.streams[key]
+    
+    def dispatch(self, state):
+        """Hand a published state to the streams of its event and category."""
+        targets = self.streams.get(('event', state['event']), set()) | \
+            self.streams.get(('category', state['category']), set())
+        for stream in targets:
+            stream.push(state)
+    
+    async def run(self):
+        """Listen to every event channel, resubscribing after connection errors."""
+        while True:
+            pubsub = get_async_redis_client().pubsub()
+            try:
+                await pubsub.psubscribe(CHANNEL_PATTERN)
+                async for message in pubsub.listen():
+                    if message['type'] == 'pmessage':
+                        self.dispatch(json.loads(message['data']))
+            except redis.RedisError:
+                logger.warning("Live updates subscription lost; reconnecting", exc_info=True)
+                await asyncio.sleep(1)
+            finally:
+                await pubsub.aclose()
+
+
+_hubs = weakref.WeakKeyDictionary()
+
+
+def get_hub():
+    """Return the hub for the running event loop (one per ASGI process)."""
+    loop = asyncio.get_running_loop()
+    hub = _hubs.get(loop)
+    if hub is None:
+        hub = _hubs[loop] = LiveHub()
+    return hub
+
+
+def format_sse(event, data):
+    """Encode one server-sent event."""
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+async def stream_states(queryset, keys):
+    """
+    Yield SSE messages: a snapshot of the queryset, then coalesced updates.
+    
+    The stream subscribes before reading the snapshot so no change is
+    missed; updates carry absolute counts, so one that overlaps the
+    snapshot is harmless. Streams end after LIVE_MAX_STREAM_SECONDS and
+    EventSource reconnects, which spreads long-lived clients across
+    processes.
+    """
+    hub = get_hub()
+    stream = LiveStream(keys)
+    hub.add(stream)
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + settings.LIVE_MAX_STREAM_SECONDS
+    interval = 1 / settings.LIVE_UPDATES_PER_SECOND
+    
+    try:
+        yield f'retry: {settings.LIVE_RETRY_MS}\n\n'
+        snapshot = [build_state(row) async for row in queryset.values(*SNAPSHOT_FIELDS)]
+        yield format_sse('snapshot', snapshot)
+        
+        while loop.time() < deadline:
+            try:
+                await asyncio.wait_for(stream.ready.wait(), settings.LIVE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                # Comment lines keep proxies from closing an idle stream
+                yield ': keep-alive\n\n'
+                continue
+            
+            yield format_sse('update', stream.drain())
+            # Coalesce whatever arrives in the meantime into the next update
+            await asyncio.sleep(interval)
+    finally:
+        hub.remove(stream)
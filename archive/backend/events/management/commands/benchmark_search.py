@@ -0,0 +1,63 @@
+"""
+Management command comparing full-text search with the icontains filter.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.models import Q
+from event_registration.search import get_index_fields, get_search_backend
+from registrations.models import Registration
+
+
+class Command(BaseCommand):
+    """Time registration searches through both search paths."""
+    
+    help = 'Benchmark full-text registration search against the icontains filter.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('terms', nargs='+', help='Search strings to benchmark.')
+        parser.add_argument('--repeat', type=int, default=20)
+        parser.add_argument('--limit', type=int, default=50, help='Rows fetched per search (one page).')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+    
+    def _time(self, build_queryset, repeat, limit):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            list(build_queryset()[:limit])
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+    
+    def handle(self, *args, **options):
+        alias = options['database']
+        connection = connections[alias]
+        backend = get_search_backend(connection)
+        if backend is None or not backend.index_exists(connection, Registration):
+            raise CommandError("Run build_search_index before benchmarking.")
+        
+        queryset = Registration.objects.using(alias)
+        fields = get_index_fields(Registration)
+        self.stdout.write(f"{queryset.count()} registrations on {connection.vendor}")
+        
+        for term in options['terms']:
+            words = term.split()
+            
+            def icontains():
+                condition = Q()
+                for word in words:
+                    condition &= Q(*[Q(**{f'{field}__icontains': word}) for field in fields], _connector=Q.OR)
+                return queryset.filter(condition)
+            
+            def fulltext():
+                return backend.search(queryset, Registration, words).order_by('search_rank')
+            
+            for label, build in (('icontains', icontains), ('fulltext', fulltext)):
+                timings = self._time(build, options['repeat'], options['limit'])
+                self.stdout.write(
+                    f"{term!r:24} {label:10} "
+                    f"median {statistics.median(timings):8.2f} ms  "
+                    f"max {max(timings):8.2f} ms"
+                )
@@ -0,0 +1,39 @@
+"""
+Management command to build the full-text search indexes.
+"""
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+from event_registration.search import get_search_backend
+from events.models import Event
+from registrations.models import Registration
+
+
+class Command(BaseCommand):
+    """Create the FTS5 tables (SQLite) or GIN indexes (PostgreSQL) used by search."""
+    
+    help = 'Build the full-text search indexes for events and registrations.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--database',
+            default=DEFAULT_DB_ALIAS,
+            help='Database alias to build the indexes on.'
+        )
+        parser.add_argument(
+            '--rebuild',
+            action='store_true',
+            help='Re-index existing rows (run after VACUUM on SQLite).'
+        )
+    
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        backend = get_search_backend(connection)
+        if backend is None:
+            raise CommandError(f"Full-text search is not supported on {connection.vendor}.")
+        
+        for model in (Event, Registration):
+            backend.build_index(connection, model, rebuild=options['rebuild'])
+            self.stdout.write(f"Indexed {model._meta.label}")
+        
+        self.stdout.write(self.style.SUCCESS("Search indexes are ready."))
@@ -0,0 +1,79 @@
+"""
+Management command checking orjson output against DRF's JSONRenderer.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from event_registration.renderers import ORJSONRenderer
+from events.models import Event
+from registrations.models import Registration
+
+
+class Command(BaseCommand):
+    """Render every read endpoint with both renderers and compare the bytes."""
+    
+    help = 'Verify ORJSONRenderer output matches JSONRenderer for every read endpoint.'
+    
+    def get_paths(self):
+        """Return the GET endpoints of the events and registrations APIs."""
+        paths = [
+            '/api/events/',
+            '/api/events/categories/',
+            '/api/events/dates/',
+            '/api/events/open_registrations/',
+            '/api/registrations/',
+            '/api/registrations/stats/',
+        ]
+        
+        event = Event.objects.filter(is_active=True).first()
+        if event is not None:
+            paths += [
+                f'/api/events/{event.pk}/',
+                f'/api/events/{event.pk}/registrations/',
+                f'/api/events/by_category/?category={event.category}',
+            ]
+        
+        registration = Registration.objects.first()
+        if registration is not None:
+            paths += [
+                f'/api/registrations/{registration.pk}/',
+                f'/api/registrations/my_registrations/?email={registration.email}',
+            ]
+        
+        return paths
+    
+    def handle(self, *args, **options):
+        # Use a configured host; the test client's default 'testserver' is
+        # only allowed under the test runner
+        client = APIClient(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        # Unsaved staff user: passes IsAdminUser without touching the database
+        client.force_authenticate(get_user_model()(username='renderer-check', is_staff=True))
+        
+        stock = JSONRenderer()
+        fast = ORJSONRenderer()
+        mismatches = 0
+        failures = 0
+        
+        for path in self.get_paths():
+            response = client.get(path, HTTP_ACCEPT='application/json')
+            if response.status_code != 200:
+                failures += 1
+                self.stdout.write(self.style.ERROR(f"{path}: HTTP {response.status_code}"))
+                continue
+            
+            expected = stock.render(response.data)
+            actual = fast.render(response.data)
+            if expected == actual:
+                self.stdout.write(f"{path}: OK ({len(actual)} bytes)")
+            else:
+                mismatches += 1
+                self.stdout.write(self.style.ERROR(f"{path}: output differs"))
+        
+        if mismatches or failures:
+            raise CommandError(
+                f"{mismatches} endpoint(s) rendered differently, {failures} endpoint(s) failed."
+            )
+        self.stdout.write(self.style.SUCCESS("All endpoints render identically."))
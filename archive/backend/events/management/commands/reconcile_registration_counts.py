@@ -0,0 +1,46 @@
+"""
+Management command to repair drift in Event.registration_count.
+"""
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F
+from events.models import Event
+
+
+class Command(BaseCommand):
+    """Recount registrations for events whose stored count has drifted."""
+    
+    help = 'Recompute Event.registration_count from the registrations table.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report drifted events without updating them.'
+        )
+    
+    def handle(self, *args, **options):
+        drifted = Event.objects.annotate(
+            actual_count=Count('registrations')
+        ).exclude(registration_count=F('actual_count')).values_list('pk', flat=True)
+        
+        repaired = 0
+        for event_id in drifted:
+            with transaction.atomic():
+                # Lock the row so concurrent signups wait for the recount
+                event = Event.objects.select_for_update().get(pk=event_id)
+                actual = event.registrations.count()
+                
+                if event.registration_count == actual:
+                    continue
+                
+                self.stdout.write(
+                    f"{event.name}: stored {event.registration_count}, actual {actual}"
+                )
+                
+                if not options['dry_run']:
+                    Event.objects.filter(pk=event_id).update(registration_count=actual)
+                    repaired += 1
+        
+        self.stdout.write(self.style.SUCCESS(f"Repaired {repaired} event(s)."))
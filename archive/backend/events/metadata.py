@@ -0,0 +1,159 @@
+"""
+Read-through cache of event metadata used by registration validation.
+
+Signups only need fields that rarely change (registration window,
+``max_participants``, ``is_active``, name, category and date), so they are
+cached in two tiers: a small per-process LRU with a short TTL in front of
+the shared Redis cache. Event save/delete signals drop both tiers; other
+processes see an edit once their local entry expires
+(EVENT_METADATA_LOCAL_TTL). Registration counts are not cached; capacity is
+enforced by ``Event.reserve_seats``. When Redis is unavailable, lookups
+fall back to the database.
+"""
+
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from .models import Event
+
+
+logger = logging.getLogger(__name__)
+
+METADATA_KEY = 'events:metadata:{}'
+
+METADATA_FIELDS = (
+    'id', 'name', 'category', 'event_date', 'registration_start_date',
+    'registration_end_date', 'max_participants', 'is_active',
+)
+
+
+class LocalLRUCache:
+    """Thread-safe, size-bounded in-process cache with per-entry expiry."""
+    
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return None
+            expires, value = entry
+            if expires < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+    
+    def set(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+    
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+    
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+_local_cache = LocalLRUCache(
+    settings.EVENT_METADATA_LOCAL_SIZE,
+    settings.EVENT_METADATA_LOCAL_TTL
+)
+
+
+def _to_event(values):
+    """Build an Event from cached values; other fields stay deferred."""
+    return Event.from_db(DEFAULT_DB_ALIAS, METADATA_FIELDS, [values[name] for name in METADATA_FIELDS])
+
+
+def get_event(event_id):
+    """
+    Return the Event with only its metadata fields loaded, or None.
+    
+    The instance is built from the cache; accessing any other field (such
+    as ``registration_count``) loads it from the database.
+    """
+    try:
+        event_id = uuid.UUID(str(event_id))
+    except (TypeError, ValueError):
+        return None
+    
+    key = METADATA_KEY.format(event_id)
+    values = _local_cache.get(key)
+    
+    if values is None:
+        try:
+            values = cache.get(key)
+        except redis.RedisError:
+            logger.warning("Event metadata cache unavailable; reading the database", exc_info=True)
+            values = None
+        
+        if values is None:
+            values = Event.objects.filter(pk=event_id).values(*METADATA_FIELDS).first()
+            if values is None:
+                return None
+            try:
+                cache.set(key, values, settings.EVENT_METADATA_CACHE_TIMEOUT)
+            except redis.RedisError:
+                pass
+        _local_cache.set(key, values)
+    
+    return _to_event(values)
+
+
+async def aget_event(event_id):
+    """Async variant of ``get_event``."""
+    try:
+        event_id = uuid.UUID(str(event_id))
+    except (TypeError, ValueError):
+        return None
+    
+    key = METADATA_KEY.format(event_id)
+    values = _local_cache.get(key)
+    
+    if values is None:
+        try:
+            values = await cache.aget(key)
+        except redis.RedisError:
+            logger.warning("Event metadata cache unavailable; reading the database", exc_info=True)
+            values = None
+        
+        if values is None:
+            values = await Event.objects.filter(pk=event_id).values(*METADATA_FIELDS).afirst()
+            if values is None:
+                return None
+            try:
+                await cache.aset(key, values, settings.EVENT_METADATA_CACHE_TIMEOUT)
+            except redis.RedisError:
+                pass
+        _local_cache.set(key, values)
+    
+    return _to_event(values)
+
+
+def invalidate_event_metadata(event_ids):
+    """Drop cached metadata for the given events."""
+    keys = [METADATA_KEY.format(event_id) for event_id in event_ids]
+    for key in keys:
+        _local_cache.delete(key)
+    try:
+        cache.delete_many(keys)
+    except redis.RedisError:
+        # Entries still expire after EVENT_METADATA_CACHE_TIMEOUT
+        logger.warning("Could not invalidate event metadata %s", event_ids, exc_info=True)
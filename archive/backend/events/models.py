@@ -8,6 +8,37 @@ from django.core.validators import RegexValidator
 from django.utils import timezone
 
 
+class EventQuerySet(models.QuerySet):
+    """QuerySet for Event model."""
+    
+    def with_registration_flags(self):
+        """
+        Annotate registration open/full flags computed by the database.
+        
+        Event.is_registration_open() and Event.is_full() read these
+        annotations when present, so serializing many events needs no
+        per-instance work.
+        """
+        now = timezone.now()
+        return self.annotate(
+            annotated_is_open=models.ExpressionWrapper(
+                models.Q(
+                    is_active=True,
+                    registration_start_date__lte=now,
+                    registration_end_date__gte=now
+                ),
+                output_field=models.BooleanField()
+            ),
+            annotated_is_full=models.ExpressionWrapper(
+                models.Q(
+                    max_participants__isnull=False,
+                    registration_count__gte=models.F('max_participants')
+                ),
+                output_field=models.BooleanField()
+            ),
+        )
+
+
 class Event(models.Model):
     """Model for storing event configurations."""
     
@@ -18,6 +49,9 @@ class Event(models.Model):
         ('one_day_workshop', 'One-day Workshop'),
     ]
     
+    # Lookup table for category labels without per-instance display calls
+    CATEGORY_LABELS = dict(CATEGORY_CHOICES)
+    
     id = models.UUIDField(primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=255, help_text="Event name")
     category = models.CharField(
@@ -39,15 +73,24 @@ class Event(models.Model):
         help_text="Maximum number of participants (optional)"
     )
     is_active = models.BooleanField(default=True, help_text="Is event active?")
+    registration_count = models.PositiveIntegerField(
+        default=0,
+        editable=False,
+        help_text="Denormalized number of registrations for this event"
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     
+    objects = EventQuerySet.as_manager()
+    
     class Meta:
         ordering = ['-event_date']
         indexes = [
             models.Index(fields=['category']),
-            models.Index(fields=['event_date']),
-            models.Index(fields=['is_active']),
+            # Backs cursor pagination ordered by (event_date, id)
+            models.Index(fields=['-event_date', '-id']),
+            # Backs the "registration currently open" lookups
+            models.Index(fields=['is_active', 'registration_start_date', 'registration_end_date']),
         ]
         verbose_name = 'Event'
         verbose_name_plural = 'Events'
@@ -57,6 +100,11 @@ class Event(models.Model):
     
     def is_registration_open(self):
         """Check if registration is currently open."""
+        # Prefer the flag computed by the database when the queryset has it
+        annotated = getattr(self, 'annotated_is_open', None)
+        if annotated is not None:
+            return annotated
+        
         now = timezone.now()
         return (
             self.is_active and
@@ -65,14 +113,43 @@ class Event(models.Model):
     
     def get_registration_count(self):
         """Get the number of registrations for this event."""
-        return self.registrations.count()
+        return self.registration_count
     
     def is_full(self):
         """Check if event has reached maximum capacity."""
+        annotated = getattr(self, 'annotated_is_full', None)
+        if annotated is not None:
+            return annotated
+        
         if self.max_participants is None:
             return False
         return self.get_registration_count() >= self.max_participants
     
+    @classmethod
+    def reserve_seats(cls, event_id, seats=1):
+        """
+        Atomically reserve seats for an event.
+        
+        Uses a conditional UPDATE so concurrent signups cannot push the
+        registration count past ``max_participants``.
+        
+        Returns:
+            True if the seats were reserved, False if the event is full.
+        """
+        updated = cls.objects.filter(pk=event_id).filter(
+            models.Q(max_participants__isnull=True) |
+            models.Q(max_participants__gte=models.F('registration_count') + seats)
+        ).update(registration_count=models.F('registration_count') + seats)
+        return updated == 1
+    
+    @classmethod
+    def release_seats(cls, event_id, seats=1):
+        """Atomically release previously reserved seats for an event."""
+        cls.objects.filter(
+            pk=event_id,
+            registration_count__gte=seats
+        ).update(registration_count=models.F('registration_count') - seats)
+    
     def clean(self):
         """Validate event dates."""
         from django.core.exceptions import ValidationError
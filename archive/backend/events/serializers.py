@@ -2,10 +2,45 @@
 Serializers for the events app.
 """
 
+from django.db import transaction
 from rest_framework import serializers
+from event_registration.projections import ProjectionSerializer, format_date
+from .metadata import get_event
 from .models import Event
 
 
+class CachedEventField(serializers.PrimaryKeyRelatedField):
+    """
+    Event primary key field that resolves events from the metadata cache.
+    
+    The returned Event has only its metadata fields loaded, which covers
+    registration validation and EventListSerializer output.
+    """
+    
+    def __init__(self, **kwargs):
+        kwargs.setdefault('queryset', Event.objects.all())
+        super().__init__(**kwargs)
+    
+    def to_internal_value(self, data):
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        
+        event = get_event(data)
+        if event is None:
+            self.fail('does_not_exist', pk_value=data)
+        return event
+
+
+class EventBulkListSerializer(serializers.ListSerializer):
+    """List serializer that creates events with a single bulk_create."""
+    
+    def create(self, validated_data):
+        """Create all validated events in one transaction."""
+        events = [Event(**item) for item in validated_data]
+        with transaction.atomic():
+            return Event.objects.bulk_create(events)
+
+
 class EventSerializer(serializers.ModelSerializer):
     """Serializer for Event model."""
     
@@ -23,6 +58,7 @@ class EventSerializer(serializers.ModelSerializer):
             'is_registration_open', 'is_full', 'created_at', 'updated_at'
         ]
         read_only_fields = ['id', 'created_at', 'updated_at']
+        list_serializer_class = EventBulkListSerializer
     
     def validate(self, data):
         """Validate event dates."""
@@ -54,6 +90,22 @@ class EventListSerializer(serializers.ModelSerializer):
         ]
 
 
+class EventListProjection(ProjectionSerializer):
+    """Fast read path equivalent to EventListSerializer."""
+    
+    values_fields = ('id', 'name', 'category', 'event_date', 'is_active')
+    
+    def to_representation(self, row):
+        return {
+            'id': str(row['id']),
+            'name': row['name'],
+            'category': row['category'],
+            'category_display': Event.CATEGORY_LABELS.get(row['category'], row['category']),
+            'event_date': format_date(row['event_date']),
+            'is_active': row['is_active'],
+        }
+
+
 class EventCategorySerializer(serializers.Serializer):
     """Serializer for event categories."""
     
@@ -64,5 +116,5 @@ class EventCategorySerializer(serializers.Serializer):
 class EventDateSerializer(serializers.Serializer):
     """Serializer for event dates."""
     
-    date = serializers.DateField()
+    date = serializers.DateField(source='event_date')
     events_count = serializers.IntegerField()
@@ -0,0 +1,23 @@
+"""
+Signal handlers for the events app.
+"""
+
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+from .caching import invalidate_event_cache
+from .metadata import invalidate_event_metadata
+from .models import Event
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_event_responses(sender, **kwargs):
+    """Drop cached event responses when an event changes."""
+    invalidate_event_cache()
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_metadata(sender, instance, **kwargs):
+    """Drop cached metadata for a changed event."""
+    invalidate_event_metadata([instance.pk])
@@ -0,0 +1,320 @@
+"""
+Tests for the events app.
+"""
+
+import base64
+import decimal
+import io
+import json
+import uuid
+from urllib.parse import parse_qs, urlparse
+from datetime import date, datetime, time, timedelta, timezone as dt_timezone
+from unittest import mock
+
+import redis
+from django.core.management import call_command
+from django.conf import settings
+from django.db import router
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, RequestFactory, TestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+from rest_framework.renderers import JSONRenderer
+from rest_framework.views import APIView
+from event_registration import search
+from event_registration.routers import is_pinned_to_primary, pin_to_primary, replica_reads
+from event_registration.renderers import ORJSONRenderer
+from registrations.models import Registration
+from . import caching, metadata
+from .async_views import _open_registrations
+from .caching import invalidate_event_cache
+from .models import Event
+from .serializers import EventSerializer
+
+
+def create_events(count):
+    """Create active events with open registration, five per event date."""
+    now = timezone.now()
+    events = [
+        Event(
+            name=f'Event {index}',
+            category='conference',
+            event_date=(now + timedelta(days=30 + index // 5)).date(),
+            registration_start_date=now - timedelta(days=1),
+            registration_end_date=now + timedelta(days=10),
+        )
+        for index in range(count)
+    ]
+    Event.objects.bulk_create(events)
+    invalidate_event_cache()
+    return events
+
+
+def walk_pages(client, url, link='next'):
+    """Follow ``next`` (or ``previous``) links from url and return every result."""
+    results = []
+    while url:
+        response = client.get(url, HTTP_ACCEPT='application/json')
+        assert response.status_code == 200, response.content
+        body = response.json()
+        results.extend(body['results'] if link == 'next' else reversed(body['results']))
+        url = body[link]
+    return results
+
+
+@mock.patch.object(APIView, 'throttle_classes', ())
+class RankedSearchPaginationTests(TestCase):
+    """Cursor pagination over full-text search results ordered by rank."""
+    
+    def setUp(self):
+        call_command('build_search_index', stdout=io.StringIO())
+        search._index_cache.clear()
+        
+        now = timezone.now()
+        # Repeating the term gives every event a different bm25 rank
+        Event.objects.bulk_create([
+            Event(
+                name=f'Python meetup {index}',
+                description=' '.join(['python'] * (index + 1)) + ' ' + 'talks ' * (60 - index),
+                category='conference',
+                event_date=(now + timedelta(days=30)).date(),
+                registration_start_date=now - timedelta(days=1),
+                registration_end_date=now + timedelta(days=10),
+            )
+            for index in range(60)
+        ])
+        create_events(5)
+    
+    def tearDown(self):
+        search._index_cache.clear()
+    
+    def test_every_page_of_ranked_search(self):
+        results = walk_pages(self.client, '/api/events/?search=python&page_size=10')
+        
+        self.assertEqual(len(results), 60)
+        self.assertEqual(len({result['id'] for result in results}), 60)
+
+
+@mock.patch.object(APIView, 'throttle_classes', ())
+class EventListOrderingTests(TestCase):
+    """Cursor pagination of the event list under every allowed ordering."""
+    
+    def setUp(self):
+        create_events(60)
+    
+    def test_every_page_for_each_ordering(self):
+        for field in ['event_date', 'created_at', 'name']:
+            for ordering in [field, f'-{field}']:
+                with self.subTest(ordering=ordering):
+                    results = walk_pages(
+                        self.client,
+                        f'/api/events/?ordering={ordering}&page_size=10'
+                    )
+                    
+                    self.assertEqual(len(results), 60)
+                    self.assertEqual(len({result['id'] for result in results}), 60)
+
+
+@mock.patch.object(APIView, 'throttle_classes', ())
+class KeysetPaginationTests(TestCase):
+    """Keyset cursors over an ordering with many ties on the leading field."""
+    
+    def setUp(self):
+        # Five events share each event_date
+        create_events(60)
+    
+    def test_pages_follow_the_total_order_without_offsets(self):
+        url = '/api/events/?page_size=7'
+        expected = [
+            str(pk) for pk in Event.objects.order_by('-event_date', '-id').values_list('pk', flat=True)
+        ]
+        
+        results = []
+        while url:
+            body = self.client.get(url, HTTP_ACCEPT='application/json').json()
+            results.extend(result['id'] for result in body['results'])
+            url = body['next']
+            if url:
+                cursor = parse_qs(urlparse(url).query)['cursor'][0]
+                self.assertNotIn('o', parse_qs(base64.b64decode(cursor).decode()))
+        
+        self.assertEqual(results, expected)
+    
+    def test_previous_links_walk_back_to_the_first_page(self):
+        url = '/api/events/?page_size=7'
+        while True:
+            body = self.client.get(url, HTTP_ACCEPT='application/json').json()
+            if not body['next']:
+                break
+            url = body['next']
+        
+        backwards = walk_pages(self.client, body['previous'], link='previous')
+        expected = [
+            str(pk) for pk in Event.objects.order_by('event_date', 'id').values_list('pk', flat=True)
+        ]
+        
+        self.assertEqual([result['id'] for result in backwards], expected[len(body['results']):])
+
+
+class EventMetadataCacheTests(TestCase):
+    """Event metadata lookups when the shared cache is unavailable."""
+    
+    def test_get_event_falls_back_to_the_database(self):
+        event = create_events(1)[0]
+        metadata._local_cache.clear()
+        
+        with mock.patch.object(metadata, 'cache') as cache:
+            cache.get.side_effect = redis.ConnectionError
+            cache.set.side_effect = redis.ConnectionError
+            
+            self.assertEqual(metadata.get_event(event.pk).name, event.name)
+
+
+class RegistrationFlagsQueryTests(TestCase):
+    """Open/full flags are computed by the database, not per event."""
+    
+    def serialize_with_capacities(self, count):
+        events = create_events(count)
+        for index, event in enumerate(events):
+            # Every other event is at capacity
+            event.max_participants = 10
+            event.registration_count = 10 if index % 2 else 3
+        Event.objects.bulk_update(events, ['max_participants', 'registration_count'])
+        
+        with self.assertNumQueries(1):
+            return EventSerializer(Event.objects.with_registration_flags(), many=True).data
+    
+    def test_query_count_is_constant_as_events_grow(self):
+        for count in (3, 30):
+            with self.subTest(count=count):
+                Event.objects.all().delete()
+                data = self.serialize_with_capacities(count)
+                
+                self.assertEqual(len(data), count)
+                self.assertEqual(sum(event['is_full'] for event in data), count // 2)
+                self.assertTrue(all(event['is_registration_open'] for event in data))
+
+
+@mock.patch.object(APIView, 'throttle_classes', ())
+class ORJSONRendererTests(TestCase):
+    """ORJSONRenderer output compared with DRF's JSONRenderer."""
+    
+    payloads = [
+        {'utc': datetime(2024, 3, 1, 9, 30, 15, 123456, tzinfo=dt_timezone.utc)},
+        {'offset': datetime(2024, 3, 1, 9, 30, tzinfo=dt_timezone(timedelta(hours=5, minutes=30)))},
+        {'naive': datetime(2024, 3, 1, 9, 30, 15, 500)},
+        {'date': date(2024, 3, 1), 'time': time(9, 30, 15, 250000), 'duration': timedelta(minutes=90)},
+        {'id': uuid.UUID('12345678-1234-5678-1234-567812345678'), 'price': decimal.Decimal('10.50')},
+        {'label': gettext_lazy('Conference'), 'text': 'Café \u2028 \u2029 </script>'},
+        {1: 'integer key', 'nested': [{'a': None, 'b': True}, [], {}], 'float': 0.1},
+        {'big': 2 ** 70, 'small': -2 ** 63},
+    ]
+    
+    def test_payloads_render_identically(self):
+        for payload in self.payloads:
+            with self.subTest(payload=payload):
+                self.assertEqual(ORJSONRenderer().render(payload), JSONRenderer().render(payload))
+    
+    def test_indented_output_matches(self):
+        payload = {'events': [{'id': 1, 'name': 'Event'}]}
+        media_type = 'application/json; indent=4'
+        
+        self.assertEqual(
+            ORJSONRenderer().render(payload, media_type),
+            JSONRenderer().render(payload, media_type),
+        )
+    
+    def test_every_read_endpoint_renders_identically(self):
+        event = create_events(3)[0]
+        Registration.objects.create(
+            full_name='Ada Lovelace',
+            email='ada@example.com',
+            college_name='College',
+            department='Mathematics',
+            event=event,
+        )
+        
+        call_command('check_json_renderer', stdout=io.StringIO())
+
+
+@mock.patch.object(APIView, 'throttle_classes', ())
+class EventCacheUnavailableTests(TestCase):
+    """Event endpoints serve uncached responses while Redis is down."""
+    
+    def setUp(self):
+        self.events = create_events(2)
+    
+    def test_sync_endpoint_and_invalidation(self):
+        client = mock.Mock()
+        for method in ('get', 'incr', 'hincrby', 'hgetall'):
+            getattr(client, method).side_effect = redis.ConnectionError
+        
+        with mock.patch.object(caching, 'get_redis_client', return_value=client):
+            invalidate_event_cache()
+            for _ in range(2):
+                response = self.client.get(
+                    '/api/events/open_registrations/',
+                    HTTP_ACCEPT='application/json'
+                )
+                
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response['X-Cache'], 'MISS')
+                self.assertEqual(len(response.json()), 2)
+            
+            self.assertEqual(caching.get_cache_stats(), {'hit': 0, 'miss': 0, 'not_modified': 0})
+    
+    async def test_async_endpoint(self):
+        client = mock.Mock()
+        for method in ('get', 'set', 'hincrby'):
+            setattr(client, method, mock.AsyncMock(side_effect=redis.ConnectionError))
+        
+        with mock.patch.object(caching, 'get_async_redis_client', return_value=client):
+            request = AsyncRequestFactory().get('/api/events/open_registrations/')
+            response = await _open_registrations(request)
+        
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(len(json.loads(response.content)), 2)
+
+
+@mock.patch('event_registration.routers.replica_enabled', return_value=True)
+class ReplicaRoutingTests(TestCase):
+    """Read replica routing, primary pinning and reads that must stay on the primary."""
+    
+    def test_reads_go_to_the_replica_only_inside_replica_reads(self, replica_enabled):
+        self.assertEqual(router.db_for_read(Event), 'default')
+        
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Event), settings.REPLICA_DATABASE_ALIAS)
+            self.assertEqual(router.db_for_write(Event), 'default')
+        
+        with replica_reads(False):
+            self.assertEqual(router.db_for_read(Event), 'default')
+    
+    def test_no_replica_configured(self, replica_enabled):
+        replica_enabled.return_value = False
+        
+        with replica_reads():
+            self.assertEqual(router.db_for_read(Event), 'default')
+    
+    def test_pin_to_primary(self, replica_enabled):
+        response = HttpResponse()
+        pin_to_primary(response)
+        cookie = response.cookies[settings.REPLICA_STICKY_COOKIE]
+        
+        request = RequestFactory().get('/')
+        request.COOKIES[settings.REPLICA_STICKY_COOKIE] = cookie.value
+        self.assertTrue(is_pinned_to_primary(request))
+        self.assertEqual(cookie['max-age'], settings.REPLICA_STICKY_SECONDS)
+        
+        for value in ['0', 'not-a-timestamp']:
+            request.COOKIES[settings.REPLICA_STICKY_COOKIE] = value
+            self.assertFalse(is_pinned_to_primary(request))
+    
+    def test_open_event_ids_are_computed_on_the_primary(self, replica_enabled):
+        events = create_events(2)
+        
+        # The replica alias is not configured here, so any read routed to
+        # it would fail
+        with replica_reads():
+            self.assertEqual(set(caching.get_open_event_ids()), {event.pk for event in events})
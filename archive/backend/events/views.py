@@ -2,23 +2,40 @@
 Views for the events app.
 """
 
+import uuid
+
+from django.conf import settings
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAdminUser
+from rest_framework.permissions import SAFE_METHODS, IsAuthenticatedOrReadOnly, IsAdminUser
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
 from django.db.models import Count
+from django.utils import timezone
+from event_registration.search import FullTextSearchFilter
+from event_registration.pagination import EventCursorPagination
+from event_registration.routers import ReplicaReadMixin
+from .caching import (
+    cache_response,
+    get_cache_stats,
+    get_open_event_ids,
+    invalidate_event_cache
+)
+from .metadata import invalidate_event_metadata
 from .models import Event
 from .serializers import (
     EventSerializer,
     EventListSerializer,
+    EventListProjection,
     EventCategorySerializer,
     EventDateSerializer
 )
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for Event model.
     
@@ -28,25 +45,158 @@ class EventViewSet(viewsets.ModelViewSet):
     
     queryset = Event.objects.filter(is_active=True)
     permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['category', 'event_date', 'is_active']
     search_fields = ['name', 'description']
     ordering_fields = ['event_date', 'created_at', 'name']
-    ordering = ['-event_date']
+    ordering = ['-event_date', '-id']
+    pagination_class = EventCursorPagination
+    
+    # Every safe action is served from the read replica, when configured
+    replica_actions = '__all__'
+    
+    # Actions served by dict-based projection serializers
+    projection_classes = {
+        'list': EventListProjection,
+    }
+    
+    def get_projection_class(self):
+        """Return the projection serializer for this action, if enabled."""
+        if not settings.USE_PROJECTION_SERIALIZERS or getattr(self, 'swagger_fake_view', False):
+            return None
+        return self.projection_classes.get(self.action)
+    
+    def get_queryset(self):
+        """Return active events, annotated with registration flags for reads."""
+        queryset = super().get_queryset()
+        
+        projection_class = self.get_projection_class()
+        if projection_class is not None:
+            ordering = OrderingFilter().get_ordering(self.request, queryset, self)
+            return projection_class.project(queryset, ordering)
+        
+        # Writes change the fields the flags depend on, so only annotate reads
+        if self.request.method in SAFE_METHODS:
+            queryset = queryset.with_registration_flags()
+        
+        return queryset
     
     def get_serializer_class(self):
         """Return appropriate serializer class."""
+        projection_class = self.get_projection_class()
+        if projection_class is not None:
+            return projection_class
         if self.action == 'list':
             return EventListSerializer
         return EventSerializer
     
     def get_permissions(self):
         """Set permissions based on action."""
-        if self.action in ['create', 'update', 'partial_update', 'destroy']:
+        if self.action in [
+            'create', 'update', 'partial_update', 'destroy',
+            'bulk_partial_update', 'cache_stats'
+        ]:
             return [IsAdminUser()]
         return [IsAuthenticatedOrReadOnly()]
     
+    def create(self, request, *args, **kwargs):
+        """Create one event, or many when the payload is a list."""
+        if not isinstance(request.data, list):
+            return super().create(request, *args, **kwargs)
+        
+        serializer = self.get_serializer(data=request.data, many=True)
+        serializer.is_valid(raise_exception=True)
+        serializer.save()
+        
+        # bulk_create skips post_save, so invalidate once for the batch
+        invalidate_event_cache()
+        return Response(serializer.data, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['patch'], url_path='bulk')
+    def bulk_partial_update(self, request):
+        """
+        Partially update many events in one request.
+        
+        Expects a list of objects that each include the event ``id``. Every
+        item is validated before anything is written; the updates are then
+        applied with a single bulk_update.
+        """
+        if not isinstance(request.data, list):
+            return Response(
+                {'error': 'Expected a list of events'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        ids = []
+        for item in request.data:
+            try:
+                ids.append(uuid.UUID(str(item.get('id'))))
+            except (AttributeError, ValueError):
+                ids.append(None)
+        
+        instances = Event.objects.in_bulk([event_id for event_id in ids if event_id])
+        errors = []
+        events = []
+        fields = set()
+        
+        for index, (item, event_id) in enumerate(zip(request.data, ids)):
+            event = instances.get(event_id)
+            if event is None:
+                errors.append({'index': index, 'errors': {'id': ['Event not found.']}})
+                continue
+            
+            serializer = EventSerializer(event, data=item, partial=True)
+            if not serializer.is_valid():
+                errors.append({'index': index, 'errors': serializer.errors})
+                continue
+            
+            for attr, value in serializer.validated_data.items():
+                setattr(event, attr, value)
+                fields.add(attr)
+            
+            # Re-check dates against the merged instance
+            try:
+                event.clean()
+            except DjangoValidationError as e:
+                errors.append({'index': index, 'errors': {'non_field_errors': e.messages}})
+                continue
+            
+            events.append(event)
+        
+        if errors:
+            return Response({'errors': errors}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if fields:
+            now = timezone.now()
+            for event in events:
+                event.updated_at = now
+            
+            with transaction.atomic():
+                Event.objects.bulk_update(events, list(fields | {'updated_at'}))
+            
+            # bulk_update skips post_save, so invalidate once for the batch
+            invalidate_event_cache()
+            invalidate_event_metadata([event.pk for event in events])
+        
+        return Response(EventSerializer(events, many=True).data)
+    
+    @cache_response
+    def list(self, request, *args, **kwargs):
+        """List active events."""
+        return super().list(request, *args, **kwargs)
+    
+    @cache_response
+    def retrieve(self, request, *args, **kwargs):
+        """Retrieve a single event."""
+        return super().retrieve(request, *args, **kwargs)
+    
     @action(detail=False, methods=['get'])
+    def cache_stats(self, request):
+        """Get response cache hit/miss counters."""
+        return Response(get_cache_stats())
+    
+    @action(detail=False, methods=['get'])
+    @cache_response
     def categories(self, request):
         """Get all event categories."""
         categories = [
@@ -57,6 +207,7 @@ class EventViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def by_category(self, request):
         """Get events filtered by category."""
         category = request.query_params.get('category')
@@ -66,11 +217,12 @@ class EventViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        events = self.queryset.filter(category=category)
+        events = self.get_queryset().filter(category=category)
         serializer = self.get_serializer(events, many=True)
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def dates(self, request):
         """Get unique event dates with count."""
         category = request.query_params.get('category')
@@ -87,15 +239,10 @@ class EventViewSet(viewsets.ModelViewSet):
         return Response(serializer.data)
     
     @action(detail=False, methods=['get'])
+    @cache_response
     def open_registrations(self, request):
         """Get events with open registrations."""
-        from django.utils import timezone
-        now = timezone.now()
-        
-        events = self.queryset.filter(
-            registration_start_date__lte=now,
-            registration_end_date__gte=now
-        )
+        events = self.get_queryset().filter(pk__in=get_open_event_ids())
         
         serializer = self.get_serializer(events, many=True)
         return Response(serializer.data)
@@ -0,0 +1,20 @@
+"""
+App configuration for the registrations app.
+"""
+
+from django.apps import AppConfig
+
+
+class RegistrationsConfig(AppConfig):
+    """Configuration for the registrations app."""
+    
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'registrations'
+    
+    def ready(self):
+        """Connect signal handlers and metrics collectors."""
+        from . import signals  # noqa: F401
+        from event_registration.metrics import registry
+        from .outbox import collect_outbox_metrics
+        
+        registry.add_collector(collect_outbox_metrics)
@@ -0,0 +1,106 @@
+"""
+Async (ASGI) view for public registration signups.
+
+Enabled with ``ASYNC_PUBLIC_API``. JSON signups are validated with the
+async ORM, the event metadata cache and the async duplicate prefilter. In
+queued intake mode the signup is appended to the intake stream with the
+async Redis client; otherwise only the transactional write (seat
+reservation, insert and outbox row) runs in a worker thread. Any
+other request is handed to ``RegistrationViewSet``.
+"""
+
+import json
+
+from asgiref.sync import sync_to_async
+from django.urls import reverse
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework import serializers
+from event_registration.async_api import delegate, json_response, throttled_response
+from event_registration.routers import pin_to_primary, replica_enabled
+from events.metadata import aget_event
+from events.serializers import CachedEventField
+from .bulk import DUPLICATE_MESSAGE
+from .intake import aenqueue_registration, is_intake_enabled
+from .membership import ais_registered
+from .serializers import RegistrationFieldsSerializer, RegistrationSerializer
+from .views import RegistrationViewSet
+
+
+registration_list_view = RegistrationViewSet.as_view({'get': 'list', 'post': 'create'})
+
+
+def create_registration(validated_data):
+    """Reserve a seat, save the registration and record its emails."""
+    registration = RegistrationSerializer().create(validated_data)
+    return RegistrationSerializer(registration).data
+
+
+async def validate_signup(data):
+    """
+    Run the database-backed signup checks.
+    
+    Returns:
+        Tuple of (Event, error dict or None).
+    """
+    event = await aget_event(data['event'])
+    if event is None:
+        message = CachedEventField.default_error_messages['does_not_exist']
+        return None, {'event': [message.format(pk_value=data['event'])]}
+    
+    if not event.is_registration_open():
+        return event, {'event': ["Registration is not currently open for this event."]}
+    
+    if await ais_registered(event.pk, data['email']):
+        return event, {'non_field_errors': [DUPLICATE_MESSAGE]}
+    
+    return event, None
+
+
+@csrf_exempt
+async def registration_list(request):
+    """Create a registration from JSON, or hand the request to RegistrationViewSet."""
+    if request.method != 'POST' or request.content_type != 'application/json':
+        return await delegate(registration_list_view, request)
+    
+    throttled = await throttled_response(request, RegistrationViewSet)
+    if throttled is not None:
+        return throttled
+    
+    try:
+        payload = json.loads(request.body)
+    except ValueError as e:
+        return json_response({'detail': f'JSON parse error - {e}'}, status=400)
+    
+    fields = RegistrationFieldsSerializer(data=payload)
+    if not fields.is_valid():
+        return json_response(fields.errors, status=400)
+    data = dict(fields.validated_data)
+    
+    event, errors = await validate_signup(data)
+    if errors:
+        return json_response(errors, status=400)
+    
+    if is_intake_enabled():
+        ticket = await aenqueue_registration(data)
+        response = json_response(
+            {
+                'id': ticket,
+                'status': 'pending',
+                'status_url': request.build_absolute_uri(
+                    reverse('registration-intake-status', kwargs={'ticket': ticket})
+                ),
+            },
+            status=202
+        )
+    else:
+        data['event'] = event
+        try:
+            registration = await sync_to_async(create_registration)(data)
+        except serializers.ValidationError as e:
+            return json_response(e.detail, status=400)
+        response = json_response(registration, status=201)
+    
+    # Keep the client's next reads on the primary, as ReplicaReadMixin does
+    if replica_enabled():
+        pin_to_primary(response)
+    return response
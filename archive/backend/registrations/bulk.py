@@ -0,0 +1,126 @@
+"""
+Batched registration writes for the registrations app.
+"""
+
+import uuid
+from collections import defaultdict
+
+from django.db import transaction
+from django.db.models import F
+from events.models import Event
+from .models import Registration
+from .outbox import record_registration_emails
+from .signals import registrations_bulk_created
+
+
+DUPLICATE_MESSAGE = "You have already registered for this event. Duplicate registrations are not allowed."
+FULL_MESSAGE = "This event has reached maximum capacity."
+MISSING_EVENT_MESSAGE = "Event not found."
+
+REGISTRATION_FIELDS = ['full_name', 'email', 'college_name', 'department']
+
+
+def bulk_register(candidates):
+    """
+    Create registrations for a batch of already-validated candidates.
+
+    Each candidate is a dict with ``key``, ``event_id`` and the fields in
+    ``REGISTRATION_FIELDS``. Duplicates are detected with one ``IN`` query,
+    capacity is enforced per event under ``select_for_update`` and rows are
+    written with a single ``bulk_create``. The ``unique_email_event``
+    constraint remains the final guard against concurrent writers.
+
+    Returns:
+        Tuple of (created registrations, dict mapping rejected keys to reasons).
+    """
+    rejected = {}
+    accepted = []
+    seen = set()
+
+    for candidate in candidates:
+        identity = (uuid.UUID(str(candidate['event_id'])), candidate['email'])
+        if identity in seen:
+            rejected[candidate['key']] = DUPLICATE_MESSAGE
+            continue
+        seen.add(identity)
+        accepted.append((identity, candidate))
+
+    if not accepted:
+        return [], rejected
+
+    event_ids = {identity[0] for identity, _ in accepted}
+    emails = {identity[1] for identity, _ in accepted}
+    existing = set(
+        Registration.objects.filter(
+            event_id__in=event_ids,
+            email__in=emails
+        ).values_list('event_id', 'email')
+    )
+
+    by_event = defaultdict(list)
+    for identity, candidate in accepted:
+        if identity in existing:
+            rejected[candidate['key']] = DUPLICATE_MESSAGE
+        else:
+            by_event[identity[0]].append(candidate)
+
+    created = []
+    with transaction.atomic():
+        # Lock events in a stable order to avoid deadlocks between flushers
+        events = Event.objects.select_for_update().filter(
+            pk__in=by_event.keys()
+        ).order_by('pk')
+        events = {event.pk: event for event in events}
+
+        for event_id, event_candidates in by_event.items():
+            event = events.get(event_id)
+            if event is None:
+                for candidate in event_candidates:
+                    rejected[candidate['key']] = MISSING_EVENT_MESSAGE
+                continue
+
+            if event.max_participants is None:
+                seats = len(event_candidates)
+            else:
+                seats = max(event.max_participants - event.registration_count, 0)
+
+            for candidate in event_candidates[seats:]:
+                rejected[candidate['key']] = FULL_MESSAGE
+
+            for candidate in event_candidates[:seats]:
+                registration = Registration(
+                    event=event,
+                    **{field: candidate[field] for field in REGISTRATION_FIELDS}
+                )
+                registration._bulk_key = candidate['key']
+                created.append(registration)
+
+        Registration.objects.bulk_create(created, ignore_conflicts=True)
+
+        # ignore_conflicts hides rows lost to a concurrent insert; keep only
+        # the rows that were actually written
+        written = set(
+            Registration.objects.filter(
+                pk__in=[registration.pk for registration in created]
+            ).values_list('pk', flat=True)
+        )
+
+        for registration in created:
+            if registration.pk not in written:
+                rejected[registration._bulk_key] = DUPLICATE_MESSAGE
+        created = [registration for registration in created if registration.pk in written]
+
+        counts = defaultdict(int)
+        for registration in created:
+            counts[registration.event_id] += 1
+        for event_id, count in counts.items():
+            Event.objects.filter(pk=event_id).update(
+                registration_count=F('registration_count') + count
+            )
+
+        record_registration_emails(created)
+
+    if created:
+        registrations_bulk_created.send(sender=Registration, registrations=created)
+
+    return created, rejected
@@ -0,0 +1,136 @@
+"""
+Streaming export helpers for the registrations app.
+
+Rows are read from the database in chunks with ``values_list().iterator()``
+and encoded on the fly, so memory stays bounded regardless of export size.
+"""
+
+import csv
+import json
+import zlib
+
+from events.models import Event
+
+
+# Number of rows fetched from the database and encoded per chunk
+EXPORT_CHUNK_SIZE = 2000
+
+# (header, key) pairs in export column order
+EXPORT_COLUMNS = [
+    ('Name', 'full_name'),
+    ('Email', 'email'),
+    ('College Name', 'college_name'),
+    ('Department', 'department'),
+    ('Event Name', 'event_name'),
+    ('Event Category', 'event_category'),
+    ('Event Date', 'event_date'),
+    ('Registration Date', 'registration_date'),
+]
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'columnar': ('application/x-ndjson', 'columnar.ndjson'),
+}
+
+
+class Echo:
+    """Pseudo-buffer that returns written values instead of storing them."""
+
+    def write(self, value):
+        return value
+
+
+def iter_export_rows(queryset, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Yield export rows as tuples in ``EXPORT_COLUMNS`` order.
+
+    Category labels are resolved from ``Event.CATEGORY_LABELS`` instead of
+    calling ``get_category_display()`` on a model instance per row.
+    """
+    labels = Event.CATEGORY_LABELS
+    rows = queryset.values_list(
+        'full_name', 'email', 'college_name', 'department',
+        'event__name', 'event__category', 'event__event_date', 'created_at'
+    ).iterator(chunk_size=chunk_size)
+
+    for (full_name, email, college_name, department,
+         event_name, category, event_date, created_at) in rows:
+        yield (
+            full_name,
+            email,
+            college_name,
+            department,
+            event_name,
+            labels.get(category, category),
+            event_date,
+            created_at.strftime('%Y-%m-%d %H:%M:%S'),
+        )
+
+
+def chunked(rows, chunk_size):
+    """Group an iterable of rows into lists of at most ``chunk_size``."""
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def stream_csv(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """Encode rows as CSV, yielding one string per chunk."""
+    writer = csv.writer(Echo())
+    yield writer.writerow([header for header, _ in EXPORT_COLUMNS])
+
+    for chunk in chunked(rows, chunk_size):
+        yield ''.join(writer.writerow(row) for row in chunk)
+
+
+def stream_ndjson(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """Encode rows as newline-delimited JSON objects."""
+    keys = [key for _, key in EXPORT_COLUMNS]
+
+    for chunk in chunked(rows, chunk_size):
+        yield ''.join(
+            json.dumps(dict(zip(keys, row)), default=str) + '\n'
+            for row in chunk
+        )
+
+
+def stream_columnar(rows, chunk_size=EXPORT_CHUNK_SIZE):
+    """
+    Encode rows as columnar row groups, one JSON document per line.
+
+    The first line carries the schema; every following line is a row group
+    mapping each column to a list of values, similar to Parquet row groups.
+    """
+    keys = [key for _, key in EXPORT_COLUMNS]
+    yield json.dumps({'schema': keys}) + '\n'
+
+    for chunk in chunked(rows, chunk_size):
+        columns = {key: list(values) for key, values in zip(keys, zip(*chunk))}
+        yield json.dumps(
+            {'num_rows': len(chunk), 'columns': columns},
+            default=str
+        ) + '\n'
+
+
+EXPORT_ENCODERS = {
+    'csv': stream_csv,
+    'ndjson': stream_ndjson,
+    'columnar': stream_columnar,
+}
+
+
+def gzip_stream(chunks, level=6):
+    """Compress a stream of text chunks into a gzip byte stream on the fly."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, zlib.MAX_WBITS | 16)
+
+    for chunk in chunks:
+        data = compressor.compress(chunk.encode('utf-8'))
+        if data:
+            yield data
+    yield compressor.flush()
@@ -0,0 +1,168 @@
+"""
+Bulk registration import for the registrations app.
+
+Rows are read from a CSV or NDJSON stream and processed in chunks: field
+formats are checked with the precompiled model validators, events are
+loaded with one query per chunk, and each chunk is written through
+``bulk_register`` in its own transaction.
+"""
+
+import codecs
+import csv
+import io
+import json
+import uuid
+
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from events.models import Event
+from .bulk import REGISTRATION_FIELDS, bulk_register
+from .exports import chunked
+from .models import Registration
+
+
+IMPORT_CHUNK_SIZE = 1000
+IMPORT_FORMATS = ['csv', 'ndjson']
+
+TEXT_FIELDS = ['full_name', 'college_name', 'department']
+
+NOT_A_STRING_MESSAGE = 'Not a valid string.'
+
+
+def is_valid_utf8(upload):
+    """
+    Check that an uploaded file decodes as UTF-8, then rewind it.
+
+    Rows are imported chunk by chunk as they are read, so the encoding is
+    checked up front rather than failing after earlier chunks are written.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for data in upload.chunks():
+            decoder.decode(data)
+        decoder.decode(b'', final=True)
+    except UnicodeDecodeError:
+        return False
+    finally:
+        upload.seek(0)
+    return True
+
+
+def iter_import_rows(upload, import_format):
+    """Yield row dicts from an uploaded CSV or NDJSON file."""
+    text = io.TextIOWrapper(upload, encoding='utf-8-sig', newline='')
+
+    if import_format == 'csv':
+        yield from csv.DictReader(text)
+        return
+
+    for line in text:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError:
+            row = None
+        yield row if isinstance(row, dict) else {}
+
+
+def validate_row(row, events):
+    """
+    Validate one import row.
+
+    Args:
+        row: Raw row dict
+        events: Mapping of event UUID to active Event for the current chunk
+
+    Returns:
+        Tuple of (candidate dict or None, dict of field errors).
+    """
+    errors = {}
+    text_regex = Registration.text_validator.regex
+
+    for field in TEXT_FIELDS:
+        value = _clean_text(row.get(field))
+        if value is None:
+            errors[field] = NOT_A_STRING_MESSAGE
+        elif not value:
+            errors[field] = 'This field is required.'
+        elif len(value) > 255:
+            errors[field] = 'Ensure this field has no more than 255 characters.'
+        elif not text_regex.match(value):
+            errors[field] = Registration.text_validator.message
+
+    email = _clean_text(row.get('email'))
+    if email is None:
+        errors['email'] = NOT_A_STRING_MESSAGE
+    else:
+        try:
+            validate_email(email)
+        except ValidationError:
+            errors['email'] = 'Enter a valid email address.'
+
+    event_id = _parse_uuid(row.get('event'))
+    if event_id not in events:
+        errors['event'] = 'Event not found or inactive.'
+
+    if errors:
+        return None, errors
+
+    candidate = {field: _clean_text(row.get(field)) for field in REGISTRATION_FIELDS}
+    candidate['event_id'] = event_id
+    return candidate, errors
+
+
+def _clean_text(value):
+    """Return value stripped, '' if missing, or None if it is not a string."""
+    if value is None:
+        return ''
+    if not isinstance(value, str):
+        return None
+    return value.strip()
+
+
+def _parse_uuid(value):
+    """Return value as a UUID, or None if it is not one."""
+    try:
+        return uuid.UUID(str(value))
+    except (TypeError, ValueError):
+        return None
+
+
+def import_registrations(rows, chunk_size=IMPORT_CHUNK_SIZE):
+    """
+    Import registrations from an iterable of row dicts.
+
+    Returns:
+        Tuple of (created registration IDs, per-row error report). Rows are
+        numbered from 1, excluding any header line.
+    """
+    created_ids = []
+    report = []
+
+    for chunk in chunked(enumerate(rows, start=1), chunk_size):
+        event_ids = {_parse_uuid(row.get('event')) for _, row in chunk}
+        events = Event.objects.filter(
+            pk__in=[event_id for event_id in event_ids if event_id],
+            is_active=True
+        ).in_bulk()
+
+        candidates = []
+        for number, row in chunk:
+            candidate, errors = validate_row(row, events)
+            if errors:
+                report.append({'row': number, 'errors': errors})
+                continue
+            candidate['key'] = number
+            candidates.append(candidate)
+
+        created, rejected = bulk_register(candidates)
+        created_ids.extend(str(registration.pk) for registration in created)
+        report.extend(
+            {'row': number, 'errors': {'non_field_errors': reason}}
+            for number, reason in rejected.items()
+        )
+
+    report.sort(key=lambda entry: entry['row'])
+    return created_ids, report
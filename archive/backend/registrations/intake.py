@@ -0,0 +1,153 @@
+"""
+Queued registration intake for flash-registration events.
+
+In queued mode a signup is validated without touching the registrations
+table, appended to a Redis stream and acknowledged with a provisional ticket.
+``flush_intake`` drains the stream in batches through ``bulk_register``,
+which enforces the duplicate constraint and event capacity.
+"""
+
+import json
+import logging
+import uuid
+
+import redis
+from django.conf import settings
+from event_registration.redis_client import get_async_redis_client, get_redis_client
+from .bulk import bulk_register
+
+
+logger = logging.getLogger(__name__)
+
+INTAKE_STREAM = 'registrations:intake'
+INTAKE_GROUP = 'registrations-intake'
+STATUS_KEY = 'registrations:intake:status:{}'
+
+# Entries left unacknowledged this long by a crashed worker are reclaimed
+RECLAIM_IDLE_MS = 60000
+
+STATUS_PENDING = 'pending'
+STATUS_CONFIRMED = 'confirmed'
+STATUS_REJECTED = 'rejected'
+
+
+def is_intake_enabled():
+    """Return True when signups should go through the intake queue."""
+    return settings.REGISTRATION_INTAKE_MODE == 'queued'
+
+
+def enqueue_registration(data):
+    """
+    Append a validated signup to the intake stream.
+
+    Returns:
+        Provisional ticket ID that can be polled with ``get_intake_status``.
+    """
+    ticket = str(uuid.uuid4())
+    pipe = get_redis_client().pipeline(transaction=False)
+    _queue_entry(pipe, ticket, data)
+    pipe.execute()
+
+    return ticket
+
+
+async def aenqueue_registration(data):
+    """Async variant of ``enqueue_registration``."""
+    ticket = str(uuid.uuid4())
+    pipe = get_async_redis_client().pipeline(transaction=False)
+    _queue_entry(pipe, ticket, data)
+    await pipe.execute()
+
+    return ticket
+
+
+def _queue_entry(pipe, ticket, data):
+    """Add the status hash and stream entry for a signup to a pipeline."""
+    pipe.hset(STATUS_KEY.format(ticket), mapping={'status': STATUS_PENDING})
+    pipe.expire(STATUS_KEY.format(ticket), settings.REGISTRATION_INTAKE_STATUS_TTL)
+    pipe.xadd(INTAKE_STREAM, {
+        'ticket': ticket,
+        'payload': json.dumps(data, default=str),
+    })
+
+
+def get_intake_status(ticket):
+    """Return the status mapping for a ticket, or None if it is unknown."""
+    status = get_redis_client().hgetall(STATUS_KEY.format(ticket))
+    if not status:
+        return None
+    return {'id': ticket, **status}
+
+
+def _ensure_group(client):
+    """Create the consumer group (and stream) if it does not exist yet."""
+    try:
+        client.xgroup_create(INTAKE_STREAM, INTAKE_GROUP, id='0', mkstream=True)
+    except redis.ResponseError as e:
+        if 'BUSYGROUP' not in str(e):
+            raise
+
+
+def _read_batch(client, consumer, batch_size):
+    """Read stale entries from dead consumers first, then new entries."""
+    _, entries, *_ = client.xautoclaim(
+        INTAKE_STREAM, INTAKE_GROUP, consumer,
+        min_idle_time=RECLAIM_IDLE_MS, start_id='0-0', count=batch_size
+    )
+    if entries:
+        return entries
+
+    response = client.xreadgroup(
+        INTAKE_GROUP, consumer, {INTAKE_STREAM: '>'}, count=batch_size
+    )
+    return response[0][1] if response else []
+
+
+def flush_intake(consumer, batch_size=None):
+    """
+    Flush one batch of queued signups into the registrations table.
+
+    Returns:
+        Tuple of (created registrations, number of rejected signups).
+    """
+    batch_size = batch_size or settings.REGISTRATION_INTAKE_BATCH_SIZE
+    client = get_redis_client()
+    _ensure_group(client)
+
+    entries = _read_batch(client, consumer, batch_size)
+    if not entries:
+        return [], 0
+
+    candidates = []
+    for _, fields in entries:
+        candidate = json.loads(fields['payload'])
+        candidate['key'] = fields['ticket']
+        candidate['event_id'] = candidate.pop('event')
+        candidates.append(candidate)
+
+    created, rejected = bulk_register(candidates)
+
+    ttl = settings.REGISTRATION_INTAKE_STATUS_TTL
+    pipe = client.pipeline(transaction=False)
+    for registration in created:
+        key = STATUS_KEY.format(registration._bulk_key)
+        pipe.hset(key, mapping={
+            'status': STATUS_CONFIRMED,
+            'registration_id': str(registration.pk),
+        })
+        pipe.expire(key, ttl)
+    for ticket, reason in rejected.items():
+        key = STATUS_KEY.format(ticket)
+        pipe.hset(key, mapping={'status': STATUS_REJECTED, 'reason': reason})
+        pipe.expire(key, ttl)
+
+    entry_ids = [entry_id for entry_id, _ in entries]
+    pipe.xack(INTAKE_STREAM, INTAKE_GROUP, *entry_ids)
+    pipe.xdel(INTAKE_STREAM, *entry_ids)
+    pipe.execute()
+
+    logger.info(
+        "Flushed %d intake entries: %d created, %d rejected",
+        len(entries), len(created), len(rejected)
+    )
+    return created, len(rejected)
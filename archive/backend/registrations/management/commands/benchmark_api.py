@@ -0,0 +1,340 @@
+"""
+Management command measuring API latency and queries per request.
+"""
+
+import asyncio
+import json
+import platform
+import statistics
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import django
+from celery import current_app
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.db.models import F, Q
+from django.test import AsyncClient
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from events.caching import invalidate_event_cache
+from events.models import Event
+from registrations.models import Registration
+from registrations.stats import invalidate_stats_cache
+
+
+# Signups made by the benchmark use this domain and are deleted afterwards
+CREATE_EMAIL_DOMAIN = 'bench-create.example.com'
+
+PERCENTILES = [50, 90, 95, 99]
+
+# Endpoints served by the async views when ASYNC_PUBLIC_API is enabled
+ASYNC_ENDPOINTS = ['event_list', 'open_registrations', 'registration_create']
+
+
+def percentile(sorted_values, pct):
+    """Return the nearest-rank percentile of an already sorted list."""
+    index = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def summarize(timings, queries, statuses, wall_seconds):
+    """Summarize one endpoint's samples."""
+    timings = sorted(timings)
+    counted = [count for count in queries if count is not None]
+    result = {
+        'requests': len(timings),
+        'throughput_rps': round(len(timings) / wall_seconds, 1),
+        'mean_ms': round(statistics.fmean(timings), 3),
+        'max_ms': round(timings[-1], 3),
+        'queries_mean': round(statistics.fmean(counted), 2) if counted else None,
+        'queries_max': max(counted) if counted else None,
+        'errors': sum(1 for code in statuses if code >= 400),
+    }
+    for pct in PERCENTILES:
+        result[f'p{pct}_ms'] = round(percentile(timings, pct), 3)
+    return result
+
+
+class Command(BaseCommand):
+    """Benchmark the events and registrations endpoints through the test client."""
+    
+    help = 'Measure latency percentiles and queries per request for the API endpoints.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=50, help='Timed requests per endpoint.')
+        parser.add_argument('--warmup', type=int, default=5, help='Untimed requests per endpoint.')
+        parser.add_argument('--endpoints', nargs='+', help='Only run these endpoint names.')
+        parser.add_argument('--cold', action='store_true', help='Invalidate response caches before every request.')
+        parser.add_argument(
+            '--concurrency', type=int, default=1,
+            help='Requests in flight at once (threads, or tasks with --asgi).'
+        )
+        parser.add_argument(
+            '--asgi', action='store_true',
+            help='Drive the ASGI handler with AsyncClient; only the async public '
+                 'endpoints are run (requires ASYNC_PUBLIC_API).'
+        )
+        parser.add_argument(
+            '--smtp',
+            help='host:port of a local SMTP sink for the eager email tasks '
+                 '(default: in-memory email backend).'
+        )
+        parser.add_argument('--output', help='Write JSON results to this file.')
+        parser.add_argument('--baseline', help='JSON results to compare against; fail on regressions.')
+        parser.add_argument(
+            '--tolerance', type=float, default=0.20,
+            help='Allowed relative p95 increase over the baseline (default 0.20).'
+        )
+        parser.add_argument(
+            '--noise-floor-ms', type=float, default=1.0,
+            help='Ignore p95 increases smaller than this many milliseconds.'
+        )
+    
+    def get_endpoints(self):
+        """Return (name, method, path builder) for every benchmarked endpoint."""
+        event = Event.objects.filter(is_active=True).order_by('-registration_count').first()
+        registration = Registration.objects.order_by('-created_at').first()
+        if event is None or registration is None:
+            raise CommandError("No data to benchmark; run seed_benchmark_data first.")
+        
+        now = timezone.now()
+        open_event = Event.objects.filter(
+            Q(max_participants__isnull=True) | Q(registration_count__lt=F('max_participants')),
+            is_active=True,
+            registration_start_date__lte=now,
+            registration_end_date__gte=now,
+        ).first()
+        
+        endpoints = [
+            ('event_list', 'get', lambda n: '/api/events/'),
+            ('event_retrieve', 'get', lambda n: f'/api/events/{event.pk}/'),
+            ('open_registrations', 'get', lambda n: '/api/events/open_registrations/'),
+            ('dates', 'get', lambda n: '/api/events/dates/'),
+            ('stats', 'get', lambda n: '/api/registrations/stats/'),
+            ('export', 'get', lambda n: f'/api/registrations/export/?event={event.pk}'),
+            (
+                'my_registrations', 'get',
+                lambda n: f'/api/registrations/my_registrations/?email={registration.email}'
+            ),
+        ]
+        if open_event is not None:
+            endpoints.append(('registration_create', 'post', lambda n: (
+                '/api/registrations/',
+                {
+                    'full_name': f'Bench Signup {n}',
+                    'email': f'signup{n}-{uuid.uuid4().hex[:8]}@{CREATE_EMAIL_DOMAIN}',
+                    'college_name': 'Benchmark College',
+                    'department': 'Performance',
+                    'event': str(open_event.pk),
+                }
+            )))
+        else:
+            self.stdout.write(self.style.WARNING("No open event with free seats; skipping registration_create."))
+        
+        return endpoints
+    
+    def get_client(self):
+        """Return an API client authenticated as an (unsaved) staff user."""
+        client = APIClient(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        # Unsaved staff user: passes IsAdminUser without touching the database
+        client.force_authenticate(get_user_model()(username='benchmark', is_staff=True))
+        return client
+    
+    def reset_caches(self, options):
+        """Invalidate response caches in --cold runs."""
+        if options['cold']:
+            invalidate_event_cache()
+            invalidate_stats_cache()
+    
+    def request(self, client, method, target, number):
+        """Issue one request and return (status, elapsed ms, query count)."""
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            if method == 'post':
+                path, data = target(number)
+                response = client.post(path, data, format='json')
+            else:
+                response = client.get(target(number), HTTP_ACCEPT='application/json')
+            if response.streaming:
+                # Streaming bodies are produced while being consumed
+                b''.join(response.streaming_content)
+            elapsed = (time.perf_counter() - started) * 1000
+        return response.status_code, elapsed, len(queries)
+    
+    def run_endpoint(self, method, target, options):
+        """Warm up, then time an endpoint from ``--concurrency`` threads."""
+        client = self.get_client()
+        for number in range(options['warmup']):
+            self.reset_caches(options)
+            self.request(client, method, target, number)
+        
+        # Test clients keep cookies, so each thread gets its own
+        local = threading.local()
+        
+        def timed(number):
+            if not hasattr(local, 'client'):
+                local.client = self.get_client()
+            self.reset_caches(options)
+            return self.request(local.client, method, target, number)
+        
+        numbers = range(options['warmup'], options['warmup'] + options['iterations'])
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=options['concurrency']) as executor:
+            samples = list(executor.map(timed, numbers))
+        wall_seconds = time.perf_counter() - started
+        
+        statuses, timings, queries = zip(*samples)
+        return summarize(timings, queries, statuses, wall_seconds)
+    
+    async def arequest(self, client, method, target, number, count_queries):
+        """Issue one request through the ASGI handler."""
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            if method == 'post':
+                path, data = target(number)
+                response = await client.post(path, data, content_type='application/json')
+            else:
+                response = await client.get(target(number), headers={'Accept': 'application/json'})
+            elapsed = (time.perf_counter() - started) * 1000
+        # Concurrent tasks share one connection, so counts are only exact alone
+        return response.status_code, elapsed, len(queries) if count_queries else None
+    
+    async def arun_endpoint(self, method, target, options):
+        """Warm up, then time an endpoint with ``--concurrency`` tasks."""
+        client = AsyncClient(headers={'Host': settings.ALLOWED_HOSTS[0]})
+        count_queries = options['concurrency'] == 1
+        
+        for number in range(options['warmup']):
+            self.reset_caches(options)
+            await self.arequest(client, method, target, number, count_queries)
+        
+        numbers = iter(range(options['warmup'], options['warmup'] + options['iterations']))
+        samples = []
+        
+        async def worker():
+            for number in numbers:
+                self.reset_caches(options)
+                samples.append(await self.arequest(client, method, target, number, count_queries))
+        
+        started = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(options['concurrency'])))
+        wall_seconds = time.perf_counter() - started
+        
+        statuses, timings, queries = zip(*samples)
+        return summarize(timings, queries, statuses, wall_seconds)
+    
+    def get_email_settings(self, smtp):
+        """Return settings overrides routing task email to a sink."""
+        if not smtp:
+            return {'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend'}
+        
+        host, _, port = smtp.rpartition(':')
+        return {
+            'EMAIL_BACKEND': 'django.core.mail.backends.smtp.EmailBackend',
+            'EMAIL_HOST': host or 'localhost',
+            'EMAIL_PORT': int(port),
+            'EMAIL_USE_TLS': False,
+            'EMAIL_HOST_USER': '',
+            'EMAIL_HOST_PASSWORD': '',
+        }
+    
+    def compare(self, results, baseline, options):
+        """Return regression messages against a baseline result file."""
+        regressions = []
+        
+        for name, current in results['endpoints'].items():
+            previous = baseline.get('endpoints', {}).get(name)
+            if previous is None:
+                continue
+            
+            limit = previous['p95_ms'] * (1 + options['tolerance'])
+            if current['p95_ms'] > limit and current['p95_ms'] - previous['p95_ms'] > options['noise_floor_ms']:
+                regressions.append(
+                    f"{name}: p95 {current['p95_ms']:.3f} ms vs baseline {previous['p95_ms']:.3f} ms"
+                )
+            if (
+                current['queries_max'] is not None
+                and previous['queries_max'] is not None
+                and current['queries_max'] > previous['queries_max']
+            ):
+                regressions.append(
+                    f"{name}: {current['queries_max']} queries/request vs baseline {previous['queries_max']}"
+                )
+        
+        return regressions
+    
+    def handle(self, *args, **options):
+        if options['iterations'] < 1 or options['concurrency'] < 1:
+            raise CommandError("--iterations and --concurrency must be at least 1.")
+        
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as handle:
+                baseline = json.load(handle)
+        
+        endpoints = self.get_endpoints()
+        if options['asgi']:
+            if not settings.ASYNC_PUBLIC_API:
+                raise CommandError("--asgi needs ASYNC_PUBLIC_API enabled.")
+            endpoints = [endpoint for endpoint in endpoints if endpoint[0] in ASYNC_ENDPOINTS]
+        if options['endpoints']:
+            endpoints = [endpoint for endpoint in endpoints if endpoint[0] in options['endpoints']]
+        
+        # Run Celery tasks inline so signup cost includes the email work
+        eager = current_app.conf.task_always_eager
+        current_app.conf.task_always_eager = True
+        
+        results = {
+            'database': connection.vendor,
+            'django': django.get_version(),
+            'python': platform.python_version(),
+            'events': Event.objects.count(),
+            'registrations': Registration.objects.count(),
+            'iterations': options['iterations'],
+            'concurrency': options['concurrency'],
+            'handler': 'asgi' if options['asgi'] else 'wsgi',
+            'cold': options['cold'],
+            'started_at': timezone.now().isoformat(),
+            'endpoints': {},
+        }
+        
+        try:
+            # Throttling would reject a load test; it is not what is measured
+            with override_settings(**self.get_email_settings(options['smtp'])), \
+                    mock.patch.object(APIView, 'throttle_classes', ()):
+                for name, method, target in endpoints:
+                    if options['asgi']:
+                        summary = asyncio.run(self.arun_endpoint(method, target, options))
+                    else:
+                        summary = self.run_endpoint(method, target, options)
+                    results['endpoints'][name] = summary
+                    self.stdout.write(
+                        f"{name:20} p50 {summary['p50_ms']:9.3f} ms  "
+                        f"p95 {summary['p95_ms']:9.3f} ms  p99 {summary['p99_ms']:9.3f} ms  "
+                        f"{summary['throughput_rps']:8.1f} req/s  "
+                        f"queries {summary['queries_mean']}  errors {summary['errors']}"
+                    )
+        finally:
+            current_app.conf.task_always_eager = eager
+            Registration.objects.filter(email__endswith=f'@{CREATE_EMAIL_DOMAIN}').delete()
+        
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(results, handle, indent=2)
+            self.stdout.write(f"Results written to {options['output']}")
+        
+        if baseline is not None:
+            regressions = self.compare(results, baseline, options)
+            if regressions:
+                for message in regressions:
+                    self.stdout.write(self.style.ERROR(message))
+                raise CommandError(f"{len(regressions)} performance regression(s) against the baseline.")
+            self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
@@ -0,0 +1,63 @@
+"""
+Management command comparing list serializers with projection serializers.
+"""
+
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from events.models import Event
+from events.serializers import EventListProjection, EventListSerializer
+from registrations.models import Registration
+from registrations.serializers import RegistrationListProjection, RegistrationListSerializer
+
+
+class Command(BaseCommand):
+    """Time serialization of list pages through both read paths."""
+    
+    help = 'Benchmark ModelSerializer list pages against projection serializers.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=50, help='Rows per page.')
+        parser.add_argument('--repeat', type=int, default=200)
+    
+    def _time(self, serialize, repeat):
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            serialize()
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
+    
+    def handle(self, *args, **options):
+        rows = options['rows']
+        cases = [
+            (
+                'registrations',
+                Registration.objects.select_related('event'),
+                RegistrationListSerializer,
+                RegistrationListProjection,
+            ),
+            ('events', Event.objects.all(), EventListSerializer, EventListProjection),
+        ]
+        
+        for label, queryset, serializer_class, projection_class in cases:
+            # Fetch once so only serialization is timed
+            instances = list(queryset[:rows])
+            projected = list(projection_class.project(queryset)[:rows])
+            if not instances:
+                raise CommandError(f"No {label} to serialize; seed some data first.")
+            
+            if serializer_class(instances, many=True).data != projection_class(projected, many=True).data:
+                self.stdout.write(self.style.WARNING(f"{label}: outputs differ"))
+            
+            for name, serialize in (
+                ('serializer', lambda: serializer_class(instances, many=True).data),
+                ('projection', lambda: projection_class(projected, many=True).data),
+            ):
+                timings = self._time(serialize, options['repeat'])
+                self.stdout.write(
+                    f"{label:14} {name:11} {len(instances)} rows  "
+                    f"median {statistics.median(timings):7.3f} ms  "
+                    f"p95 {sorted(timings)[int(len(timings) * 0.95) - 1]:7.3f} ms"
+                )
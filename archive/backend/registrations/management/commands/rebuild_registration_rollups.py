@@ -0,0 +1,17 @@
+"""
+Management command to rebuild the daily registration rollup table.
+"""
+
+from django.core.management.base import BaseCommand
+from registrations.stats import invalidate_stats_cache, rebuild_rollups
+
+
+class Command(BaseCommand):
+    """Recompute RegistrationDailyRollup rows from the registrations table."""
+    
+    help = 'Rebuild daily registration rollups used by the stats endpoint.'
+    
+    def handle(self, *args, **options):
+        rows = rebuild_rollups()
+        invalidate_stats_cache()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} rollup row(s)."))
@@ -0,0 +1,143 @@
+"""
+Management command seeding synthetic events and registrations for benchmarks.
+"""
+
+import random
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from events.caching import invalidate_event_cache
+from events.models import Event
+from registrations.models import Registration
+from registrations.stats import invalidate_stats_cache, rebuild_rollups, rollups_enabled
+
+
+# Seeded rows are recognisable by these markers so --clear only removes them
+EVENT_NAME_PREFIX = 'Benchmark Event'
+EMAIL_DOMAIN = 'bench.example.com'
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+
+COLLEGES = ['North Campus', 'Riverside College', 'Institute of Technology', 'Hill View University']
+DEPARTMENTS = ['Computer Science', 'Electrical', 'Mechanical', 'Civil', 'Mathematics', 'Physics']
+
+
+def parse_scale(value):
+    """Parse a scale such as '10k', '1M' or '2500' into a row count."""
+    value = value.strip().lower()
+    if value in SCALES:
+        return SCALES[value]
+    try:
+        return int(value)
+    except ValueError:
+        raise CommandError(f"Invalid scale '{value}'; use 10k, 100k, 1M or a number.")
+
+
+class Command(BaseCommand):
+    """Insert a reproducible synthetic dataset with bulk_create."""
+    
+    help = 'Seed synthetic events and registrations (10k/100k/1M) for benchmarking.'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', default='10k', help='Registrations to create: 10k, 100k, 1M or a number.')
+        parser.add_argument('--events', type=int, help='Events to create (default: one per 500 registrations).')
+        parser.add_argument('--batch-size', type=int, default=5000)
+        parser.add_argument('--seed', type=int, default=42, help='Random seed for a reproducible dataset.')
+        parser.add_argument('--clear', action='store_true', help='Delete previously seeded rows first.')
+    
+    def build_events(self, rng, count, now):
+        """Build events: most open for registration, some closed, upcoming or inactive."""
+        categories = [value for value, _ in Event.CATEGORY_CHOICES]
+        events = []
+        
+        for number in range(count):
+            kind = number % 10
+            if kind < 6:
+                start, end = now - timedelta(days=30), now + timedelta(days=30)
+            elif kind < 8:
+                start, end = now - timedelta(days=90), now - timedelta(days=10)
+            else:
+                start, end = now + timedelta(days=10), now + timedelta(days=40)
+            
+            events.append(Event(
+                name=f'{EVENT_NAME_PREFIX} {number + 1}',
+                category=categories[number % len(categories)],
+                event_date=(end + timedelta(days=rng.randint(1, 30))).date(),
+                registration_start_date=start,
+                registration_end_date=end,
+                description=f'Synthetic event {number + 1} for performance benchmarks.',
+                # Leave room for the benchmark's own signups
+                max_participants=None if number % 3 else 100_000_000,
+                is_active=number % 20 != 19,
+            ))
+        
+        return events
+    
+    def handle(self, *args, **options):
+        total = parse_scale(options['scale'])
+        event_count = options['events'] or max(1, total // 500)
+        batch_size = options['batch_size']
+        rng = random.Random(options['seed'])
+        now = timezone.now()
+        
+        if options['clear']:
+            seeded = Event.objects.filter(name__startswith=EVENT_NAME_PREFIX)
+            registrations = Registration.objects.filter(event__in=seeded)
+            # Skip per-row delete signals; the counters go with their events
+            removed = registrations._raw_delete(registrations.db)
+            deleted, _ = seeded.delete()
+            self.stdout.write(f"Deleted {removed} registrations and {deleted} other seeded row(s).")
+        
+        with transaction.atomic():
+            events = Event.objects.bulk_create(
+                self.build_events(rng, event_count, now),
+                batch_size=batch_size
+            )
+        self.stdout.write(f"Created {len(events)} events.")
+        
+        # Registrations are spread evenly; each email is unique per event
+        run = rng.getrandbits(32)
+        counts = {event.pk: 0 for event in events}
+        created = 0
+        
+        while created < total:
+            size = min(batch_size, total - created)
+            batch = []
+            for number in range(created, created + size):
+                event = events[number % len(events)]
+                counts[event.pk] += 1
+                batch.append(Registration(
+                    full_name=f'Bench User {number}',
+                    email=f'user{number}-{run:x}@{EMAIL_DOMAIN}',
+                    college_name=rng.choice(COLLEGES),
+                    department=rng.choice(DEPARTMENTS),
+                    event=event,
+                    confirmation_email_sent=True,
+                    admin_notification_sent=True,
+                ))
+            
+            with transaction.atomic():
+                Registration.objects.bulk_create(batch, batch_size=batch_size)
+                # created_at is auto_now_add; spread batches over the last 60 days
+                Registration.objects.filter(
+                    pk__in=[registration.pk for registration in batch]
+                ).update(created_at=now - timedelta(days=rng.randint(0, 60), seconds=rng.randint(0, 86399)))
+            
+            created += size
+            self.stdout.write(f"  {created}/{total} registrations")
+        
+        # bulk_create bypasses the per-row signals that maintain these
+        for event in events:
+            event.registration_count = counts[event.pk]
+        Event.objects.bulk_update(events, ['registration_count'], batch_size=batch_size)
+        
+        if rollups_enabled():
+            rebuild_rollups()
+        invalidate_stats_cache()
+        invalidate_event_cache()
+        
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(events)} events and {created} registrations."
+        ))
@@ -0,0 +1,239 @@
+"""
+Per-event duplicate-registration prefilter for the registrations app.
+
+Each event has a Redis bitmap Bloom filter of registered emails, so the
+common "not registered yet" case is answered without a database query.
+Bloom positives are confirmed against the database and confirmed
+duplicates are remembered in an exact per-event set, so repeated attempts
+(double submits, retries) are answered from Redis as well.
+
+Filters are warmed lazily from the database on first use and expire after
+REGISTRATION_MEMBERSHIP_TTL. New registrations set their bits immediately;
+deletions only leave the exact set, since Bloom bits cannot be cleared (the
+stale bits cost a database check until the filter is rebuilt). The
+``unique_email_event`` constraint remains the source of truth; any Redis
+failure falls back to the database.
+"""
+
+import hashlib
+import logging
+from collections import defaultdict
+
+import redis
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from event_registration.redis_client import get_async_redis_client, get_redis_client
+from .models import Registration
+
+
+logger = logging.getLogger(__name__)
+
+BLOOM_KEY = 'registrations:members:{}:bloom'
+POSITIVES_KEY = 'registrations:members:{}:positives'
+READY_KEY = 'registrations:members:{}:ready'
+WARMING_KEY = 'registrations:members:{}:warming'
+
+# Seconds a worker may spend warming one event's filter
+WARM_LOCK_SECONDS = 60
+
+WARM_CHUNK_SIZE = 5000
+
+# Set the bits of each email, but only while the filter is live or being
+# warmed; otherwise the next warm-up reads the row from the database.
+ADD_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 and redis.call('EXISTS', KEYS[3]) == 0 then
+    return 0
+end
+for i = 2, #ARGV do
+    redis.call('SETBIT', KEYS[1], ARGV[i], 1)
+end
+redis.call('EXPIRE', KEYS[1], ARGV[1])
+return 1
+"""
+
+# Returns -1 if the filter is not warm, 0 for a definite miss, 1 for a
+# confirmed duplicate and 2 for a Bloom positive that needs confirming.
+CHECK_SCRIPT = """
+if redis.call('EXISTS', KEYS[3]) == 0 then
+    return -1
+end
+for i = 2, #ARGV do
+    if redis.call('GETBIT', KEYS[1], ARGV[i]) == 0 then
+        return 0
+    end
+end
+if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 1 then
+    return 1
+end
+return 2
+"""
+
+MISSING, ABSENT, PRESENT, MAYBE = -1, 0, 1, 2
+
+
+def membership_enabled():
+    """Return True when the duplicate prefilter is enabled."""
+    return settings.REGISTRATION_MEMBERSHIP_ENABLED
+
+
+def bloom_positions(email):
+    """Return the filter bit positions of an email (double hashing)."""
+    digest = hashlib.blake2b(email.encode('utf-8'), digest_size=16).digest()
+    first = int.from_bytes(digest[:8], 'little')
+    second = int.from_bytes(digest[8:], 'little') | 1
+    bits = settings.REGISTRATION_MEMBERSHIP_BLOOM_BITS
+    return [
+        (first + index * second) % bits
+        for index in range(settings.REGISTRATION_MEMBERSHIP_BLOOM_HASHES)
+    ]
+
+
+def _keys(event_id):
+    return BLOOM_KEY.format(event_id), POSITIVES_KEY.format(event_id), READY_KEY.format(event_id)
+
+
+def warm_event(event_id):
+    """
+    Build an event's filter from the database.
+    
+    Returns:
+        True if the filter is ready, False if another worker is warming it.
+    """
+    client = get_redis_client()
+    bloom_key, positives_key, ready_key = _keys(event_id)
+    warming_key = WARMING_KEY.format(event_id)
+    
+    if not client.set(warming_key, 1, nx=True, ex=WARM_LOCK_SECONDS):
+        return False
+    
+    try:
+        client.delete(bloom_key, positives_key)
+        emails = Registration.objects.filter(event_id=event_id).values_list(
+            'email', flat=True
+        ).iterator(chunk_size=WARM_CHUNK_SIZE)
+        
+        pipe = client.pipeline(transaction=False)
+        for number, email in enumerate(emails, start=1):
+            for position in bloom_positions(email):
+                pipe.setbit(bloom_key, position, 1)
+            if number % WARM_CHUNK_SIZE == 0:
+                pipe.execute()
+        
+        ttl = settings.REGISTRATION_MEMBERSHIP_TTL
+        # Keep an (empty) bitmap so events without registrations are warm too
+        pipe.setbit(bloom_key, 0, 0)
+        pipe.expire(bloom_key, ttl)
+        pipe.set(ready_key, 1, ex=ttl)
+        pipe.execute()
+    finally:
+        client.delete(warming_key)
+    
+    return True
+
+
+def is_registered(event_id, email):
+    """
+    Return True if the email is registered for the event.
+    
+    Answers from Redis for definite misses and remembered duplicates, and
+    from the database otherwise.
+    """
+    if not membership_enabled():
+        return _exists(event_id, email)
+    
+    try:
+        client = get_redis_client()
+        keys = _keys(event_id)
+        outcome = client.eval(CHECK_SCRIPT, 3, *keys, email, *bloom_positions(email))
+        
+        if outcome == MISSING:
+            warm_event(event_id)
+            return _exists(event_id, email)
+        if outcome == ABSENT:
+            return False
+        if outcome == PRESENT:
+            return True
+        
+        registered = _exists(event_id, email)
+        if registered:
+            client.sadd(keys[1], email)
+            client.expire(keys[1], settings.REGISTRATION_MEMBERSHIP_TTL)
+        return registered
+    except redis.RedisError:
+        logger.warning("Membership prefilter unavailable; checking the database", exc_info=True)
+        return _exists(event_id, email)
+
+
+async def ais_registered(event_id, email):
+    """Async variant of ``is_registered``."""
+    if not membership_enabled():
+        return await _aexists(event_id, email)
+    
+    try:
+        client = get_async_redis_client()
+        keys = _keys(event_id)
+        outcome = await client.eval(CHECK_SCRIPT, 3, *keys, email, *bloom_positions(email))
+        
+        if outcome == MISSING:
+            # Warming scans the event's registrations; leave it to a thread
+            await sync_to_async(warm_event)(event_id)
+            return await _aexists(event_id, email)
+        if outcome == ABSENT:
+            return False
+        if outcome == PRESENT:
+            return True
+        
+        registered = await _aexists(event_id, email)
+        if registered:
+            await client.sadd(keys[1], email)
+            await client.expire(keys[1], settings.REGISTRATION_MEMBERSHIP_TTL)
+        return registered
+    except redis.RedisError:
+        logger.warning("Membership prefilter unavailable; checking the database", exc_info=True)
+        return await _aexists(event_id, email)
+
+
+def _exists(event_id, email):
+    """Check the database, which is the source of truth."""
+    return Registration.objects.filter(event_id=event_id, email=email).exists()
+
+
+async def _aexists(event_id, email):
+    """Async variant of ``_exists``."""
+    return await Registration.objects.filter(event_id=event_id, email=email).aexists()
+
+
+def add_members(registrations):
+    """Set filter bits for newly created registrations."""
+    if not membership_enabled():
+        return
+    
+    by_event = defaultdict(list)
+    for registration in registrations:
+        by_event[registration.event_id].append(registration.email)
+    
+    try:
+        client = get_redis_client()
+        pipe = client.pipeline(transaction=False)
+        for event_id, emails in by_event.items():
+            positions = [position for email in emails for position in bloom_positions(email)]
+            pipe.eval(
+                ADD_SCRIPT, 3,
+                BLOOM_KEY.format(event_id), READY_KEY.format(event_id), WARMING_KEY.format(event_id),
+                settings.REGISTRATION_MEMBERSHIP_TTL, *positions
+            )
+        pipe.execute()
+    except redis.RedisError:
+        # Missing bits only cost a failed insert on the unique constraint
+        logger.warning("Could not update the membership prefilter", exc_info=True)
+
+
+def remove_member(registration):
+    """Forget a deleted registration's confirmed-duplicate entry."""
+    if not membership_enabled():
+        return
+    
+    try:
+        get_redis_client().srem(POSITIVES_KEY.format(registration.event_id), registration.email)
+    except redis.RedisError:
+        logger.warning("Could not update the membership prefilter", exc_info=True)
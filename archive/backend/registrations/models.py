@@ -56,11 +56,17 @@ class Registration(models.Model):
     confirmation_email_sent = models.BooleanField(default=False)
     admin_notification_sent = models.BooleanField(default=False)
     
+    # Set while a task is sending this registration's emails; expired
+    # claims are retried until email_attempts reaches the maximum
+    email_claimed_until = models.DateTimeField(null=True, blank=True)
+    email_attempts = models.PositiveIntegerField(default=0)
+    
     class Meta:
         ordering = ['-created_at']
         indexes = [
             models.Index(fields=['email']),
-            models.Index(fields=['created_at']),
+            # Backs cursor pagination ordered by (created_at, id)
+            models.Index(fields=['-created_at', '-id']),
         ]
         # Prevent duplicate registrations (email + event_date)
         constraints = [
@@ -86,3 +92,121 @@ class Registration(models.Model):
     def get_event_name(self):
         """Get the event name."""
         return self.event.name
+
+
+class NotificationDelivery(models.Model):
+    """Per-recipient delivery state for bulk event notifications."""
+    
+    STATUS_PENDING = 'pending'
+    STATUS_SENT = 'sent'
+    STATUS_FAILED = 'failed'
+    
+    STATUS_CHOICES = [
+        (STATUS_PENDING, 'Pending'),
+        (STATUS_SENT, 'Sent'),
+        (STATUS_FAILED, 'Failed'),
+    ]
+    
+    notification_key = models.CharField(
+        max_length=64,
+        help_text="Identifies the notification run, created when it is dispatched"
+    )
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='notification_deliveries',
+        help_text="Event the notification was sent for"
+    )
+    email = models.EmailField(help_text="Recipient email address")
+    status = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default=STATUS_PENDING
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    error = models.TextField(blank=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        indexes = [
+            models.Index(fields=['notification_key', 'status']),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['notification_key', 'email'],
+                name='unique_notification_recipient'
+            )
+        ]
+        verbose_name = 'Notification Delivery'
+        verbose_name_plural = 'Notification Deliveries'
+    
+    def __str__(self):
+        return f"{self.email} - {self.get_status_display()}"
+
+
+class RegistrationDailyRollup(models.Model):
+    """Daily registration counts per event, maintained incrementally for stats."""
+    
+    date = models.DateField(help_text="Local date the registrations were created")
+    event = models.ForeignKey(
+        Event,
+        on_delete=models.CASCADE,
+        related_name='daily_rollups',
+        help_text="Event the registrations belong to"
+    )
+    count = models.IntegerField(default=0)
+    
+    class Meta:
+        ordering = ['-date']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['date', 'event'],
+                name='unique_rollup_date_event'
+            )
+        ]
+        verbose_name = 'Registration Daily Rollup'
+        verbose_name_plural = 'Registration Daily Rollups'
+    
+    def __str__(self):
+        return f"{self.event_id} - {self.date}: {self.count}"
+
+
+class Outbox(models.Model):
+    """
+    Side effects recorded in the transaction that caused them.
+    
+    Rows are published to Celery by the outbox relay after that transaction
+    has committed (see registrations/outbox.py).
+    """
+    
+    topic = models.CharField(max_length=100, help_text="Kind of side effect")
+    payload = models.JSONField(help_text="Arguments for the publisher")
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    # Set while a relay is publishing the row; expired claims are retried
+    claimed_until = models.DateTimeField(null=True, blank=True)
+    published_at = models.DateTimeField(null=True, blank=True)
+    attempts = models.PositiveIntegerField(default=0)
+    
+    class Meta:
+        ordering = ['id']
+        indexes = [
+            # Keeps the relay's pending scan small as published rows pile up
+            models.Index(
+                fields=['id'],
+                condition=models.Q(published_at__isnull=True),
+                name='outbox_pending_idx'
+            ),
+            # Backs pruning of published rows past their retention
+            models.Index(
+                fields=['published_at'],
+                condition=models.Q(published_at__isnull=False),
+                name='outbox_published_idx'
+            ),
+        ]
+        verbose_name = 'Outbox Message'
+        verbose_name_plural = 'Outbox Messages'
+    
+    def __str__(self):
+        return f"{self.topic} #{self.pk}"
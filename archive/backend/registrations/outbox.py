@@ -0,0 +1,188 @@
+"""
+Transactional outbox for registration side effects.
+
+Writers add ``Outbox`` rows in the same transaction as the registrations
+they describe, so a side effect is recorded if and only if the signup
+commits, without a broker round trip in the request. ``relay_outbox``
+claims committed rows in batches, publishes them to Celery in bulk and
+marks them published. A relay that dies mid-batch leaves its claim to
+expire and the rows are published again; the email tasks claim each
+registration and send only what is still unsent, so redelivery does not
+duplicate emails. Rows still unpublished after OUTBOX_MAX_ATTEMPTS claims
+are left for inspection, and published rows are pruned after
+OUTBOX_RETENTION_SECONDS.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Avg, Count, DurationField, ExpressionWrapper, F, Max, Min, Q
+from django.utils import timezone
+from event_registration.metrics import registry
+from .exports import chunked
+from .models import Outbox
+
+
+logger = logging.getLogger(__name__)
+
+TOPIC_REGISTRATION_EMAILS = 'registration.emails'
+
+
+def record_registration_emails(registrations):
+    """
+    Record confirmation/admin emails for new registrations.
+    
+    Must be called inside the transaction that creates them. Batched email
+    mode needs no rows: its dispatcher scans for unsent registrations.
+    """
+    if settings.REGISTRATION_EMAIL_MODE == 'batched' or not registrations:
+        return
+    
+    Outbox.objects.bulk_create([
+        Outbox(
+            topic=TOPIC_REGISTRATION_EMAILS,
+            payload={'registration_id': str(registration.pk)}
+        )
+        for registration in registrations
+    ])
+
+
+def publish_registration_emails(payloads):
+    """Queue one email batch task per REGISTRATION_EMAIL_BATCH_SIZE registrations."""
+    from .tasks import send_registration_email_batch
+    
+    registration_ids = [payload['registration_id'] for payload in payloads]
+    for chunk in chunked(registration_ids, settings.REGISTRATION_EMAIL_BATCH_SIZE):
+        send_registration_email_batch.delay(chunk)
+
+
+PUBLISHERS = {
+    TOPIC_REGISTRATION_EMAILS: publish_registration_emails,
+}
+
+
+def dead_letter_filter(now):
+    """Return a Q matching unpublished rows that exhausted their attempts."""
+    return (
+        Q(published_at__isnull=True, attempts__gte=settings.OUTBOX_MAX_ATTEMPTS)
+        & (Q(claimed_until__isnull=True) | Q(claimed_until__lt=now))
+    )
+
+
+def claim_batch(batch_size):
+    """
+    Claim up to batch_size unpublished rows whose claim is free or expired.
+    
+    Rows already claimed OUTBOX_MAX_ATTEMPTS times are no longer claimed.
+    """
+    now = timezone.now()
+    
+    with transaction.atomic():
+        rows = list(
+            Outbox.objects.select_for_update(skip_locked=True).filter(
+                Q(claimed_until__isnull=True) | Q(claimed_until__lt=now),
+                published_at__isnull=True,
+                attempts__lt=settings.OUTBOX_MAX_ATTEMPTS
+            ).order_by('id')[:batch_size]
+        )
+        if rows:
+            Outbox.objects.filter(pk__in=[row.pk for row in rows]).update(
+                claimed_until=now + timedelta(seconds=settings.OUTBOX_CLAIM_SECONDS),
+                attempts=F('attempts') + 1
+            )
+    
+    return rows
+
+
+def relay_outbox(batch_size=None):
+    """
+    Publish one batch of outbox rows.
+    
+    Returns:
+        Number of rows published.
+    """
+    rows = claim_batch(batch_size or settings.OUTBOX_RELAY_BATCH_SIZE)
+    if not rows:
+        return 0
+    
+    by_topic = defaultdict(list)
+    for row in rows:
+        by_topic[row.topic].append(row)
+    
+    published = []
+    for topic, topic_rows in by_topic.items():
+        publisher = PUBLISHERS.get(topic)
+        if publisher is None:
+            logger.error("No publisher for outbox topic %s", topic)
+            continue
+        try:
+            publisher([row.payload for row in topic_rows])
+        except Exception:
+            # The claim expires and the rows are retried by a later run
+            logger.exception("Could not publish %d %s outbox rows", len(topic_rows), topic)
+            continue
+        published.extend(topic_rows)
+    
+    if published:
+        now = timezone.now()
+        Outbox.objects.filter(pk__in=[row.pk for row in published]).update(published_at=now)
+        
+        # Lag is exported by collect_outbox_metrics; this process is a worker
+        max_lag = max((now - row.created_at).total_seconds() for row in published)
+        logger.info("Relayed %d outbox rows, max lag %.3fs", len(published), max_lag)
+    
+    return len(published)
+
+
+def prune_outbox(batch_size=None):
+    """
+    Delete published rows older than OUTBOX_RETENTION_SECONDS.
+    
+    Returns:
+        Number of rows deleted (at most batch_size per call).
+    """
+    cutoff = timezone.now() - timedelta(seconds=settings.OUTBOX_RETENTION_SECONDS)
+    expired = list(
+        Outbox.objects.filter(published_at__lt=cutoff).order_by('published_at').values_list(
+            'pk', flat=True
+        )[:batch_size or settings.OUTBOX_RELAY_BATCH_SIZE]
+    )
+    if not expired:
+        return 0
+    
+    deleted, _ = Outbox.objects.filter(pk__in=expired).delete()
+    return deleted
+
+
+def collect_outbox_metrics():
+    """
+    Report the pending backlog, the age of its oldest row, dead letters and
+    relay lag.
+    
+    Runs at scrape time in the web process and reads everything from the
+    table, since the relay itself runs in Celery workers. Lag is
+    ``published_at - created_at`` over rows published in the last
+    OUTBOX_LAG_WINDOW_SECONDS.
+    """
+    now = timezone.now()
+    dead_letter = dead_letter_filter(now)
+    pending = Outbox.objects.filter(published_at__isnull=True).aggregate(
+        count=Count('id', filter=~dead_letter),
+        oldest=Min('created_at', filter=~dead_letter),
+        dead_letter=Count('id', filter=dead_letter)
+    )
+    registry.set('outbox_pending', pending['count'])
+    oldest = (now - pending['oldest']).total_seconds() if pending['oldest'] else 0
+    registry.set('outbox_oldest_pending_seconds', oldest)
+    registry.set('outbox_dead_letter', pending['dead_letter'])
+    
+    lag = ExpressionWrapper(F('published_at') - F('created_at'), output_field=DurationField())
+    recent = Outbox.objects.filter(
+        published_at__gte=now - timedelta(seconds=settings.OUTBOX_LAG_WINDOW_SECONDS)
+    ).aggregate(count=Count('id'), max_lag=Max(lag), avg_lag=Avg(lag))
+    registry.set('outbox_recently_published', recent['count'])
+    registry.set('outbox_lag_max_seconds', recent['max_lag'].total_seconds() if recent['max_lag'] else 0)
+    registry.set('outbox_lag_avg_seconds', recent['avg_lag'].total_seconds() if recent['avg_lag'] else 0)
@@ -0,0 +1,64 @@
+"""
+Redis-backed rate limiting shared by all Celery workers.
+"""
+
+import time
+
+from event_registration.redis_client import get_redis_client
+
+
+# Refill the bucket from elapsed server time, then try to take tokens.
+# Returns the number of seconds to wait (as a string, since Lua numbers are
+# truncated to integers on the way out), or "0" if the tokens were taken.
+TOKEN_BUCKET_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local capacity = tonumber(ARGV[2])
+local requested = tonumber(ARGV[3])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or capacity
+local ts = tonumber(state[2]) or now
+tokens = math.min(capacity, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= requested then
+    tokens = tokens - requested
+else
+    wait = (requested - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate) + 1)
+return tostring(wait)
+"""
+
+
+class TokenBucket:
+    """
+    Token bucket rate limiter keyed by name, e.g. an SMTP provider host.
+    
+    State lives in Redis so the limit holds across processes and workers.
+    """
+    
+    def __init__(self, name, rate, capacity=None):
+        self.key = f'ratelimit:{name}'
+        self.rate = float(rate)
+        self.capacity = float(capacity or rate)
+        self._script = get_redis_client().register_script(TOKEN_BUCKET_SCRIPT)
+    
+    def try_acquire(self, tokens=1):
+        """Take tokens if available; return the seconds to wait otherwise."""
+        return float(self._script(
+            keys=[self.key],
+            args=[self.rate, self.capacity, tokens]
+        ))
+    
+    def acquire(self, tokens=1):
+        """Block until the requested tokens are available."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            time.sleep(wait)
@@ -2,9 +2,16 @@
 Serializers for the registrations app.
 """
 
+from django.db import IntegrityError, transaction
 from rest_framework import serializers
+from .bulk import DUPLICATE_MESSAGE
+from .membership import is_registered
+from .outbox import record_registration_emails
 from .models import Registration
-from events.serializers import EventListSerializer
+from events.models import Event
+from events.metadata import get_event
+from events.serializers import CachedEventField, EventListSerializer
+from event_registration.projections import ProjectionSerializer, format_date, format_datetime
 
 
 class RegistrationSerializer(serializers.ModelSerializer):
@@ -14,6 +21,7 @@ class RegistrationSerializer(serializers.ModelSerializer):
     event_date = serializers.DateField(source='event.event_date', read_only=True)
     event_category = serializers.CharField(source='event.get_category_display', read_only=True)
     event_details = EventListSerializer(source='event', read_only=True)
+    event = CachedEventField()
     
     class Meta:
         model = Registration
@@ -29,17 +37,26 @@ class RegistrationSerializer(serializers.ModelSerializer):
         ]
     
     def validate_event(self, value):
-        """Validate that registration is open for the event."""
+        """
+        Validate that registration is open for the event.
+        
+        Capacity is checked when the seat is reserved in ``create``, since
+        the cached event carries no registration count. Updates cannot move
+        a registration to another event: seats and rollups are only
+        adjusted on create and delete.
+        """
+        if self.instance is not None:
+            if value.pk != self.instance.event_id:
+                raise serializers.ValidationError(
+                    "The event of an existing registration cannot be changed."
+                )
+            return value
+        
         if not value.is_registration_open():
             raise serializers.ValidationError(
                 "Registration is not currently open for this event."
             )
         
-        if value.is_full():
-            raise serializers.ValidationError(
-                "This event has reached maximum capacity."
-            )
-        
         return value
     
     def validate(self, data):
@@ -47,14 +64,84 @@ class RegistrationSerializer(serializers.ModelSerializer):
         email = data.get('email')
         event = data.get('event')
         
-        if email and event:
-            # Check for duplicate registration
-            if Registration.objects.filter(email=email, event=event).exists():
-                raise serializers.ValidationError(
-                    "You have already registered for this event. Duplicate registrations are not allowed."
-                )
+        # An update that keeps its email cannot duplicate itself
+        unchanged = self.instance is not None and email == self.instance.email
+        
+        if email and event and not unchanged:
+            # Check for duplicate registration (Redis prefilter, then database)
+            if is_registered(event.pk, email):
+                raise serializers.ValidationError(DUPLICATE_MESSAGE)
         
         return data
+    
+    def create(self, validated_data):
+        """Reserve a seat, create the registration and record its emails in one transaction."""
+        event = validated_data['event']
+        
+        try:
+            with transaction.atomic():
+                if not Event.reserve_seats(event.pk):
+                    raise serializers.ValidationError({
+                        'event': ["This event has reached maximum capacity."]
+                    })
+                
+                registration = Registration(**validated_data)
+                # Tell the post_save handler the seat is already counted
+                registration._seat_reserved = True
+                registration.save()
+                
+                # Emails are published by the outbox relay after commit
+                record_registration_emails([registration])
+        except IntegrityError:
+            # A concurrent signup won the unique_email_event race
+            raise serializers.ValidationError(DUPLICATE_MESSAGE)
+        
+        return registration
+    
+    def update(self, instance, validated_data):
+        """Update the registrant's details; the event stays fixed."""
+        try:
+            with transaction.atomic():
+                return super().update(instance, validated_data)
+        except IntegrityError:
+            # The new email is already registered for this event
+            raise serializers.ValidationError(DUPLICATE_MESSAGE)
+
+
+class RegistrationFieldsSerializer(serializers.Serializer):
+    """Field-format validation for signups, without database checks."""
+    
+    full_name = serializers.CharField(max_length=255, validators=[Registration.text_validator])
+    email = serializers.EmailField()
+    college_name = serializers.CharField(max_length=255, validators=[Registration.text_validator])
+    department = serializers.CharField(max_length=255, validators=[Registration.text_validator])
+    event = serializers.UUIDField()
+
+
+class RegistrationIntakeSerializer(RegistrationFieldsSerializer):
+    """
+    Serializer for queued signups.
+    
+    Validates field formats, the registration window and known duplicates;
+    capacity is enforced when the intake queue is flushed.
+    """
+    
+    def validate_event(self, value):
+        """Validate that registration is open for the event."""
+        event = get_event(value)
+        
+        if event is None or not event.is_registration_open():
+            raise serializers.ValidationError(
+                "Registration is not currently open for this event."
+            )
+        
+        return value
+    
+    def validate(self, data):
+        """Reject known duplicates before they are queued."""
+        if is_registered(data['event'], data['email']):
+            raise serializers.ValidationError(DUPLICATE_MESSAGE)
+        return data
 
 
 class RegistrationListSerializer(serializers.ModelSerializer):
@@ -72,6 +159,28 @@ class RegistrationListSerializer(serializers.ModelSerializer):
         ]
 
 
+class RegistrationListProjection(ProjectionSerializer):
+    """Fast read path equivalent to RegistrationListSerializer."""
+    
+    values_fields = (
+        'id', 'full_name', 'email', 'college_name', 'department',
+        'event__name', 'event__event_date', 'event__category', 'created_at'
+    )
+    
+    def to_representation(self, row):
+        return {
+            'id': str(row['id']),
+            'full_name': row['full_name'],
+            'email': row['email'],
+            'college_name': row['college_name'],
+            'department': row['department'],
+            'event_name': row['event__name'],
+            'event_date': format_date(row['event__event_date']),
+            'event_category': Event.CATEGORY_LABELS.get(row['event__category'], row['event__category']),
+            'created_at': format_datetime(row['created_at']),
+        }
+
+
 class RegistrationStatsSerializer(serializers.Serializer):
     """Serializer for registration statistics."""
     
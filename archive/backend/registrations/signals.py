@@ -0,0 +1,100 @@
+"""
+Signal handlers for the registrations app.
+"""
+
+from collections import Counter
+
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal, receiver
+from events.live import publish_registration_deltas
+from events.models import Event
+from .membership import add_members, remove_member
+from .models import Registration
+from .stats import invalidate_stats_cache, record_registrations
+
+
+# Sent by bulk_register() after bulk_create, which bypasses post_save.
+# Provides: registrations (list of created Registration instances)
+registrations_bulk_created = Signal()
+
+
+@receiver(post_save, sender=Registration)
+def count_registration(sender, instance, created, raw=False, **kwargs):
+    """Keep Event.registration_count in sync for registrations saved directly."""
+    if not created or raw:
+        return
+    
+    # Serializer-created registrations reserve their seat up front
+    if getattr(instance, '_seat_reserved', False):
+        return
+    
+    Event.objects.filter(pk=instance.event_id).update(
+        registration_count=F('registration_count') + 1
+    )
+
+
+@receiver(post_delete, sender=Registration)
+def uncount_registration(sender, instance, **kwargs):
+    """Release the seat held by a deleted registration."""
+    Event.release_seats(instance.event_id)
+
+
+@receiver(post_save, sender=Registration)
+def update_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    """Roll up new registrations and drop cached statistics."""
+    if created and not raw:
+        record_registrations([instance])
+    invalidate_stats_cache()
+
+
+@receiver(post_delete, sender=Registration)
+def update_stats_on_delete(sender, instance, **kwargs):
+    """Remove deleted registrations from rollups and drop cached statistics."""
+    record_registrations([instance], sign=-1)
+    invalidate_stats_cache()
+
+
+@receiver(registrations_bulk_created)
+def update_stats_on_bulk_create(sender, registrations, **kwargs):
+    """Roll up bulk-created registrations and drop cached statistics."""
+    record_registrations(registrations)
+    invalidate_stats_cache()
+
+
+@receiver(post_save, sender=Registration)
+def add_to_membership_filter(sender, instance, created, raw=False, **kwargs):
+    """Mark new registrations in the duplicate prefilter."""
+    if created and not raw:
+        add_members([instance])
+
+
+@receiver(post_delete, sender=Registration)
+def remove_from_membership_filter(sender, instance, **kwargs):
+    """Drop deleted registrations from the confirmed-duplicate set."""
+    remove_member(instance)
+
+
+@receiver(registrations_bulk_created)
+def add_bulk_to_membership_filter(sender, registrations, **kwargs):
+    """Mark bulk-created registrations in the duplicate prefilter."""
+    add_members(registrations)
+
+
+@receiver(post_save, sender=Registration)
+def publish_live_count_on_save(sender, instance, created, raw=False, **kwargs):
+    """Announce the new registration count to live subscribers."""
+    if created and not raw:
+        publish_registration_deltas({instance.event_id: 1})
+
+
+@receiver(post_delete, sender=Registration)
+def publish_live_count_on_delete(sender, instance, **kwargs):
+    """Announce the released seat to live subscribers."""
+    publish_registration_deltas({instance.event_id: -1})
+
+
+@receiver(registrations_bulk_created)
+def publish_live_counts_on_bulk_create(sender, registrations, **kwargs):
+    """Announce bulk-created registrations to live subscribers."""
+    publish_registration_deltas(Counter(registration.event_id for registration in registrations))
@@ -0,0 +1,199 @@
+"""
+Registration statistics with result caching and optional daily rollups.
+"""
+
+import logging
+from collections import Counter
+from datetime import timedelta
+
+import redis
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+from .models import Registration, RegistrationDailyRollup
+
+
+logger = logging.getLogger(__name__)
+
+STATS_CACHE_KEY = 'registrations:stats:v1'
+
+
+def invalidate_stats_cache():
+    """
+    Drop cached statistics after registrations change.
+    
+    The delete waits for the surrounding transaction to commit, so a
+    concurrent stats request cannot re-cache pre-commit numbers and a
+    cache outage never rolls back the write.
+    """
+    transaction.on_commit(_delete_stats_cache)
+
+
+def _delete_stats_cache():
+    try:
+        cache.delete(STATS_CACHE_KEY)
+    except redis.RedisError:
+        # Stale stats expire after REGISTRATION_STATS_CACHE_TIMEOUT
+        logger.warning("Could not invalidate the registration stats cache", exc_info=True)
+
+
+def get_cached_stats(compute):
+    """Return cached statistics, computing and storing them on a miss."""
+    try:
+        return cache.get_or_set(
+            STATS_CACHE_KEY,
+            compute,
+            settings.REGISTRATION_STATS_CACHE_TIMEOUT
+        )
+    except redis.RedisError:
+        logger.warning("Registration stats cache unavailable; computing stats", exc_info=True)
+        return compute()
+
+
+def rollups_enabled():
+    """Return True when stats are served from the daily rollup table."""
+    return settings.REGISTRATION_STATS_USE_ROLLUP
+
+
+def apply_rollup_deltas(deltas):
+    """
+    Add per (date, event_id) deltas to the daily rollup table.
+    
+    Args:
+        deltas: Mapping of (date, event_id) to a signed count
+    """
+    for (date, event_id), delta in deltas.items():
+        if not delta:
+            continue
+        
+        rollup = RegistrationDailyRollup.objects.filter(date=date, event_id=event_id)
+        if rollup.update(count=F('count') + delta):
+            continue
+        
+        try:
+            with transaction.atomic():
+                RegistrationDailyRollup.objects.create(
+                    date=date, event_id=event_id, count=delta
+                )
+        except IntegrityError:
+            # Another writer created the row first
+            rollup.update(count=F('count') + delta)
+
+
+def record_registrations(registrations, sign=1):
+    """Update rollups for created (sign=1) or deleted (sign=-1) registrations."""
+    if not rollups_enabled():
+        return
+    
+    deltas = Counter()
+    for registration in registrations:
+        key = (timezone.localdate(registration.created_at), registration.event_id)
+        deltas[key] += sign
+    apply_rollup_deltas(deltas)
+
+
+def rebuild_rollups():
+    """Recompute the daily rollup table from the registrations table."""
+    counts = Counter()
+    rows = Registration.objects.order_by().values_list(
+        'created_at', 'event_id'
+    ).iterator(chunk_size=5000)
+    for created_at, event_id in rows:
+        counts[(timezone.localdate(created_at), event_id)] += 1
+    
+    with transaction.atomic():
+        RegistrationDailyRollup.objects.all().delete()
+        RegistrationDailyRollup.objects.bulk_create(
+            [
+                RegistrationDailyRollup(date=date, event_id=event_id, count=count)
+                for (date, event_id), count in counts.items()
+            ],
+            batch_size=1000
+        )
+    
+    return len(counts)
+
+
+def _live_counts(queryset):
+    """Compute window counts with one conditional-aggregate query."""
+    now = timezone.now()
+    
+    counts = queryset.order_by().aggregate(
+        total=Count('id'),
+        today=Count('id', filter=Q(created_at__date=timezone.localdate(now))),
+        week=Count('id', filter=Q(created_at__gte=now - timedelta(days=7))),
+        month=Count('id', filter=Q(created_at__gte=now - timedelta(days=30))),
+    )
+    
+    by_category = {
+        row['event__category']: row['count']
+        for row in queryset.order_by().values('event__category').annotate(count=Count('id'))
+    }
+    
+    by_event = list(
+        queryset.order_by().values('event__name', 'event__event_date')
+        .annotate(count=Count('id'))
+        .order_by('-count')[:10]
+    )
+    
+    return counts, by_category, by_event
+
+
+def _rollup_counts():
+    """
+    Compute window counts from the daily rollup table.
+    
+    Windows are whole local days: the week and month cover the last 7 and
+    30 days including today.
+    """
+    today = timezone.localdate()
+    rollups = RegistrationDailyRollup.objects.order_by()
+    
+    counts = rollups.aggregate(
+        total=Sum('count'),
+        today=Sum('count', filter=Q(date=today)),
+        week=Sum('count', filter=Q(date__gt=today - timedelta(days=7))),
+        month=Sum('count', filter=Q(date__gt=today - timedelta(days=30))),
+    )
+    counts = {key: value or 0 for key, value in counts.items()}
+    
+    by_category = {
+        row['event__category']: row['count']
+        for row in rollups.values('event__category').annotate(count=Sum('count'))
+        if row['count']
+    }
+    
+    by_event = list(
+        rollups.values('event__name', 'event__event_date')
+        .annotate(count=Sum('count'))
+        .filter(count__gt=0)
+        .order_by('-count')[:10]
+    )
+    
+    return counts, by_category, by_event
+
+
+def compute_registration_stats(queryset):
+    """
+    Build the data for RegistrationStatsSerializer.
+    
+    Args:
+        queryset: Registrations to report on (used for live counts and
+            recent registrations)
+    """
+    if rollups_enabled():
+        counts, by_category, by_event = _rollup_counts()
+    else:
+        counts, by_category, by_event = _live_counts(queryset)
+    
+    return {
+        'total_registrations': counts['total'],
+        'registrations_today': counts['today'],
+        'registrations_this_week': counts['week'],
+        'registrations_this_month': counts['month'],
+        'by_category': by_category,
+        'by_event': by_event,
+        'recent_registrations': queryset.order_by('-created_at')[:10],
+    }
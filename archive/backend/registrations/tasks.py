@@ -2,28 +2,38 @@
 Celery tasks for the registrations app.
 """
 
-from celery import shared_task
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
+import logging
+import os
+import socket
+import time
+import uuid
+from datetime import timedelta
+from functools import lru_cache
+
+from celery import chord, shared_task
+from django.db import transaction
+from django.core.mail import EmailMessage, EmailMultiAlternatives, get_connection
+from django.db.models import Count, F, Max, Min, Q
+from django.template.loader import get_template
 from django.conf import settings
-from .models import Registration
+from django.utils import timezone
+from .exports import iter_export_rows, stream_csv
+from .models import NotificationDelivery, Registration
+from .ratelimit import TokenBucket
 
 
-@shared_task
-def send_registration_emails(registration_id):
-    """
-    Send confirmation email to user and notification to admin.
-    
-    Args:
-        registration_id: UUID of the registration
-    """
-    try:
-        registration = Registration.objects.select_related('event').get(id=registration_id)
-    except Registration.DoesNotExist:
-        return f"Registration {registration_id} not found"
-    
-    # Prepare context for email templates
-    context = {
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=None)
+def get_email_template(template_name):
+    """Return a compiled email template, loading it once per process."""
+    return get_template(template_name)
+
+
+def get_email_context(registration):
+    """Build the template context for a registration's emails."""
+    return {
         'full_name': registration.full_name,
         'email': registration.email,
         'college_name': registration.college_name,
@@ -33,77 +43,476 @@ def send_registration_emails(registration_id):
         'event_date': registration.event.event_date,
         'registration_date': registration.created_at,
     }
+
+
+def build_html_message(subject, template_name, context, recipient_list, connection):
+    """Build an HTML email message rendered from a cached template."""
+    message = EmailMultiAlternatives(
+        subject=subject,
+        body='',  # Plain text version
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=recipient_list,
+        connection=connection,
+    )
+    message.attach_alternative(
+        get_email_template(template_name).render(context),
+        'text/html'
+    )
+    return message
+
+
+@shared_task
+def send_registration_emails(registration_id):
+    """
+    Send confirmation email to user and notification to admin.
     
-    # Send confirmation email to user
-    user_subject = f'Event Registration Confirmation - {registration.event.name}'
-    user_message = render_to_string('emails/user_confirmation.html', context)
+    Args:
+        registration_id: UUID of the registration
+    """
+    return send_registration_email_batch([registration_id])
+
+
+def pending_registration_emails():
+    """Return a Q matching registrations that still have emails to send."""
+    pending = Q(confirmation_email_sent=False)
+    # In digest mode admin notifications are left to send_admin_digest
+    if settings.ADMIN_NOTIFICATION_MODE != 'digest':
+        pending |= Q(admin_notification_sent=False)
+    return pending
+
+
+def claim_registration_emails(registration_ids):
+    """
+    Claim the pending emails of the given registrations for this sender.
     
-    try:
-        send_mail(
-            subject=user_subject,
-            message='',  # Plain text version
-            html_message=user_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[registration.email],
-            fail_silently=False,
+    Rows claimed by another sender, or that exhausted
+    REGISTRATION_EMAIL_MAX_ATTEMPTS, are skipped.
+    
+    Returns:
+        Claimed registrations with their events.
+    """
+    now = timezone.now()
+    
+    with transaction.atomic():
+        claimed_ids = list(
+            Registration.objects.select_for_update(skip_locked=True).filter(
+                pending_registration_emails(),
+                Q(email_claimed_until__isnull=True) | Q(email_claimed_until__lt=now),
+                id__in=registration_ids,
+                email_attempts__lt=settings.REGISTRATION_EMAIL_MAX_ATTEMPTS
+            ).values_list('id', flat=True)
         )
-        registration.confirmation_email_sent = True
-        registration.save(update_fields=['confirmation_email_sent'])
-    except Exception as e:
-        print(f"Error sending user confirmation email: {e}")
+        if claimed_ids:
+            Registration.objects.filter(pk__in=claimed_ids).update(
+                email_claimed_until=now + timedelta(seconds=settings.REGISTRATION_EMAIL_CLAIM_SECONDS),
+                email_attempts=F('email_attempts') + 1
+            )
+    
+    return list(Registration.objects.select_related('event').filter(pk__in=claimed_ids))
+
+
+@shared_task
+def send_registration_email_batch(registration_ids):
+    """
+    Send pending confirmation and admin emails for many registrations.
+    
+    The registrations are claimed first so overlapping runs never send the
+    same email twice. All messages go over a single SMTP connection and
+    the sent flags are written with one UPDATE per flag when the batch
+    ends.
+    
+    Args:
+        registration_ids: UUIDs of the registrations
+    """
+    notify_admin = settings.ADMIN_NOTIFICATION_MODE != 'digest'
+    registrations = claim_registration_emails(registration_ids)
+    
+    if not registrations:
+        return "No pending emails for the given registrations"
     
-    # Send notification email to admin
-    admin_subject = f'New Event Registration - {registration.event.name}'
-    admin_message = render_to_string('emails/admin_notification.html', context)
+    started = time.monotonic()
+    confirmed = []
+    notified = []
+    connection = get_connection(fail_silently=False)
     
     try:
-        send_mail(
-            subject=admin_subject,
-            message='',  # Plain text version
-            html_message=admin_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[settings.ADMIN_EMAIL],
-            fail_silently=False,
-        )
-        registration.admin_notification_sent = True
-        registration.save(update_fields=['admin_notification_sent'])
+        connection.open()
     except Exception as e:
-        print(f"Error sending admin notification email: {e}")
+        logger.error("Could not open email connection: %s", e)
+        release_registration_emails(registrations)
+        return f"Error opening email connection: {e}"
+    
+    try:
+        for registration in registrations:
+            context = get_email_context(registration)
+            
+            # Send confirmation email to user
+            if not registration.confirmation_email_sent:
+                message = build_html_message(
+                    f'Event Registration Confirmation - {registration.event.name}',
+                    'emails/user_confirmation.html',
+                    context,
+                    [registration.email],
+                    connection
+                )
+                try:
+                    connection.send_messages([message])
+                    confirmed.append(registration.pk)
+                except Exception as e:
+                    logger.error("Error sending user confirmation email: %s", e)
+            
+            # Send notification email to admin
+            if notify_admin and not registration.admin_notification_sent:
+                message = build_html_message(
+                    f'New Event Registration - {registration.event.name}',
+                    'emails/admin_notification.html',
+                    context,
+                    [settings.ADMIN_EMAIL],
+                    connection
+                )
+                try:
+                    connection.send_messages([message])
+                    notified.append(registration.pk)
+                except Exception as e:
+                    logger.error("Error sending admin notification email: %s", e)
+    finally:
+        connection.close()
+        if confirmed:
+            Registration.objects.filter(pk__in=confirmed).update(confirmation_email_sent=True)
+        if notified:
+            Registration.objects.filter(pk__in=notified).update(admin_notification_sent=True)
+        release_registration_emails(registrations)
+    
+    sent = len(confirmed) + len(notified)
+    elapsed = time.monotonic() - started
+    logger.info(
+        "Sent %d emails for %d registrations in %.2fs (%.1f emails/s)",
+        sent, len(registrations), elapsed, sent / elapsed if elapsed else 0
+    )
+    return f"Sent {sent} emails for {len(registrations)} registrations in {elapsed:.2f}s"
+
+
+def release_registration_emails(registrations):
+    """Release claims so failed emails are retried by a later run."""
+    Registration.objects.filter(pk__in=[registration.pk for registration in registrations]).update(
+        email_claimed_until=None
+    )
+    
+    exhausted = Registration.objects.filter(
+        pending_registration_emails(),
+        pk__in=[registration.pk for registration in registrations],
+        email_attempts__gte=settings.REGISTRATION_EMAIL_MAX_ATTEMPTS
+    ).values_list('pk', flat=True)
+    for registration_id in exhausted:
+        logger.error(
+            "Giving up on emails for registration %s after %d attempts",
+            registration_id, settings.REGISTRATION_EMAIL_MAX_ATTEMPTS
+        )
+
+
+@shared_task
+def dispatch_pending_registration_emails(batch_size=None):
+    """
+    Coalesce registrations with unsent emails into batched sends.
+    
+    Registrations claimed by another run, or that exhausted their attempts,
+    are skipped so they never hold back newer ones.
+    
+    Args:
+        batch_size: Maximum registrations handled per run
+    """
+    batch_size = batch_size or settings.REGISTRATION_EMAIL_BATCH_SIZE
+    pending_ids = list(
+        Registration.objects.filter(
+            pending_registration_emails(),
+            Q(email_claimed_until__isnull=True) | Q(email_claimed_until__lt=timezone.now()),
+            email_attempts__lt=settings.REGISTRATION_EMAIL_MAX_ATTEMPTS
+        ).order_by('created_at').values_list('id', flat=True)[:batch_size]
+    )
+    
+    if not pending_ids:
+        return "No pending registration emails"
+    
+    return send_registration_email_batch(pending_ids)
+
+
+@shared_task
+def send_admin_digest():
+    """
+    Send one summary email per event for registrations not yet reported.
+    
+    Each digest carries the new registrations as a CSV attachment. Events
+    below ADMIN_DIGEST_MIN_REGISTRATIONS wait for the next run unless their
+    oldest unreported registration exceeds ADMIN_DIGEST_MAX_WAIT_MINUTES.
+    """
+    from events.models import Event
+    
+    pending = Registration.objects.filter(admin_notification_sent=False)
+    max_wait_cutoff = timezone.now() - timedelta(minutes=settings.ADMIN_DIGEST_MAX_WAIT_MINUTES)
     
-    return f"Emails sent for registration {registration_id}"
+    due_events = [
+        summary['event_id']
+        for summary in pending.order_by().values('event_id').annotate(
+            count=Count('id'),
+            oldest=Min('created_at')
+        )
+        if summary['count'] >= settings.ADMIN_DIGEST_MIN_REGISTRATIONS
+        or summary['oldest'] <= max_wait_cutoff
+    ]
+    
+    if not due_events:
+        return "No admin digests due"
+    
+    connection = get_connection(fail_silently=False)
+    digests = 0
+    reported = 0
+    
+    with connection:
+        for event in Event.objects.filter(pk__in=due_events):
+            while True:
+                registration_ids = list(
+                    pending.filter(event=event).order_by('created_at')
+                    .values_list('id', flat=True)[:settings.ADMIN_DIGEST_MAX_ROWS]
+                )
+                if not registration_ids:
+                    break
+                
+                batch = Registration.objects.filter(pk__in=registration_ids).order_by('created_at')
+                window = batch.aggregate(first=Min('created_at'), last=Max('created_at'))
+                context = {
+                    'event_name': event.name,
+                    'event_category': event.get_category_display(),
+                    'event_date': event.event_date,
+                    'registration_count': len(registration_ids),
+                    'first_registration': window['first'],
+                    'last_registration': window['last'],
+                    'total_registrations': event.get_registration_count(),
+                }
+                
+                message = build_html_message(
+                    f'Registration Digest - {event.name} ({len(registration_ids)} new)',
+                    'emails/admin_digest.html',
+                    context,
+                    [settings.ADMIN_EMAIL],
+                    connection
+                )
+                message.attach(
+                    f'registrations_{event.pk}_{timezone.now().strftime("%Y%m%d%H%M")}.csv',
+                    ''.join(stream_csv(iter_export_rows(batch))),
+                    'text/csv'
+                )
+                
+                try:
+                    connection.send_messages([message])
+                except Exception as e:
+                    logger.error("Error sending admin digest for event %s: %s", event.pk, e)
+                    break
+                
+                Registration.objects.filter(pk__in=registration_ids).update(
+                    admin_notification_sent=True
+                )
+                digests += 1
+                reported += len(registration_ids)
+    
+    return f"Sent {digests} admin digests covering {reported} registrations"
+
+
+def get_email_rate_limiter():
+    """Return the token bucket for the configured SMTP provider."""
+    return TokenBucket(
+        f'email:{settings.EMAIL_HOST}',
+        rate=settings.EMAIL_RATE_LIMIT_PER_SECOND,
+        capacity=settings.EMAIL_RATE_LIMIT_BURST
+    )
 
 
 @shared_task
-def send_bulk_notification(event_id, subject, message):
+def send_bulk_notification(event_id, subject, message, notification_key=None):
     """
     Send bulk notification to all registrants of an event.
     
+    Recipients are streamed from the database and split into chunks that
+    are sent by parallel subtasks, one message per recipient so addresses
+    are never disclosed to each other. Each dispatch is a new notification
+    run, so the same message can be sent again later; passing the key of
+    an earlier run resumes it, skipping recipients already delivered.
+    
     Args:
         event_id: UUID of the event
         subject: Email subject
         message: Email message
+        notification_key: Key of an earlier run to resume (optional)
     """
     from events.models import Event
     
-    try:
-        event = Event.objects.get(id=event_id)
-    except Event.DoesNotExist:
+    if not Event.objects.filter(id=event_id).exists():
         return f"Event {event_id} not found"
     
-    registrations = event.registrations.all()
-    recipient_list = [reg.email for reg in registrations]
+    notification_key = notification_key or uuid.uuid4().hex
+    chunk_size = settings.BULK_NOTIFICATION_CHUNK_SIZE
+    emails = Registration.objects.filter(event_id=event_id).order_by().values_list(
+        'email', flat=True
+    ).iterator(chunk_size=chunk_size)
+    
+    subtasks = []
+    chunk = []
+    for email in emails:
+        chunk.append(email)
+        if len(chunk) >= chunk_size:
+            subtasks.append(send_bulk_notification_chunk.s(
+                notification_key, str(event_id), subject, message, chunk
+            ))
+            chunk = []
+    if chunk:
+        subtasks.append(send_bulk_notification_chunk.s(
+            notification_key, str(event_id), subject, message, chunk
+        ))
     
-    if not recipient_list:
+    if not subtasks:
         return f"No registrations found for event {event_id}"
     
-    try:
-        send_mail(
-            subject=subject,
-            message=message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=recipient_list,
-            fail_silently=False,
+    chord(subtasks)(summarize_bulk_notification.s(notification_key))
+    return f"Bulk notification {notification_key} dispatched in {len(subtasks)} chunks"
+
+
+@shared_task
+def send_bulk_notification_chunk(notification_key, event_id, subject, message, emails):
+    """
+    Send a bulk notification to one chunk of recipients over one connection.
+    
+    Args:
+        notification_key: Key identifying the notification run
+        event_id: UUID of the event
+        subject: Email subject
+        message: Email message
+        emails: Recipient email addresses in this chunk
+    """
+    previous = {
+        delivery.email: delivery
+        for delivery in NotificationDelivery.objects.filter(
+            notification_key=notification_key,
+            email__in=emails
         )
-        return f"Bulk email sent to {len(recipient_list)} recipients"
-    except Exception as e:
-        return f"Error sending bulk email: {e}"
+    }
+    recipients = [
+        email for email in emails
+        if email not in previous or previous[email].status != NotificationDelivery.STATUS_SENT
+    ]
+    
+    if not recipients:
+        return {'sent': 0, 'failed': 0, 'skipped': len(emails)}
+    
+    # Record recipients before sending; each row is updated as its message
+    # goes out, so a retried chunk skips everyone already delivered
+    NotificationDelivery.objects.bulk_create(
+        [
+            NotificationDelivery(notification_key=notification_key, event_id=event_id, email=email)
+            for email in recipients if email not in previous
+        ],
+        ignore_conflicts=True
+    )
+    
+    limiter = get_email_rate_limiter()
+    connection = get_connection(fail_silently=False)
+    sent = 0
+    
+    with connection:
+        for email in recipients:
+            limiter.acquire()
+            
+            try:
+                connection.send_messages([EmailMessage(
+                    subject=subject,
+                    body=message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[email],
+                    connection=connection,
+                )])
+                outcome = {
+                    'status': NotificationDelivery.STATUS_SENT,
+                    'sent_at': timezone.now(),
+                    'error': '',
+                }
+                sent += 1
+            except Exception as e:
+                logger.error("Error sending bulk notification to %s: %s", email, e)
+                outcome = {'status': NotificationDelivery.STATUS_FAILED, 'error': str(e)}
+            
+            NotificationDelivery.objects.filter(
+                notification_key=notification_key,
+                email=email
+            ).update(attempts=F('attempts') + 1, updated_at=timezone.now(), **outcome)
+    
+    return {
+        'sent': sent,
+        'failed': len(recipients) - sent,
+        'skipped': len(emails) - len(recipients),
+    }
+
+
+@shared_task
+def summarize_bulk_notification(results, notification_key):
+    """
+    Summarize a bulk notification once all chunks have finished.
+    
+    Args:
+        results: Per-chunk results from send_bulk_notification_chunk
+        notification_key: Key identifying the notification run
+    """
+    totals = {'sent': 0, 'failed': 0, 'skipped': 0}
+    for result in results:
+        for key in totals:
+            totals[key] += result.get(key, 0)
+    
+    logger.info("Bulk notification %s finished: %s", notification_key, totals)
+    return (
+        f"Bulk email sent to {totals['sent']} recipients "
+        f"({totals['failed']} failed, {totals['skipped']} already delivered)"
+    )
+
+
+@shared_task
+def relay_registration_outbox(max_batches=20):
+    """
+    Publish committed outbox rows to Celery in batches, then prune old ones.
+    
+    Args:
+        max_batches: Upper bound on batches relayed per run
+    """
+    from .outbox import prune_outbox, relay_outbox
+    
+    total = 0
+    for _ in range(max_batches):
+        published = relay_outbox()
+        if not published:
+            break
+        total += published
+    
+    pruned = prune_outbox()
+    return f"Outbox relayed: {total} rows, pruned: {pruned} rows"
+
+
+@shared_task
+def flush_registration_intake(max_batches=20):
+    """
+    Drain queued signups into the registrations table in batches.
+    
+    Args:
+        max_batches: Upper bound on batches flushed per run
+    """
+    from .intake import flush_intake
+    
+    consumer = f"flush-{socket.gethostname()}-{os.getpid()}"
+    total_created = 0
+    total_rejected = 0
+    
+    for _ in range(max_batches):
+        created, rejected = flush_intake(consumer)
+        if not created and not rejected:
+            break
+        
+        # Emails for created registrations were recorded in the outbox
+        total_created += len(created)
+        total_rejected += rejected
+    
+    return f"Intake flushed: {total_created} created, {total_rejected} rejected"
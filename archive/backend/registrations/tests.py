@@ -0,0 +1,265 @@
+"""
+Tests for the registrations app.
+"""
+
+import json
+from datetime import timedelta
+from unittest import mock
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core import mail
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import AsyncRequestFactory, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework.views import APIView
+from events.models import Event
+from . import tasks
+from .async_views import registration_list
+from .models import Registration
+from .serializers import RegistrationSerializer
+
+
+@mock.patch.object(APIView, 'throttle_classes', ())
+class AsyncRegistrationCreateTests(TestCase):
+    """JSON signups served by the async registration view."""
+    
+    def setUp(self):
+        now = timezone.now()
+        self.event = Event.objects.create(
+            name='Replica Workshop',
+            category='online_workshop',
+            event_date=(now + timedelta(days=30)).date(),
+            registration_start_date=now - timedelta(days=1),
+            registration_end_date=now + timedelta(days=10),
+        )
+    
+    def signup(self):
+        request = AsyncRequestFactory().post(
+            '/api/registrations/',
+            data=json.dumps({
+                'full_name': 'Ada Lovelace',
+                'email': 'ada@example.com',
+                'college_name': 'Analytical College',
+                'department': 'Mathematics',
+                'event': str(self.event.pk),
+            }),
+            content_type='application/json'
+        )
+        return registration_list(request)
+    
+    @mock.patch('registrations.async_views.replica_enabled', return_value=True)
+    async def test_create_pins_client_to_primary(self, replica_enabled):
+        response = await self.signup()
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await Registration.objects.filter(email='ada@example.com').aexists())
+        self.assertIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+    
+    @mock.patch('registrations.async_views.replica_enabled', return_value=False)
+    async def test_create_without_replica_sets_no_cookie(self, replica_enabled):
+        response = await self.signup()
+        
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn(settings.REPLICA_STICKY_COOKIE, response.cookies)
+
+
+@override_settings(REGISTRATION_EMAIL_MODE='batched', ADMIN_NOTIFICATION_MODE='immediate')
+class RegistrationEmailDispatchTests(TestCase):
+    """Batched dispatch of confirmation and admin emails."""
+    
+    def setUp(self):
+        now = timezone.now()
+        event = Event.objects.create(
+            name='Batch Workshop',
+            category='online_workshop',
+            event_date=(now + timedelta(days=30)).date(),
+            registration_start_date=now - timedelta(days=1),
+            registration_end_date=now + timedelta(days=10),
+        )
+        self.registration = Registration.objects.create(
+            full_name='Grace Hopper',
+            email='grace@example.com',
+            college_name='Naval College',
+            department='Mathematics',
+            event=event,
+        )
+    
+    def test_retries_admin_notification_after_confirmation_was_sent(self):
+        Registration.objects.filter(pk=self.registration.pk).update(confirmation_email_sent=True)
+        
+        tasks.dispatch_pending_registration_emails()
+        
+        self.assertEqual([message.to for message in mail.outbox], [[settings.ADMIN_EMAIL]])
+        self.registration.refresh_from_db()
+        self.assertTrue(self.registration.admin_notification_sent)
+    
+    def test_sent_registrations_are_not_dispatched_again(self):
+        tasks.dispatch_pending_registration_emails()
+        tasks.dispatch_pending_registration_emails()
+        
+        self.assertEqual(len(mail.outbox), 2)
+
+
+class RegistrationUpdateTests(TestCase):
+    """Updates keep a registration on its event."""
+    
+    def setUp(self):
+        now = timezone.now()
+        self.event, self.other_event = Event.objects.bulk_create([
+            Event(
+                name=name,
+                category='conference',
+                event_date=(now + timedelta(days=30)).date(),
+                registration_start_date=now - timedelta(days=1),
+                registration_end_date=now + timedelta(days=10),
+                max_participants=1,
+            )
+            for name in ('Original Event', 'Other Event')
+        ])
+        self.registration = Registration.objects.create(
+            full_name='Alan Turing',
+            email='alan@example.com',
+            college_name='Kings College',
+            department='Mathematics',
+            event=self.event,
+        )
+    
+    def test_moving_to_another_event_is_rejected(self):
+        serializer = RegistrationSerializer(
+            self.registration,
+            data={'event': str(self.other_event.pk)},
+            partial=True
+        )
+        
+        self.assertFalse(serializer.is_valid())
+        self.assertIn('event', serializer.errors)
+    
+    def test_update_on_the_same_event_keeps_the_counts(self):
+        serializer = RegistrationSerializer(
+            self.registration,
+            data={
+                'full_name': 'Alan M Turing',
+                'email': 'alan@example.com',
+                'college_name': 'Kings College',
+                'department': 'Mathematics',
+                'event': str(self.event.pk),
+            }
+        )
+        
+        self.assertTrue(serializer.is_valid(), serializer.errors)
+        serializer.save()
+        
+        self.event.refresh_from_db()
+        self.other_event.refresh_from_db()
+        self.assertEqual((self.event.registration_count, self.other_event.registration_count), (1, 0))
+
+
+@mock.patch.object(APIView, 'throttle_classes', ())
+class RegistrationImportTests(TestCase):
+    """Bulk imports report malformed rows instead of failing."""
+    
+    def setUp(self):
+        now = timezone.now()
+        self.event = Event.objects.create(
+            name='Import Event',
+            category='conference',
+            event_date=(now + timedelta(days=30)).date(),
+            registration_start_date=now - timedelta(days=1),
+            registration_end_date=now + timedelta(days=10),
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_user('importer', password='secret', is_staff=True)
+        )
+    
+    def upload(self, content, name='registrations.ndjson'):
+        return self.client.post(
+            '/api/registrations/import/',
+            {'file': SimpleUploadedFile(name, content)},
+            format='multipart',
+            HTTP_ACCEPT='application/json'
+        )
+    
+    def test_non_string_values_are_reported_per_row(self):
+        valid = {
+            'full_name': 'Grace Hopper',
+            'email': 'grace@example.com',
+            'college_name': 'Yale',
+            'department': 'Mathematics',
+            'event': str(self.event.pk),
+        }
+        rows = [
+            valid,
+            {**valid, 'email': 42, 'full_name': ['Ada']},
+            {**valid, 'email': 'ada@example.com', 'department': {'name': 'Physics'}},
+        ]
+        
+        response = self.upload('\n'.join(json.dumps(row) for row in rows).encode())
+        
+        self.assertEqual(response.status_code, 200, response.content)
+        body = response.json()
+        self.assertEqual(body['created'], 1)
+        self.assertEqual([entry['row'] for entry in body['errors']], [2, 3])
+        self.assertEqual(set(body['errors'][0]['errors']), {'email', 'full_name'})
+        self.assertEqual(set(body['errors'][1]['errors']), {'department'})
+    
+    def test_invalid_utf8_is_rejected_before_importing(self):
+        content = (
+            'full_name,email,college_name,department,event\n'
+            f'Grace Hopper,grace@example.com,Yale,Mathematics,{self.event.pk}\n'
+        ).encode() + b'Caf\xe9,cafe@example.com,Yale,Mathematics,x\n'
+        
+        response = self.upload(content, name='registrations.csv')
+        
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Registration.objects.exists())
+
+
+@mock.patch.object(tasks, 'get_email_rate_limiter', mock.Mock())
+class BulkNotificationTests(TestCase):
+    """Bulk notifications are keyed by run, not by their content."""
+    
+    def setUp(self):
+        now = timezone.now()
+        self.event = Event.objects.create(
+            name='Notified Event',
+            category='conference',
+            event_date=(now + timedelta(days=30)).date(),
+            registration_start_date=now - timedelta(days=1),
+            registration_end_date=now + timedelta(days=10),
+        )
+        Registration.objects.bulk_create([
+            Registration(
+                full_name=f'Attendee {index}',
+                email=f'attendee{index}@example.com',
+                college_name='College',
+                department='Physics',
+                event=self.event,
+            )
+            for index in range(3)
+        ])
+    
+    def notify(self, notification_key=None):
+        """Dispatch a notification and run its chunks inline; return the run key."""
+        with mock.patch.object(tasks, 'chord') as chord:
+            tasks.send_bulk_notification(self.event.pk, 'Venue change', 'Hall B', notification_key)
+        
+        subtasks = chord.call_args.args[0]
+        for subtask in subtasks:
+            subtask.apply()
+        return subtasks[0].args[0]
+    
+    def test_identical_notifications_are_sent_again(self):
+        first = self.notify()
+        second = self.notify()
+        
+        self.assertNotEqual(first, second)
+        self.assertEqual(len(mail.outbox), 6)
+    
+    def test_resuming_a_run_skips_delivered_recipients(self):
+        key = self.notify()
+        self.notify(key)
+        
+        self.assertEqual(len(mail.outbox), 3)
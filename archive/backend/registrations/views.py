@@ -2,27 +2,40 @@
 Views for the registrations app.
 """
 
-import csv
-from datetime import datetime, timedelta
-from django.http import HttpResponse
-from django.utils import timezone
-from django.db.models import Count, Q
+from datetime import datetime
+from django.conf import settings
+from django.http import StreamingHttpResponse
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.parsers import MultiPartParser
+from rest_framework.reverse import reverse
 from rest_framework.permissions import IsAuthenticated, IsAdminUser, AllowAny
 from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import SearchFilter, OrderingFilter
+from rest_framework.filters import OrderingFilter
 from .models import Registration
+from .intake import enqueue_registration, get_intake_status, is_intake_enabled
+from .stats import compute_registration_stats, get_cached_stats
 from .serializers import (
     RegistrationSerializer,
+    RegistrationIntakeSerializer,
     RegistrationListSerializer,
+    RegistrationListProjection,
     RegistrationStatsSerializer
 )
-from .tasks import send_registration_emails
+from event_registration.search import FullTextSearchFilter
+from event_registration.pagination import RegistrationCursorPagination
+from event_registration.routers import ReplicaReadMixin
+from .exports import (
+    EXPORT_ENCODERS,
+    EXPORT_FORMATS,
+    gzip_stream,
+    iter_export_rows
+)
+from .importers import IMPORT_FORMATS, import_registrations, is_valid_utf8, iter_import_rows
 
 
-class RegistrationViewSet(viewsets.ModelViewSet):
+class RegistrationViewSet(ReplicaReadMixin, viewsets.ModelViewSet):
     """
     ViewSet for Registration model.
     
@@ -30,43 +43,123 @@ class RegistrationViewSet(viewsets.ModelViewSet):
     """
     
     queryset = Registration.objects.select_related('event').all()
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [DjangoFilterBackend, FullTextSearchFilter, OrderingFilter]
     filterset_fields = ['event', 'email', 'created_at']
     search_fields = ['full_name', 'email', 'college_name', 'department']
     ordering_fields = ['created_at', 'full_name']
-    ordering = ['-created_at']
+    ordering = ['-created_at', '-id']
+    pagination_class = RegistrationCursorPagination
+    
+    # Read-only actions served from the read replica, when configured
+    replica_actions = ('stats', 'export')
+    
+    # Actions served by dict-based projection serializers
+    projection_classes = {
+        'list': RegistrationListProjection,
+    }
+    
+    def get_projection_class(self):
+        """Return the projection serializer for this action, if enabled."""
+        if not settings.USE_PROJECTION_SERIALIZERS or getattr(self, 'swagger_fake_view', False):
+            return None
+        return self.projection_classes.get(self.action)
+    
+    def get_queryset(self):
+        """Return registrations, projected to plain rows for projection actions."""
+        queryset = super().get_queryset()
+        projection_class = self.get_projection_class()
+        if projection_class is not None:
+            ordering = OrderingFilter().get_ordering(self.request, queryset, self)
+            queryset = projection_class.project(queryset, ordering)
+        return queryset
     
     def get_serializer_class(self):
         """Return appropriate serializer class."""
+        projection_class = self.get_projection_class()
+        if projection_class is not None:
+            return projection_class
         if self.action == 'list':
             return RegistrationListSerializer
         return RegistrationSerializer
     
     def get_permissions(self):
         """Set permissions based on action."""
-        if self.action == 'create':
+        if self.action in ['create', 'intake_status']:
             return [AllowAny()]
-        elif self.action in ['list', 'export', 'stats']:
+        elif self.action in ['list', 'export', 'stats', 'import_registrations']:
             return [IsAdminUser()]
         return [IsAuthenticated()]
     
+    def create(self, request, *args, **kwargs):
+        """Create a registration, or queue it when intake mode is enabled."""
+        if not is_intake_enabled():
+            return super().create(request, *args, **kwargs)
+        
+        serializer = RegistrationIntakeSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        ticket = enqueue_registration(serializer.validated_data)
+        
+        return Response(
+            {
+                'id': ticket,
+                'status': 'pending',
+                'status_url': reverse(
+                    'registration-intake-status',
+                    kwargs={'ticket': ticket},
+                    request=request
+                ),
+            },
+            status=status.HTTP_202_ACCEPTED
+        )
+    
     def perform_create(self, serializer):
-        """Save registration and send emails."""
-        registration = serializer.save()
+        """Save the registration; its emails are sent through the outbox."""
+        # The serializer records the emails in the outbox in the same
+        # transaction, and the outbox relay hands them to Celery
+        serializer.save()
+    
+    @action(
+        detail=False,
+        methods=['get'],
+        url_path=r'intake/(?P<ticket>[0-9a-f-]+)',
+        permission_classes=[AllowAny]
+    )
+    def intake_status(self, request, ticket=None):
+        """Get the outcome of a queued registration."""
+        intake = get_intake_status(ticket)
+        if intake is None:
+            return Response(
+                {'error': 'Unknown or expired registration ticket'},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
-        # Send emails asynchronously using Celery
-        send_registration_emails.delay(registration.id)
+        return Response(intake)
     
     @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
     def export(self, request):
-        """Export registrations as CSV."""
+        """
+        Export registrations as a streamed file.
+        
+        Supports ``export_format`` (csv, ndjson, columnar) and
+        ``compress=gzip``. Rows are streamed in chunks, so memory use does
+        not grow with the number of exported registrations.
+        """
         # Get filter parameters
         event_id = request.query_params.get('event')
         start_date = request.query_params.get('start_date')
         end_date = request.query_params.get('end_date')
+        export_format = request.query_params.get('export_format', 'csv')
+        compress = request.query_params.get('compress')
+        
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {'error': f'Unsupported export format. Choose from: {", ".join(EXPORT_FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # Filter queryset
-        queryset = self.queryset
+        # Filter queryset; rows are read while streaming, after the view
+        # returns, so pin the replica choice now
+        queryset = self.queryset.using(self.get_read_database())
         if event_id:
             queryset = queryset.filter(event_id=event_id)
         if start_date:
@@ -74,82 +167,75 @@ class RegistrationViewSet(viewsets.ModelViewSet):
         if end_date:
             queryset = queryset.filter(created_at__lte=end_date)
         
-        # Create CSV response
-        response = HttpResponse(content_type='text/csv')
-        response['Content-Disposition'] = f'attachment; filename="registrations_{datetime.now().strftime("%Y%m%d")}.csv"'
-        
-        writer = csv.writer(response)
-        writer.writerow([
-            'Name', 'Email', 'College Name', 'Department',
-            'Event Name', 'Event Category', 'Event Date',
-            'Registration Date'
-        ])
-        
-        for reg in queryset:
-            writer.writerow([
-                reg.full_name,
-                reg.email,
-                reg.college_name,
-                reg.department,
-                reg.event.name,
-                reg.event.get_category_display(),
-                reg.event.event_date,
-                reg.created_at.strftime('%Y-%m-%d %H:%M:%S')
-            ])
+        content_type, extension = EXPORT_FORMATS[export_format]
+        stream = EXPORT_ENCODERS[export_format](iter_export_rows(queryset))
+        
+        if compress == 'gzip':
+            stream = gzip_stream(stream)
+            content_type = 'application/gzip'
+            extension = f'{extension}.gz'
+        
+        # Create streaming response
+        response = StreamingHttpResponse(stream, content_type=content_type)
+        response['Content-Disposition'] = f'attachment; filename="registrations_{datetime.now().strftime("%Y%m%d")}.{extension}"'
         
         return response
     
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='import',
+        permission_classes=[IsAdminUser],
+        parser_classes=[MultiPartParser]
+    )
+    def import_registrations(self, request):
+        """
+        Import registrations from an uploaded CSV or NDJSON file.
+        
+        Expects a ``file`` upload with columns full_name, email,
+        college_name, department and event. Rows are validated and written
+        in batches; rows that fail validation, duplicate an existing
+        registration or exceed capacity are listed in the error report.
+        """
+        upload = request.FILES.get('file')
+        if upload is None:
+            return Response(
+                {'error': 'A file upload is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        import_format = request.query_params.get('import_format')
+        if import_format is None:
+            import_format = 'ndjson' if upload.name.endswith(('.ndjson', '.jsonl')) else 'csv'
+        if import_format not in IMPORT_FORMATS:
+            return Response(
+                {'error': f'Unsupported import format. Choose from: {", ".join(IMPORT_FORMATS)}'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        if not is_valid_utf8(upload):
+            return Response(
+                {'error': 'The uploaded file must be UTF-8 encoded'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        # Confirmation emails are recorded in the outbox with each chunk
+        created_ids, report = import_registrations(iter_import_rows(upload, import_format))
+        
+        return Response({
+            'created': len(created_ids),
+            'rejected': len(report),
+            'errors': report,
+        })
+    
     @action(detail=False, methods=['get'], permission_classes=[IsAdminUser])
     def stats(self, request):
-        """Get registration statistics."""
-        now = timezone.now()
-        today = now.date()
-        week_ago = now - timedelta(days=7)
-        month_ago = now - timedelta(days=30)
-        
-        # Total registrations
-        total = self.queryset.count()
-        
-        # Registrations today
-        today_count = self.queryset.filter(created_at__date=today).count()
-        
-        # Registrations this week
-        week_count = self.queryset.filter(created_at__gte=week_ago).count()
-        
-        # Registrations this month
-        month_count = self.queryset.filter(created_at__gte=month_ago).count()
-        
-        # By category
-        by_category = {}
-        for choice in self.queryset.values('event__category').annotate(
-            count=Count('id')
-        ):
-            category = choice['event__category']
-            by_category[category] = choice['count']
-        
-        # By event
-        by_event = list(
-            self.queryset.values('event__name', 'event__event_date')
-            .annotate(count=Count('id'))
-            .order_by('-count')[:10]
-        )
+        """Get registration statistics (cached until registrations change)."""
+        def compute():
+            stats_data = compute_registration_stats(self.queryset)
+            return dict(RegistrationStatsSerializer(stats_data).data)
         
-        # Recent registrations
-        recent = self.queryset.order_by('-created_at')[:10]
-        recent_serializer = RegistrationListSerializer(recent, many=True)
-        
-        stats_data = {
-            'total_registrations': total,
-            'registrations_today': today_count,
-            'registrations_this_week': week_count,
-            'registrations_this_month': month_count,
-            'by_category': by_category,
-            'by_event': by_event,
-            'recent_registrations': recent_serializer.data
-        }
-        
-        serializer = RegistrationStatsSerializer(stats_data)
-        return Response(serializer.data)
+        return Response(get_cached_stats(compute))
     
     @action(detail=False, methods=['get'])
     def my_registrations(self, request):